@@ -1,34 +1,187 @@
 # ===== Importing Libraries ===========
 # Used to make HTTP requests to the Spoonacular API
 import requests
+# Used to configure the connection pool of the HTTP session
+from requests.adapters import HTTPAdapter
 # Used to create abstract base classes
 from abc import abstractmethod
+# Used to send hedged requests in parallel and wait for the first response
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+# Used to pass the deadline of the user action on to the threads sending hedged requests
+import contextvars
+# Used to measure request latency for hedging
+import time
+# Used to count the quota points spent from several threads
+import threading
 
 # ===== Importing data from files ===========
 from .decorators import log_function_call, handle_errors
+from .cache import ResponseCache
+from .title_index import TitleIndex
+from .single_flight import SingleFlight
+from .deadline import current_deadline, DeadlineExceededError
+from .resilience import CircuitOpenError
+from .quota import QuotaExceededError
+from .key_pool import NoApiKeyAvailableError
+from .config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK, HTTP_KEEP_ALIVE, BULK_CHUNK_SIZE,
+                     HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, RECIPES_PER_SEARCH, LOCAL_INGREDIENT_SEARCH)
 
 
 # ===== Establish API connection ===========
 
+# TimeoutHTTPAdapter gives every request a timeout, shortened to fit the deadline of the current user action
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=None, **kwargs):
+        # Default (connect, read) timeout in seconds for requests sent without one
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        timeout = kwargs.get("timeout")
+        if timeout is None:
+            timeout = self.timeout
+        # Do not send the request once the deadline has passed, and never wait past it
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+            timeout = deadline.limit(timeout)
+        kwargs["timeout"] = timeout
+        return super().send(request, **kwargs)
+
+
 # SpoonacularAPI class handles making requests to the API
 class SpoonacularAPI:
     """
     Class to handle communication with the Spoonacular API.
     """
-    def __init__(self, base_url, api_key):
+    def __init__(self, base_url, api_key, pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE,
+                 pool_block=HTTP_POOL_BLOCK, keep_alive=HTTP_KEEP_ALIVE, cache=None, disk_cache=None,
+                 title_index=None, limiter=None, retry_policy=None, breaker=None,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT, hedge_policy=None,
+                 key_pool=None, corpus=None, offline=False):
         """
         Initializes the SpoonacularAPI instance with base URL and API key.
+
+        The instance owns a single HTTP session with a pool of keep-alive connections and an
+        in-memory response cache, both shared by every class that uses this API object
+        (RecipeFinder, RecipeDetails). An optional on-disk cache keeps responses between runs.
+
+        Args:
+            base_url (str): Base URL of the Spoonacular API.
+            api_key (str): Spoonacular API key.
+            pool_connections (int, optional): Number of per-host connection pools to cache.
+            pool_maxsize (int, optional): Maximum number of connections kept open per host.
+            pool_block (bool, optional): Whether to wait for a free connection when the pool is full.
+            keep_alive (bool, optional): Whether connections are kept open between requests.
+            cache (ResponseCache, optional): Response cache to use. A new one is created if not given.
+            disk_cache (DiskCache, optional): Persistent cache checked after the in-memory cache.
+            title_index (TitleIndex, optional): Index of recipe titles to IDs, filled from every search and
+                detail response. An in-memory index is created if not given.
+            limiter (QuotaLimiter, optional): Rate limiter that spaces out requests to fit the API quota.
+                Requests are not limited if not given.
+            retry_policy (RetryPolicy, optional): Policy for retrying transient failures. Failed requests
+                are not retried if not given.
+            breaker (CircuitBreaker, optional): Circuit breaker that fails fast while the API is down.
+            connect_timeout (float, optional): Seconds to wait for a connection to the API.
+            read_timeout (float, optional): Seconds to wait for the API to send data once connected.
+            hedge_policy (HedgePolicy, optional): Policy for sending a second request when a detail lookup is slow.
+                Requests are not hedged if not given.
+            key_pool (ApiKeyPool, optional): Pool of API keys to spread requests over. If given, the apiKey
+                parameter of every request is replaced with a key chosen from the pool.
+            corpus (RecipeCorpus, optional): Local corpus that keeps every full recipe received, and answers
+                requests when the API cannot be reached, is rate limited or too slow for the deadline.
+            offline (bool, optional): If True, every request is answered from the corpus without contacting the API.
         """
         self.base_url = base_url
         self.api_key = api_key
+        # Store the pool settings so the session can be re-created after close()
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = self.create_session()
+        self.cache = ResponseCache() if cache is None else cache
+        self.disk_cache = disk_cache
+        self.title_index = TitleIndex() if title_index is None else title_index
+        self.limiter = limiter
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        # Identical requests made at the same time from several threads share one HTTP request
+        self.single_flight = SingleFlight()
+        self.hedge_policy = hedge_policy
+        self.key_pool = key_pool
+        self.corpus = corpus
+        self.offline = offline
+        # Threads for hedged requests, created when the first request is hedged
+        self.hedge_executor = None
+        # Quota points spent this session, as reported by the X-API-Quota-Request header of each response
+        self.points_spent = 0.0
+        self.points_lock = threading.Lock()
+
+    def create_session(self):
+        """
+        Creates an HTTP session with a configured connection pool.
+
+        Returns:
+            requests.Session: Session that reuses connections across requests.
+        """
+        session = requests.Session()
+        # Mount an adapter with the pool limits for both HTTP and HTTPS connections
+        # The adapter also gives every request the connect and read timeouts, so a stalled socket cannot hang the app
+        adapter = TimeoutHTTPAdapter(timeout=self.timeout, pool_connections=self.pool_connections,
+                                     pool_maxsize=self.pool_maxsize, pool_block=self.pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # Ask the server to keep the connection open (or closed) after each response
+        session.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+        return session
+
+    def close(self):
+        """
+        Closes the HTTP session, every pooled connection, the on-disk cache and the title index.
+        Safe to call more than once.
+        """
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.disk_cache is not None:
+            self.disk_cache.close()
+        self.title_index.close()
+        if self.corpus is not None:
+            self.corpus.close()
+        if self.hedge_executor is not None:
+            self.hedge_executor.shutdown(wait=False)
+            self.hedge_executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     # Method that handles the requests to the API, decorated with logging and error handling
     @log_function_call
     @handle_errors
     def make_request(self, endpoint, params=None):
+        """
+        Makes a GET request to the API and returns the JSON response. Errors are printed, see request().
+
+        Returns:
+            dict: JSON response from the API, or None if the request failed.
+        """
+        return self.request(endpoint, params)
+
+    def request(self, endpoint, params=None):
         """
         Makes a GET request to the API and returns the JSON response.
 
+        Responses are served from the in-memory cache, then the on-disk cache, when a fresh copy is available.
+        If the same request is already being sent by another thread, this call waits for it and
+        returns its response (or fails with its error) instead of sending a second request.
+        With a corpus, the request is answered from the corpus when the API is unavailable, and
+        always in offline mode.
+
         Args:
             endpoint (str): API endpoint to send the request to.
             params (dict, optional): Query parameters for the request.
@@ -39,10 +192,283 @@ class SpoonacularAPI:
         Raises:
             HTTPError: If the API request fails.
         """
+        # Return the cached response if the same request was made recently
+        cached = self.get_cached(endpoint, params)
+        if cached is not None:
+            return cached
+
+        if self.offline and self.corpus is not None:
+            return self.corpus.answer(endpoint, params)
+
+        try:
+            # Share the request with any thread that is making the same request right now
+            return self.single_flight.do(self.cache.make_key(endpoint, params), self.fetch, endpoint, params)
+        except Exception as e:
+            # Answer from the local corpus if the API is unavailable, otherwise report the error as usual
+            answer = self.corpus.answer(endpoint, params) if self.corpus is not None and self.is_unavailable(e) else None
+            if not answer:
+                raise
+            # Stay quiet for requests still finishing after the user action ran out of time
+            deadline = current_deadline()
+            if deadline is None or not deadline.expired():
+                print("\nThe recipe service is not available right now, showing recipes stored on this device.")
+            return answer
+
+    @staticmethod
+    def is_unavailable(error):
+        """
+        Returns True if an error means the API cannot answer right now: it cannot be reached, timed out,
+        is down or rate limited, the quota is used up, or the deadline of the user action has passed.
+        """
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout, CircuitOpenError,
+                              DeadlineExceededError, QuotaExceededError, NoApiKeyAvailableError)):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+            status_code = error.response.status_code
+            return status_code in (402, 429) or (isinstance(status_code, int) and status_code >= 500)
+        return False
+
+    def fetch(self, endpoint, params=None):
+        """
+        Sends a request to the API, decodes the JSON response and stores it in the caches.
+
+        Returns:
+            dict: JSON response from the API.
+
+        Raises:
+            HTTPError: If the API request fails.
+        """
+        # Another thread may have stored the response just before this request started
+        cached = self.get_cached(endpoint, params)
+        if cached is not None:
+            return cached
+
         url = f'{self.base_url}/{endpoint}'
-        response = requests.get(url, params=params)
+        if self.hedge_policy is not None and self.hedge_policy.pattern_for(endpoint) is not None:
+            response = self.send_hedged(endpoint, url, params)
+        else:
+            response = self.send_request(url, params)
         response.raise_for_status()
-        return response.json()
+        data = response.json()
+
+        # Store the decoded response so identical requests can be answered from the cache
+        self.store(endpoint, params, data)
+        # Keep every full recipe in the corpus, so it can be found while the API is unavailable
+        if self.corpus is not None:
+            self.corpus.add_response(endpoint, data)
+        return data
+
+    def send_hedged(self, endpoint, url, params=None):
+        """
+        Sends a request and, if it is slower than the hedge delay for its endpoint, an identical second request.
+
+        The first successful response is returned. The other request cannot be stopped once it has been
+        sent, so its response is closed when it arrives. A request is only hedged while the hedge rate
+        stays under the policy's cap.
+
+        Returns:
+            requests.Response: The response that arrived first, or the last failed one if both failed.
+        """
+        if self.hedge_executor is None:
+            self.hedge_executor = ThreadPoolExecutor(max_workers=self.pool_maxsize)
+
+        def timed_send():
+            # Record the latency of every request, hedged or not, so the hedge delay follows the endpoint
+            started = time.monotonic()
+            response = self.send_request(url, params)
+            self.hedge_policy.record(endpoint, time.monotonic() - started)
+            return response
+
+        # Each request runs in a copy of the current context, so it keeps the deadline of the user action
+        primary = self.hedge_executor.submit(contextvars.copy_context().run, timed_send)
+        try:
+            return primary.result(timeout=self.hedge_policy.delay_for(endpoint))
+        except FutureTimeoutError:
+            if not self.hedge_policy.allow_hedge():
+                return primary.result()
+
+        hedge = self.hedge_executor.submit(contextvars.copy_context().run, timed_send)
+        pending = {primary, hedge}
+        failed = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and future.result().status_code < 400:
+                    if future is hedge:
+                        self.hedge_policy.record_win()
+                    # Close the other response when it arrives, so its connection goes back to the pool
+                    for other in pending:
+                        other.add_done_callback(
+                            lambda other_future: other_future.exception() is None and other_future.result().close())
+                    return future.result()
+                failed = future
+        # Both requests failed: report the one that finished last
+        return failed.result()
+
+    def send_request(self, url, params=None):
+        """
+        Sends a GET request, retrying transient failures according to the retry policy.
+
+        Connection errors, timeouts and responses with a retryable status (429 and 5xx) are sent again
+        after a backoff delay, or after the delay given in the Retry-After header. The circuit breaker
+        is checked before every attempt and told about its outcome; a trial request of the half-open
+        breaker that ends without an outcome is released. If the user action has a deadline,
+        no attempt is started after it has passed, and neither a retry nor the rate limiter waits past it.
+        With a key pool, each
+        attempt uses a key from the pool, and a request rejected with 401 or 402 is sent again straight
+        away with another key.
+
+        Returns:
+            requests.Response: The last response, which may still have an error status.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            DeadlineExceededError: If the deadline of the user action has passed.
+            RequestException: If the last attempt failed with a connection error or timeout.
+        """
+        deadline = current_deadline()
+        attempt = 0
+        # What the breaker returned for the current attempt (True for its trial request), reset to None
+        # once the outcome has been recorded
+        trial = None
+        try:
+            while True:
+                attempt += 1
+                if deadline is not None:
+                    deadline.check()
+                # A request sent again with another key keeps the place the breaker gave it
+                if self.breaker is not None and trial is None:
+                    trial = self.breaker.before_request()
+                # Wait for the rate limiter, so requests fit the quota budget, unless that runs past the deadline
+                if self.limiter is not None and not self.limiter.acquire(
+                        max_wait=deadline.remaining() if deadline is not None else None):
+                    raise DeadlineExceededError(f"Out of time: the {deadline.seconds:g} second time limit "
+                                                f"would pass waiting for the API quota.")
+                # Re-open the session if the client was closed earlier
+                if self.session is None:
+                    self.session = self.create_session()
+                # Send the request with a key from the pool
+                key = None
+                if self.key_pool is not None:
+                    key = self.key_pool.select()
+                    params = dict(params or {}, apiKey=key)
+
+                try:
+                    response = self.session.get(url, params=params)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if self.breaker is not None:
+                        self.breaker.record_failure()
+                        trial = None
+                    delay = self.retry_policy.delay_for(attempt) if self.retry_policy is not None else None
+                    # Give up if there are no attempts left, or the next one would start after the deadline
+                    if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                        raise
+                    self.retry_policy.sleep(delay)
+                    continue
+
+                # Track the quota reported by the API, also for failed requests
+                self.count_points(response.headers)
+                if self.limiter is not None:
+                    self.limiter.update(response.headers)
+                status_code = response.status_code
+                if key is not None:
+                    self.key_pool.update(key, response.headers)
+                    # Leave out a rejected key and try the next one, without counting it as a retry
+                    if status_code in (401, 402):
+                        self.key_pool.disable(key, status_code)
+                        if self.key_pool.available():
+                            attempt -= 1
+                            response.close()
+                            continue
+                # Server errors count against the breaker; any other response shows the API is up
+                if self.breaker is not None:
+                    if isinstance(status_code, int) and status_code >= 500:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    trial = None
+
+                if self.retry_policy is None or not self.retry_policy.is_retryable_status(status_code):
+                    return response
+                delay = self.retry_policy.delay_for(attempt, self.retry_policy.parse_retry_after(response.headers))
+                if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                    return response
+                self.retry_policy.sleep(delay)
+        finally:
+            # A trial request that ended without an outcome (deadline, quota, no key, other errors)
+            # must not keep the breaker half-open
+            if trial:
+                self.breaker.release_trial()
+
+    def count_points(self, headers):
+        """
+        Adds the cost of a request, as reported in its X-API-Quota-Request header, to points_spent.
+        """
+        try:
+            cost = float(headers.get("X-API-Quota-Request"))
+        except (AttributeError, TypeError, ValueError):
+            return
+        with self.points_lock:
+            self.points_spent += cost
+
+    def remaining_quota(self):
+        """
+        Returns the quota budget that is left, as tracked by the rate limiter.
+
+        Returns:
+            dict: See QuotaLimiter.remaining, or None if requests are not limited.
+        """
+        return self.limiter.remaining() if self.limiter is not None else None
+
+    def api_key_stats(self):
+        """
+        Returns the quota state of every key in the key pool, with the keys masked.
+
+        Returns:
+            list: See ApiKeyPool.stats, or None if no key pool is used.
+        """
+        return self.key_pool.stats() if self.key_pool is not None else None
+
+    def get_cached(self, endpoint, params=None):
+        """
+        Returns a cached response without contacting the API.
+
+        The in-memory cache is checked first, then the on-disk cache. A response found on disk
+        is copied into memory for the rest of the session.
+
+        Returns:
+            dict or list: The cached response, or None if it is not cached.
+        """
+        cached = self.cache.get(endpoint, params)
+        if cached is None and self.disk_cache is not None:
+            cached = self.disk_cache.get(endpoint, params)
+            if cached is not None:
+                self.cache.set(endpoint, params, cached)
+        return cached
+
+    def store(self, endpoint, params, data):
+        """
+        Stores a response in the in-memory and on-disk caches, as if it had been returned for this request.
+
+        This is also used to cache recipe details that arrived as part of another response.
+        """
+        self.cache.set(endpoint, params, data)
+        if self.disk_cache is not None:
+            self.disk_cache.set(endpoint, params, data)
+
+    def cache_recipe_information(self, recipes):
+        """
+        Caches recipes that already carry their full information (ingredients and instructions).
+
+        Search and random responses can embed the same data as recipes/{id}/information, so each
+        such recipe is stored under that endpoint and later detail lookups need no extra request.
+
+        Args:
+            recipes (list): Recipes from a search or random response.
+        """
+        for recipe in recipes or []:
+            if isinstance(recipe, dict) and "id" in recipe and "extendedIngredients" in recipe:
+                self.store(f"recipes/{recipe['id']}/information", None, recipe)
 
 
 # RecipeFinder class handles getting recipes from the API
@@ -50,20 +476,30 @@ class RecipeFinder:
     """
     Class to find recipes from the Spoonacular API.
     """
-    def __init__(self, api):
+    def __init__(self, api, inline_information=False, local_ingredient_search=LOCAL_INGREDIENT_SEARCH):
         """
         Initializes the RecipeFinder instance with a SpoonacularAPI object.
+
+        Args:
+            api (SpoonacularAPI): Client used to make the requests.
+            inline_information (bool, optional): If True, category searches ask the API to embed the full
+                recipe information in the results, so no separate detail request is needed per recipe.
+            local_ingredient_search (bool, optional): If True, ingredient searches are answered from the
+                client's recipe corpus when it holds enough matching recipes, without an API request.
         """
         self.api = api
+        self.inline_information = inline_information
+        self.local_ingredient_search = local_ingredient_search
 
     @log_function_call
     @handle_errors
-    def find_recipes_by_ingredients(self, ingredients):
+    def find_recipes_by_ingredients(self, ingredients, number=RECIPES_PER_SEARCH):
         """
         Finds recipes based on a list of ingredients.
 
         Args:
             ingredients (str): Comma-separated list of ingredients.
+            number (int, optional): Number of recipes to return.
 
         Returns:
             list: List of recipes matching the ingredients.
@@ -71,10 +507,16 @@ class RecipeFinder:
         Raises:
             ValueError: If the API response is empty or invalid.
         """
+        # Rank the recipes stored on this device first, and only ask the API if there are not enough of them
+        if self.local_ingredient_search and self.api.corpus is not None:
+            local_recipes = self.api.corpus.search_by_ingredients(ingredients, number)
+            if len(local_recipes) >= number:
+                return local_recipes
+
         endpoint = "recipes/findByIngredients"
         params = {
             "ingredients": ingredients,
-            "number": 5,  # Number of recipes to return
+            "number": number,  # Number of recipes to return
             "ranking": 2,  # Minimises missing ingredients
             "apiKey": self.api.api_key,  # Uses the stored API key for authentication
             "ignorePantry": "true"  # Ignore common pantry items
@@ -82,16 +524,21 @@ class RecipeFinder:
         response = self.api.make_request(endpoint, params=params) # Make the API request and store the response
         if not response:
             raise ValueError("API response is empty or invalid.")
+        # Remember the ID of each title, so it can be found later without a title search
+        self.api.title_index.add_recipes(response)
         return response
 
     @log_function_call
     @handle_errors
-    def find_recipes_by_category(self, category):
+    def find_recipes_by_category(self, category, number=RECIPES_PER_SEARCH, inline_information=None):
         """
         Finds recipes based on a category.
 
         Args:
             category (str): Recipe category.
+            number (int, optional): Number of recipes to return.
+            inline_information (bool, optional): Whether to embed the recipe information in the results.
+                Defaults to the setting given when the RecipeFinder was created.
 
         Returns:
             list: List of recipes in the specified category.
@@ -101,11 +548,17 @@ class RecipeFinder:
         """
         endpoint = "recipes/complexSearch"
         common_params = {
-            "number": 5,  # Number of recipes to return
+            "number": number,  # Number of recipes to return
             "apiKey": self.api.api_key,  # Uses the stored API key for authentication
             "sort": "random",  # Shows different results each time
             "ignorePantry": "true"  # Ignore common pantry items
         }
+        # Ask for the full recipe information (with ingredients and instructions) inside the search results
+        if inline_information is None:
+            inline_information = self.inline_information
+        if inline_information:
+            common_params["addRecipeInformation"] = "true"
+            common_params["fillIngredients"] = "true"
         get_categories = CategoryMapping.get_category(category)
         # If category mapping exists, set parameters accordingly
         if get_categories:
@@ -116,17 +569,21 @@ class RecipeFinder:
         response = self.api.make_request(endpoint, params=params)
         if not response:
             raise ValueError("API response is empty or invalid.")
-        return response.get("results", [])
+        results = response.get("results", [])
+        # Cache any embedded recipe information so display and export do not request it again
+        self.api.cache_recipe_information(results)
+        self.api.title_index.add_recipes(results)
+        return results
 
     # Method that handles making a recipe request by random search, decorated with logging and error handling
     @log_function_call
     @handle_errors
-    def find_random_recipes(self):
+    def find_random_recipes(self, number=RECIPES_PER_SEARCH):
         # Define the API endpoint for retrieving random recipes
         endpoint = "recipes/random"
         # Define the parameters for the API request
         params = {
-            "number": 5,  # Number of recipes to return
+            "number": number,  # Number of recipes to return
             "apiKey": self.api.api_key  # Uses the stored API key for authentication
         }
 
@@ -135,6 +592,9 @@ class RecipeFinder:
 
         # Check if the response contains a "recipes" key and return its value
         if "recipes" in response:
+            # Random recipes already include their full information, so cache it for the detail lookups
+            self.api.cache_recipe_information(response["recipes"])
+            self.api.title_index.add_recipes(response["recipes"])
             return response["recipes"]
         else:
             # Print an error message if the response format is unexpected
@@ -145,6 +605,16 @@ class RecipeFinder:
     @log_function_call
     @handle_errors
     def find_recipe_details(self, recipe_id):
+        return self._recipe_details(recipe_id, self.api.make_request)
+
+    def fetch_recipe_details(self, recipe_id):
+        """
+        Gets all information of a recipe like find_recipe_details, but raises errors instead of printing them,
+        so the caller decides how to report them (e.g. not at all once the user has moved on).
+        """
+        return self._recipe_details(recipe_id, self.api.request)
+
+    def _recipe_details(self, recipe_id, send):
         # Define the API endpoint for retrieving all recipe information
         endpoint = f"recipes/{recipe_id}/information"
         # Define the parameters for the API request
@@ -153,25 +623,85 @@ class RecipeFinder:
         }
 
         # Make the API request and store the response
-        response = self.api.make_request(endpoint, params=params)
+        response = send(endpoint, params=params)
 
         # ValueError for empty or invalid responses
         if not response:
             raise ValueError("API response is empty or invalid.")
+        # Remember the ID of the title, so it can be looked up without a search
+        self.api.title_index.add_recipes([response])
         return response
 
+    # Method that gets the information of many recipes at once, decorated with logging and error handling
+    @log_function_call
+    @handle_errors
+    def find_recipe_details_bulk(self, recipe_ids):
+        """
+        Finds the full information of several recipes using as few API requests as possible.
+
+        Recipes that are already cached are not requested again. The others are requested from the
+        informationBulk endpoint in chunks of at most BULK_CHUNK_SIZE IDs, and each recipe in the
+        response is cached as if it had been requested from recipes/{id}/information.
+
+        Args:
+            recipe_ids (list): IDs of the recipes to look up.
+
+        Returns:
+            dict: Mapping of recipe ID to recipe information. IDs that could not be found are left out.
+        """
+        details = {}
+        missing_ids = []
+
+        # Use the cached information where available
+        for recipe_id in recipe_ids:
+            cached = self.api.get_cached(f"recipes/{recipe_id}/information")
+            if cached is not None:
+                details[recipe_id] = cached
+            elif recipe_id not in missing_ids:
+                missing_ids.append(recipe_id)
+
+        # Request the remaining recipes in chunks that stay under the API limit
+        endpoint = "recipes/informationBulk"
+        for start in range(0, len(missing_ids), BULK_CHUNK_SIZE):
+            chunk = missing_ids[start:start + BULK_CHUNK_SIZE]
+            params = {
+                "ids": ",".join(str(recipe_id) for recipe_id in chunk),  # Comma-separated list of recipe IDs
+                "apiKey": self.api.api_key  # Uses the stored API key for authentication
+            }
+            response = self.api.make_request(endpoint, params=params)
+
+            # Skip a chunk that failed, so the recipes from other chunks are still returned
+            if not response:
+                continue
+
+            for recipe in response:
+                details[recipe["id"]] = recipe
+                # Cache each recipe so later single lookups do not need a request
+                self.api.store(f"recipes/{recipe['id']}/information", None, recipe)
+
+        # Remember the IDs of the titles, so they can be looked up without a search
+        self.api.title_index.add_recipes(list(details.values()))
+        return details
+
 
 # RecipeDetails class retrieves and formats recipe ingredients and instructions for output
 class RecipeDetails:
-    def __init__(self, api, get_recipe):
+    def __init__(self, api, get_recipe, inline_information=False):
         # Store instances of the API and RecipeFinder classes
         self.api = api
         self.get_recipe = get_recipe
+        # If True, the title search also returns the recipe information, saving a separate detail request
+        self.inline_information = inline_information
 
     # Method that searches a recipe by title and return the ID, decorated with logging and error handling
     @log_function_call
     @handle_errors
     def find_recipe_id(self, recipe_title):
+        # Use the ID from an earlier search response if this title has been seen before
+        recipe_id = self.api.title_index.lookup(recipe_title)
+        if recipe_id is not None:
+            return recipe_id
+
         # Define the API endpoint for searching recipes by name
         endpoint = "recipes/complexSearch"
         # Define the parameters for the API request
@@ -179,6 +709,11 @@ class RecipeDetails:
             "query": recipe_title,  # Search query is the recipe name
             "apiKey": self.api.api_key  # Use the stored API key for authentication
         }
+        # Embed the full information of the best match, which is cached for find_instructions_ingredients
+        if self.inline_information:
+            params["number"] = 1
+            params["addRecipeInformation"] = "true"
+            params["fillIngredients"] = "true"
 
         # Make the API request and store the response
         response = self.api.make_request(endpoint, params=params)
@@ -188,6 +723,10 @@ class RecipeDetails:
             print(f"No recipes found for title '{recipe_title}'")
             return None
 
+        # Cache any embedded recipe information and remember the IDs of the returned titles
+        self.api.cache_recipe_information(response.get('results', []))
+        self.api.title_index.add_recipes(response.get('results', []))
+
         # Return the ID of the first recipe in the search results
         return response['results'][0]['id']
 
@@ -195,9 +734,10 @@ class RecipeDetails:
     # decorated with logging and error handling
     @log_function_call
     @handle_errors
-    def find_instructions_ingredients(self, recipe_title):
-        # Find the recipe ID
-        recipe_id = self.find_recipe_id(recipe_title)
+    def find_instructions_ingredients(self, recipe_title, recipe_id=None):
+        # Find the recipe ID, unless it is already known (e.g. stored with a saved recipe)
+        if recipe_id is None:
+            recipe_id = self.find_recipe_id(recipe_title)
 
         # If no recipe ID is found, raise an error
         if not recipe_id:
@@ -210,6 +750,19 @@ class RecipeDetails:
         if not api_response:
             raise ValueError(f'No response from API for recipe ID: {recipe_id}')
 
+        return self.format_recipe(api_response)
+
+    @staticmethod
+    def format_recipe(api_response):
+        """
+        Formats the ingredients and instructions of a recipe's full information.
+
+        Args:
+            api_response (dict): The recipe information, as returned by recipes/{id}/information.
+
+        Returns:
+            tuple: (ingredients, instructions) as text, each None if the recipe has none.
+        """
         # Extract and format ingredients from the API response
         if 'extendedIngredients' in api_response:
             ingredients_list = []
@@ -0,0 +1,426 @@
+# ===== Importing Libraries ===========
+# Used to run many API requests at the same time in one thread
+import asyncio
+# Used to measure request latency for hedging
+import time
+# Used to make HTTP requests to the Spoonacular API without blocking the event loop
+import aiohttp
+
+# ===== Importing data from files ===========
+from .decorators import async_log_function_call, async_handle_errors
+from .cache import ResponseCache
+from .title_index import TitleIndex
+from .single_flight import AsyncSingleFlight
+from .app import CategoryMapping
+from .deadline import current_deadline, DeadlineExceededError
+from .config import (HTTP_POOL_MAXSIZE, HTTP_KEEP_ALIVE, ASYNC_MAX_CONCURRENCY, HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT,
+                     RECIPES_PER_SEARCH)
+
+
+# ===== Establish async API connection ===========
+
+# AsyncSpoonacularAPI class handles making requests to the API from asyncio code
+class AsyncSpoonacularAPI:
+    """
+    Asyncio counterpart of SpoonacularAPI, for embedding recipe lookups in an asyncio service.
+
+    All requests share one aiohttp session and its pool of keep-alive connections. A semaphore
+    limits how many requests are sent at the same time, so hundreds of lookups can be started
+    together without opening hundreds of connections or using one thread per request.
+    """
+    def __init__(self, base_url, api_key, pool_maxsize=HTTP_POOL_MAXSIZE, keep_alive=HTTP_KEEP_ALIVE,
+                 max_concurrency=ASYNC_MAX_CONCURRENCY, cache=None, title_index=None, limiter=None,
+                 retry_policy=None, breaker=None, connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT, hedge_policy=None, key_pool=None):
+        """
+        Initializes the AsyncSpoonacularAPI instance. The session is created on the first request,
+        inside the running event loop.
+
+        Args:
+            base_url (str): Base URL of the Spoonacular API.
+            api_key (str): Spoonacular API key.
+            pool_maxsize (int, optional): Maximum number of connections kept open.
+            keep_alive (bool, optional): Whether connections are kept open between requests.
+            max_concurrency (int, optional): Maximum number of requests sent at the same time.
+            cache (ResponseCache, optional): Response cache to use. A new one is created if not given.
+            title_index (TitleIndex, optional): Index of recipe titles to IDs, filled from every search response.
+            limiter (QuotaLimiter, optional): Rate limiter that spaces out requests to fit the API quota.
+            retry_policy (RetryPolicy, optional): Policy for retrying transient failures.
+            breaker (CircuitBreaker, optional): Circuit breaker that fails fast while the API is down.
+            connect_timeout (float, optional): Seconds to wait for a connection to the API.
+            read_timeout (float, optional): Seconds to wait for the API to send data once connected.
+            hedge_policy (HedgePolicy, optional): Policy for sending a second request when a detail lookup is slow.
+            key_pool (ApiKeyPool, optional): Pool of API keys to spread requests over.
+        """
+        self.base_url = base_url
+        self.api_key = api_key
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.max_concurrency = max_concurrency
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.hedge_policy = hedge_policy
+        self.key_pool = key_pool
+        self.session = None
+        self.semaphore = None
+        self.cache = ResponseCache() if cache is None else cache
+        self.title_index = TitleIndex() if title_index is None else title_index
+        self.limiter = limiter
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        # Identical requests made at the same time by several tasks share one HTTP request
+        self.single_flight = AsyncSingleFlight()
+
+    def create_session(self):
+        """
+        Creates an aiohttp session with a connection pool of at most pool_maxsize connections.
+
+        Returns:
+            aiohttp.ClientSession: Session that reuses connections across requests.
+        """
+        connector = aiohttp.TCPConnector(limit=self.pool_maxsize, force_close=not self.keep_alive)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def close(self):
+        """
+        Closes the session and every pooled connection. Safe to call more than once.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    # Method that handles the requests to the API, decorated with logging and error handling
+    @async_log_function_call
+    @async_handle_errors
+    async def make_request(self, endpoint, params=None):
+        """
+        Makes a GET request to the API and returns the JSON response.
+
+        Responses are served from the in-memory cache when a fresh copy is available. If another task
+        is already sending the same request, this call awaits its response instead of sending another.
+
+        Args:
+            endpoint (str): API endpoint to send the request to.
+            params (dict, optional): Query parameters for the request.
+
+        Returns:
+            dict: JSON response from the API.
+
+        Raises:
+            ClientResponseError: If the API request fails.
+        """
+        # Return the cached response if the same request was made recently
+        cached = self.cache.get(endpoint, params)
+        if cached is not None:
+            return cached
+
+        # Share the request with any task that is making the same request right now
+        return await self.single_flight.do(self.cache.make_key(endpoint, params), self.fetch, endpoint, params)
+
+    async def fetch(self, endpoint, params=None):
+        """
+        Sends a request to the API (hedged if the hedge policy covers the endpoint) and stores the decoded
+        response in the cache.
+
+        Returns:
+            dict: JSON response from the API.
+
+        Raises:
+            ClientResponseError: If the API request fails.
+        """
+        # Open the session (or re-open it after close()) inside the running event loop
+        if self.session is None or self.session.closed:
+            self.session = self.create_session()
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        url = f'{self.base_url}/{endpoint}'
+        if self.hedge_policy is not None and self.hedge_policy.pattern_for(endpoint) is not None:
+            data = await self.send_hedged(endpoint, url, params)
+        else:
+            data = await self.send_request(url, params)
+
+        # Store the decoded response so identical requests can be answered from the cache
+        self.cache.set(endpoint, params, data)
+        return data
+
+    async def send_hedged(self, endpoint, url, params=None):
+        """
+        Sends a request and, if it is slower than the hedge delay for its endpoint, an identical second request.
+        The first successful response is returned and the other request is cancelled.
+
+        Returns:
+            dict: JSON response from the API.
+        """
+        async def timed_send():
+            # Record the latency of every request, hedged or not, so the hedge delay follows the endpoint
+            started = time.monotonic()
+            data = await self.send_request(url, params)
+            self.hedge_policy.record(endpoint, time.monotonic() - started)
+            return data
+
+        primary = asyncio.ensure_future(timed_send())
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_policy.delay_for(endpoint))
+        if done or not self.hedge_policy.allow_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(timed_send())
+        pending = {primary, hedge}
+        try:
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Use the first successful response
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_policy.record_win()
+                        return task.result()
+                # Both requests failed: raise the error of the one that finished last
+                if not pending:
+                    return done.pop().result()
+        finally:
+            # Cancel the slower request
+            for task in pending:
+                task.cancel()
+
+    async def send_request(self, url, params=None):
+        """
+        Sends a GET request, retrying transient failures according to the retry policy.
+
+        Returns:
+            dict: JSON response from the API.
+
+        Raises:
+            ClientResponseError: If the API request fails.
+        """
+        attempt = 0
+        # Whether the breaker let this request through as its trial request, see SpoonacularAPI.send_request
+        trial = None
+        try:
+            while True:
+                attempt += 1
+                # Do not start an attempt after the deadline of the user action, and never wait past it
+                deadline = current_deadline()
+                timeout = None
+                if deadline is not None:
+                    deadline.check()
+                    timeout = aiohttp.ClientTimeout(total=deadline.remaining(), sock_connect=self.connect_timeout,
+                                                    sock_read=self.read_timeout)
+                # A request sent again with another key keeps the place the breaker gave it
+                if self.breaker is not None and trial is None:
+                    trial = self.breaker.before_request()
+                # Wait for the rate limiter without blocking the event loop, unless that runs past the deadline
+                if self.limiter is not None:
+                    delay = self.limiter.reserve()
+                    if deadline is not None and delay > 0 and delay >= deadline.remaining():
+                        self.limiter.cancel(delay=delay)
+                        raise DeadlineExceededError(f"Out of time: the {deadline.seconds:g} second time limit "
+                                                    f"would pass waiting for the API quota.")
+                    await asyncio.sleep(delay)
+                # Send the request with a key from the pool
+                key = None
+                if self.key_pool is not None:
+                    key = self.key_pool.select()
+                    params = dict(params or {}, apiKey=key)
+
+                try:
+                    # Wait for a free slot, so no more than max_concurrency requests are in flight
+                    async with self.semaphore:
+                        async with self.session.get(url, params=params, timeout=timeout) as response:
+                            if self.limiter is not None:
+                                self.limiter.update(response.headers)
+                            if key is not None:
+                                self.key_pool.update(key, response.headers)
+                                # Leave out a rejected key and try the next one, without counting it as a retry
+                                if response.status in (401, 402):
+                                    self.key_pool.disable(key, response.status)
+                                    if self.key_pool.available():
+                                        attempt -= 1
+                                        continue
+                            if self.breaker is not None:
+                                if response.status >= 500:
+                                    self.breaker.record_failure()
+                                else:
+                                    self.breaker.record_success()
+                                trial = None
+                            # Retry 429 and 5xx responses while attempts are left
+                            delay = None
+                            if self.retry_policy is not None and self.retry_policy.is_retryable_status(response.status):
+                                delay = self.retry_policy.delay_for(
+                                    attempt, self.retry_policy.parse_retry_after(response.headers))
+                                if deadline is not None and delay is not None and delay >= deadline.remaining():
+                                    delay = None
+                            if delay is None:
+                                response.raise_for_status()
+                                data = await response.json()
+                                break
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    if self.breaker is not None:
+                        self.breaker.record_failure()
+                        trial = None
+                    delay = self.retry_policy.delay_for(attempt) if self.retry_policy is not None else None
+                    if delay is None or (deadline is not None and delay >= deadline.remaining()):
+                        raise
+                # Wait outside the semaphore, so other requests can use the slot
+                await asyncio.sleep(delay)
+        finally:
+            # A trial request that ended without an outcome must not keep the breaker half-open
+            if trial:
+                self.breaker.release_trial()
+
+        return data
+
+    def cache_recipe_information(self, recipes):
+        """
+        Caches recipes that already carry their full information, like SpoonacularAPI.cache_recipe_information.
+        """
+        for recipe in recipes or []:
+            if isinstance(recipe, dict) and "id" in recipe and "extendedIngredients" in recipe:
+                self.cache.set(f"recipes/{recipe['id']}/information", None, recipe)
+
+
+# AsyncRecipeFinder class handles getting recipes from the API from asyncio code
+class AsyncRecipeFinder:
+    """
+    Asyncio counterpart of RecipeFinder. Sends the same requests with the same parameters.
+    """
+    def __init__(self, api, inline_information=False):
+        """
+        Initializes the AsyncRecipeFinder instance with an AsyncSpoonacularAPI object.
+
+        Args:
+            api (AsyncSpoonacularAPI): Client used to make the requests.
+            inline_information (bool, optional): If True, category searches ask the API to embed the full
+                recipe information in the results.
+        """
+        self.api = api
+        self.inline_information = inline_information
+
+    @async_log_function_call
+    @async_handle_errors
+    async def find_recipes_by_ingredients(self, ingredients, number=RECIPES_PER_SEARCH):
+        """
+        Finds recipes based on a list of ingredients.
+
+        Args:
+            ingredients (str): Comma-separated list of ingredients.
+            number (int, optional): Number of recipes to return.
+
+        Returns:
+            list: List of recipes matching the ingredients.
+
+        Raises:
+            ValueError: If the API response is empty or invalid.
+        """
+        endpoint = "recipes/findByIngredients"
+        params = {
+            "ingredients": ingredients,
+            "number": number,  # Number of recipes to return
+            "ranking": 2,  # Minimises missing ingredients
+            "apiKey": self.api.api_key,  # Uses the stored API key for authentication
+            "ignorePantry": "true"  # Ignore common pantry items
+        }
+        response = await self.api.make_request(endpoint, params=params)
+        if not response:
+            raise ValueError("API response is empty or invalid.")
+        # Remember the ID of each title, so it can be found later without a title search
+        self.api.title_index.add_recipes(response)
+        return response
+
+    @async_log_function_call
+    @async_handle_errors
+    async def find_recipes_by_category(self, category, number=RECIPES_PER_SEARCH):
+        """
+        Finds recipes based on a category.
+
+        Args:
+            category (str): Recipe category.
+            number (int, optional): Number of recipes to return.
+
+        Returns:
+            list: List of recipes in the specified category.
+
+        Raises:
+            ValueError: If the API response is empty or invalid.
+        """
+        endpoint = "recipes/complexSearch"
+        common_params = {
+            "number": number,  # Number of recipes to return
+            "apiKey": self.api.api_key,  # Uses the stored API key for authentication
+            "sort": "random",  # Shows different results each time
+            "ignorePantry": "true"  # Ignore common pantry items
+        }
+        # Ask for the full recipe information (with ingredients and instructions) inside the search results
+        if self.inline_information:
+            common_params["addRecipeInformation"] = "true"
+            common_params["fillIngredients"] = "true"
+        get_categories = CategoryMapping.get_category(category)
+        # If category mapping exists, set parameters accordingly
+        params = get_categories.set_params(common_params) if get_categories else common_params
+        response = await self.api.make_request(endpoint, params=params)
+        if not response:
+            raise ValueError("API response is empty or invalid.")
+        results = response.get("results", [])
+        # Cache any embedded recipe information so later detail lookups do not request it again
+        self.api.cache_recipe_information(results)
+        self.api.title_index.add_recipes(results)
+        return results
+
+    # Method that handles making a recipe request by random search, decorated with logging and error handling
+    @async_log_function_call
+    @async_handle_errors
+    async def find_random_recipes(self, number=RECIPES_PER_SEARCH):
+        endpoint = "recipes/random"
+        params = {
+            "number": number,  # Number of recipes to return
+            "apiKey": self.api.api_key  # Uses the stored API key for authentication
+        }
+        response = await self.api.make_request(endpoint, params=params)
+
+        # Check if the response contains a "recipes" key and return its value
+        if response and "recipes" in response:
+            self.api.cache_recipe_information(response["recipes"])
+            self.api.title_index.add_recipes(response["recipes"])
+            return response["recipes"]
+        # Print an error message if the response format is unexpected
+        print("Unexpected response format:", response)
+        return []
+
+    # Method that handles getting all recipe information, decorated with logging and error handling
+    @async_log_function_call
+    @async_handle_errors
+    async def find_recipe_details(self, recipe_id):
+        endpoint = f"recipes/{recipe_id}/information"
+        params = {
+            "apiKey": self.api.api_key  # Uses the stored API key for authentication
+        }
+        response = await self.api.make_request(endpoint, params=params)
+
+        # ValueError for empty or invalid responses
+        if not response:
+            raise ValueError("API response is empty or invalid.")
+        # Remember the ID of the title, so it can be looked up without a search
+        self.api.title_index.add_recipes([response])
+        return response
+
+    async def find_many_recipe_details(self, recipe_ids):
+        """
+        Finds the information of many recipes at the same time.
+
+        Every lookup is started at once, and the API client's semaphore limits how many requests
+        are actually in flight. A recipe that cannot be found is returned as None.
+
+        Args:
+            recipe_ids (list): IDs of the recipes to look up.
+
+        Returns:
+            list: Recipe information in the same order as recipe_ids.
+        """
+        return await asyncio.gather(*(self.find_recipe_details(recipe_id) for recipe_id in recipe_ids))
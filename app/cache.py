@@ -0,0 +1,360 @@
+# ===== Importing Libraries ===========
+# Used to measure the size of cached responses
+import json
+# Used to store cached responses on disk
+import sqlite3
+# Used to compress cached responses on disk
+import zlib
+# Used to keep track of time for cache expiry
+import time
+# Used to make the cache safe to share between threads
+import threading
+# Used to keep cache entries in least-recently-used order
+from collections import OrderedDict
+# Used to match endpoints such as "recipes/123/information" against TTL patterns
+from fnmatch import fnmatchcase
+# Used to build a canonical query string for cache keys
+from urllib.parse import urlencode
+
+# ===== Importing data from files ===========
+from .config import (CACHE_MAX_BYTES, CACHE_TTLS, CACHE_DEFAULT_TTL, CACHE_NEGATIVE_TTL,
+                     DISK_CACHE_MAX_BYTES, DISK_CACHE_TTLS, DISK_CACHE_DEFAULT_TTL)
+
+
+# ===== Cache Policy ===========
+
+# CachePolicy holds the rules shared by the in-memory and on-disk caches
+class CachePolicy:
+    """
+    Base class that decides how requests are keyed and how long their responses are kept.
+    """
+    def __init__(self, ttls, default_ttl, negative_ttl):
+        """
+        Args:
+            ttls (dict): Mapping of endpoint patterns to time-to-live in seconds.
+                A TTL of 0 disables caching for that endpoint.
+            default_ttl (int): TTL used for endpoints that match no pattern.
+            negative_ttl (int): TTL used for empty responses, such as a search with no results.
+        """
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """
+        Builds a canonical cache key from an endpoint and its parameters, ignoring the API key.
+
+        Returns:
+            str: Cache key such as "recipes/1/information?includeNutrition=false".
+        """
+        params = params or {}
+        # Sort the parameters so their order does not change the key
+        query = urlencode(sorted((str(name), str(value)) for name, value in params.items() if name != "apiKey"))
+        return f"{endpoint}?{query}"
+
+    def ttl_for(self, endpoint, value=None):
+        """
+        Returns the time-to-live in seconds for an endpoint, using the first matching pattern.
+
+        Empty responses are kept for at most the negative TTL, so new results show up soon.
+        """
+        ttl = self.default_ttl
+        for pattern, pattern_ttl in self.ttls.items():
+            if fnmatchcase(endpoint, pattern):
+                ttl = pattern_ttl
+                break
+        if value is not None and self.is_empty(value):
+            return min(ttl, self.negative_ttl)
+        return ttl
+
+    @staticmethod
+    def is_empty(value):
+        """
+        Checks whether a response holds no recipes, e.g. [] or {"results": []}.
+        """
+        if isinstance(value, dict):
+            if "results" in value:
+                return not value["results"]
+            if "recipes" in value:
+                return not value["recipes"]
+        return not value
+
+    def is_cacheable(self, endpoint, params=None):
+        """
+        Checks whether responses for this request may be cached.
+
+        Requests sorted randomly are never cached, because they are meant to return different results each time.
+        """
+        if params and params.get("sort") == "random":
+            return False
+        return self.ttl_for(endpoint) > 0
+
+
+# ===== In-memory Response Cache ===========
+
+# ResponseCache stores decoded API responses so identical requests are only sent once
+class ResponseCache(CachePolicy):
+    """
+    In-process LRU cache with per-endpoint TTLs and a byte budget.
+
+    Entries are keyed by endpoint plus the canonicalised query parameters. The `apiKey`
+    parameter is left out of the key, so the same recipe is shared between API keys.
+    Cached values are returned as-is, so callers must not modify them.
+    """
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, ttls=None, default_ttl=CACHE_DEFAULT_TTL,
+                 negative_ttl=CACHE_NEGATIVE_TTL, clock=time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int, optional): Maximum total size of the cached responses, in bytes.
+            ttls (dict, optional): Mapping of endpoint patterns to time-to-live in seconds.
+            default_ttl (int, optional): TTL used for endpoints that match no pattern.
+            negative_ttl (int, optional): TTL used for empty responses.
+            clock (function, optional): Function returning the current time in seconds.
+        """
+        super().__init__(CACHE_TTLS if ttls is None else ttls, default_ttl, negative_ttl)
+        self.max_bytes = max_bytes
+        self.clock = clock
+        # Each entry maps a key to a tuple of (value, size in bytes, expiry time)
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        # Counters to monitor how well the cache is working
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, endpoint, params=None):
+        """
+        Returns the cached response for a request, or None if it is missing or expired.
+        """
+        key = self.make_key(endpoint, params)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            # Drop the entry if its TTL has run out
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.misses += 1
+                return None
+            # Mark the entry as the most recently used
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, endpoint, params, value):
+        """
+        Stores a response in the cache, evicting the least recently used entries if the byte budget is exceeded.
+
+        Empty responses (None) and responses for non-cacheable requests are not stored.
+        """
+        if value is None or not self.is_cacheable(endpoint, params):
+            return
+        key = self.make_key(endpoint, params)
+        size = len(json.dumps(value, separators=(",", ":")))
+        # Responses larger than the whole budget are never cached
+        if size > self.max_bytes:
+            return
+        expires_at = self.clock() + self.ttl_for(endpoint, value)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            # Evict least recently used entries until the new response fits
+            while self.entries and self.current_bytes + size > self.max_bytes:
+                oldest_key = next(iter(self.entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+            self.entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+
+    def _remove(self, key):
+        # Remove an entry and release its bytes from the budget (caller holds the lock)
+        _, size, _ = self.entries.pop(key)
+        self.current_bytes -= size
+
+    def clear(self):
+        """
+        Removes every entry from the cache. Counters are kept.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, number of entries and bytes used.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+            }
+
+    def __len__(self):
+        return len(self.entries)
+
+
+# ===== On-disk Response Cache ===========
+
+# DiskCache keeps responses in a SQLite file so they survive restarts of the application
+class DiskCache(CachePolicy):
+    """
+    Persistent response cache stored in a single SQLite file.
+
+    Responses are stored as zlib-compressed JSON with an expiry time. The file uses write-ahead
+    logging and a busy timeout, so several processes can read and write the same cache safely.
+    When the total size of the stored responses exceeds the byte budget, the least recently used
+    responses are deleted.
+    """
+    def __init__(self, path, max_bytes=DISK_CACHE_MAX_BYTES, ttls=None, default_ttl=DISK_CACHE_DEFAULT_TTL,
+                 negative_ttl=CACHE_NEGATIVE_TTL, clock=time.time):
+        """
+        Initializes the cache. The SQLite file is opened on first use.
+
+        Args:
+            path (str): Path of the SQLite file.
+            max_bytes (int, optional): Maximum total size of the compressed responses, in bytes.
+            ttls (dict, optional): Mapping of endpoint patterns to time-to-live in seconds.
+            default_ttl (int, optional): TTL used for endpoints that match no pattern.
+            negative_ttl (int, optional): TTL used for empty responses.
+            clock (function, optional): Function returning the current wall-clock time in seconds.
+        """
+        super().__init__(DISK_CACHE_TTLS if ttls is None else ttls, default_ttl, negative_ttl)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.connection = None
+        self.lock = threading.Lock()
+        # Counters to monitor how well the cache is working in this process
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self):
+        # Open the SQLite file and create the table on first use (caller holds the lock)
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                                              isolation_level=None)
+            # Write-ahead logging lets readers in other processes work while one process writes
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+        return self.connection
+
+    def get(self, endpoint, params=None):
+        """
+        Returns the cached response for a request, or None if it is missing or expired.
+        """
+        if not self.is_cacheable(endpoint, params):
+            return None
+        key = self.make_key(endpoint, params)
+        now = self.clock()
+        with self.lock:
+            connection = self._connect()
+            row = connection.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            blob, expires_at = row
+            # Delete the response if its TTL has run out
+            if expires_at <= now:
+                connection.execute("DELETE FROM responses WHERE key = ? AND expires_at <= ?", (key, now))
+                self.misses += 1
+                return None
+            # Record the access so least recently used responses are evicted first
+            connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(zlib.decompress(blob))
+
+    def set(self, endpoint, params, value):
+        """
+        Stores a compressed response, then evicts the least recently used responses if the file is over budget.
+        """
+        if value is None or not self.is_cacheable(endpoint, params):
+            return
+        ttl = self.ttl_for(endpoint, value)
+        if ttl <= 0:
+            return
+        key = self.make_key(endpoint, params)
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        # Responses larger than the whole budget are never cached
+        if len(blob) > self.max_bytes:
+            return
+        now = self.clock()
+        with self.lock:
+            connection = self._connect()
+            # BEGIN IMMEDIATE takes the write lock up front, so concurrent processes wait instead of failing
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), now + ttl, now))
+                self._evict(connection, now)
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+    def _evict(self, connection, now):
+        # Remove expired responses, then the least recently used ones until the total size fits the budget
+        connection.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = connection.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        Deletes every stored response. Counters are kept.
+        """
+        with self.lock:
+            self._connect().execute("DELETE FROM responses")
+
+    def close(self):
+        """
+        Closes the SQLite connection. The file is reopened automatically on the next use.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses and evictions in this process, plus the number of entries and bytes in the file.
+        """
+        with self.lock:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+            }
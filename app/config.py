@@ -3,6 +3,156 @@
 # Replace 'your-api-key-here' with your actual Spoonacular API key
 api_key = 'your-api-key-here'
 
+# To use the daily quota of several keys, list them all here. Each request is sent with one key
+# from the list; a key that is rejected or has used up its quota is left out until midnight UTC.
+API_KEYS = [api_key]
+API_KEY_STRATEGY = "least_used"  # "least_used" (fewest points used today) or "round_robin"
+
+# ===== HTTP Connection Pool Configuration ==========
+
+# The API client keeps a long-lived pool of keep-alive connections so that repeated
+# requests to Spoonacular reuse an open TCP+TLS connection instead of opening a new one.
+HTTP_POOL_CONNECTIONS = 4  # Number of per-host connection pools to keep around
+HTTP_POOL_MAXSIZE = 10  # Maximum number of open connections kept per host
+HTTP_POOL_BLOCK = False  # Set to True to wait for a free connection instead of opening extra ones
+HTTP_KEEP_ALIVE = True  # Set to False to close the connection after every request
+
+# Seconds to wait for a connection to the API, and for the API to send data once connected.
+# Without a timeout a stalled connection would freeze the app.
+HTTP_CONNECT_TIMEOUT = 3.05
+HTTP_READ_TIMEOUT = 10
+# Time budget in seconds for each user action (searching and showing recipes). Recipes whose details
+# cannot be loaded in time are shown without them. Set to None for no limit.
+ACTION_DEADLINE = 5
+
+# Hedged requests: when a recipe detail lookup takes longer than usual (the 95th percentile of recent
+# lookups), an identical second request is sent and the first response is used. This cuts the wait for
+# the slowest recipe, at the cost of a few extra requests (at most HEDGE_MAX_RATE of all lookups).
+HEDGE_ENABLED = False  # Set to True to hedge slow detail lookups
+HEDGE_ENDPOINTS = ("recipes/*/information",)  # Only idempotent GET endpoints should be listed here
+HEDGE_PERCENTILE = 95
+HEDGE_DEFAULT_DELAY = 1.0  # Seconds to wait before hedging until enough lookups have been measured
+HEDGE_MIN_DELAY = 0.05  # Never hedge a request sooner than this
+HEDGE_MAX_RATE = 0.1  # At most 10% of lookups are hedged
+
+# Maximum number of requests the async client (app/async_app.py) sends at the same time.
+# Further requests wait for a free slot, so hundreds of lookups can be started at once.
+ASYNC_MAX_CONCURRENCY = 10
+
+# Requests are spaced out so they fit the API quota. Each request costs at least 1 point; Spoonacular
+# reports the real cost and the daily quota left in the X-API-Quota-* response headers.
+QUOTA_LIMIT_ENABLED = True  # Set to False to send requests without waiting
+QUOTA_POINTS_PER_MINUTE = 60  # Quota points that may be spent per minute
+QUOTA_BURST = 5  # Points that can be spent at once after a quiet period
+
+# Transient failures (connection errors, timeouts, 429 and 5xx responses) are retried with exponential backoff
+RETRY_MAX_ATTEMPTS = 3  # Attempts per request, including the first one. Set to 1 to turn retries off
+RETRY_BASE_DELAY = 0.5  # Seconds to wait (at most) after the first failed attempt; doubles after each attempt
+RETRY_MAX_DELAY = 8  # Longest wait between two attempts; a longer Retry-After is not retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# After this many failures in a row the API is treated as down and requests fail straight away
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30  # Seconds to wait before trying the API again
+
+# Maximum number of recipe IDs sent in one request to the recipes/informationBulk endpoint
+BULK_CHUNK_SIZE = 50
+
+# Number of recipes returned by each search (ingredients, category and random)
+RECIPES_PER_SEARCH = 5
+
+# Quota points Spoonacular charges per request ("request"), per recipe returned ("result") and per recipe
+# for each extra option, used to pick the cheapest way to get recipe details. informationBulk costs
+# 1 point for the first recipe and 0.5 for each further one, which is written as 0.5 + 0.5 per recipe.
+QUOTA_COSTS = {
+    "recipes/findByIngredients": {"request": 1, "result": 0.01},
+    "recipes/complexSearch": {"request": 1, "result": 0.01, "addRecipeInformation": 0.025,
+                              "fillIngredients": 0.025},
+    "recipes/random": {"request": 1, "result": 0.01},
+    "recipes/*/information": {"request": 1},
+    "recipes/informationBulk": {"request": 0.5, "result": 0.5},
+}
+
+# How the results screen fetches recipe details:
+# "bulk" gets all recipes with one informationBulk request,
+# "concurrent" sends one request per recipe in parallel and prints each recipe as soon as it is ready.
+DETAIL_FETCH_MODE = "bulk"
+DETAIL_FETCH_WORKERS = 5  # Maximum number of detail requests running at the same time in concurrent mode
+
+# Set to True to ask complexSearch (category menu and title lookups during export) to embed the full
+# recipe information in its results, instead of making one extra detail request per recipe.
+INLINE_RECIPE_INFORMATION = True
+
+# Set to True to show only the list of recipe titles first. The full ingredients and instructions of a
+# recipe are then downloaded only when the user asks for it by number.
+LAZY_DISPLAY = False
+
+# ===== Saved Recipes Configuration ==========
+
+# Saved recipes are kept in this SQLite file so they are still there after a restart.
+# Set to None to keep saved recipes in memory only.
+SAVED_RECIPES_PATH = "saved_recipes.sqlite3"
+
+# ===== Export Configuration ==========
+
+# File that menu option 5 exports to. The extension selects the format: .xlsx, .csv, .jsonl or .md
+EXPORT_FILENAME = 'saved_recipes.xlsx'
+EXPORT_WORKERS = 4  # Number of saved recipes fetched from the API at the same time during an export
+EXPORT_PREFETCH = 16  # Maximum number of recipes fetched ahead of the one being written
+EXPORT_CONSTANT_MEMORY = True  # Stream the Excel file to disk row by row, so memory stays flat for large exports
+EXPORT_INCREMENTAL = True  # Keep a manifest next to the export and only download new recipes on the next export
+EXPORT_MANIFEST_MAX_AGE = 7 * 24 * 60 * 60  # Recipes exported more than 7 days ago are downloaded again
+# Split very large exports into several files written in parallel processes:
+# "category" for one file per category, a number for a fixed number of recipes per file, or None for one file
+EXPORT_SHARD_BY = None
+EXPORT_SHARD_PROCESSES = None  # Maximum number of processes writing shards (None uses every CPU core)
+
+# ===== Response Cache Configuration ==========
+
+# Decoded API responses are cached in memory so the same recipe is not downloaded twice in one session.
+CACHE_MAX_BYTES = 5 * 1024 * 1024  # Maximum size of all cached responses (5 MB)
+CACHE_DEFAULT_TTL = 600  # Time-to-live in seconds for endpoints not listed below
+# Time-to-live in seconds per endpoint pattern ('*' matches a recipe ID). A TTL of 0 disables caching.
+CACHE_TTLS = {
+    "recipes/*/information": 24 * 60 * 60,  # Recipe details rarely change
+    "recipes/findByIngredients": 60 * 60,
+    "recipes/complexSearch": 60 * 60,
+    "recipes/random": 0,  # Random recipes should be different every time
+    "recipes/informationBulk": 0,  # Each recipe from a bulk response is cached under its own ID instead
+}
+CACHE_NEGATIVE_TTL = 5 * 60  # Empty results (no recipes found) are only kept for 5 minutes
+
+# Responses can also be kept in a SQLite file so they survive restarts of the application.
+DISK_CACHE_PATH = "recipe_cache.sqlite3"  # Set to None to disable the on-disk cache
+DISK_CACHE_MAX_BYTES = 50 * 1024 * 1024  # Maximum size of the compressed responses on disk (50 MB)
+DISK_CACHE_DEFAULT_TTL = 0  # Endpoints not listed below are not stored on disk
+DISK_CACHE_TTLS = {
+    "recipes/*/information": 7 * 24 * 60 * 60,  # Recipe details are large and rarely change
+    "recipes/findByIngredients": 24 * 60 * 60,
+    "recipes/complexSearch": 24 * 60 * 60,
+    "recipes/random": 0,
+    "recipes/informationBulk": 0,
+}
+
+# ===== Title Index Configuration ==========
+
+# The ID of every recipe title seen in a search response is kept in this SQLite file, so the export can
+# find a recipe by its title without a complexSearch request. Set to None to keep the index in memory only.
+TITLE_INDEX_PATH = "recipe_titles.sqlite3"
+# Minimum similarity (0 to 1) for a slightly different title to count as a match. None only allows exact matches.
+TITLE_INDEX_FUZZY_CUTOFF = None
+
+# ===== Offline Corpus Configuration ==========
+
+# Every full recipe received from the API is also kept in this SQLite file, with a full-text index over titles,
+# ingredients and instructions. When the API cannot be reached, is rate limited or is too slow for the time
+# limit, searches are answered from it instead. Set to None to turn the corpus off.
+CORPUS_PATH = "recipe_corpus.sqlite3"
+# Set to True to answer every search from the corpus without contacting the API (e.g. on a device without internet)
+OFFLINE_MODE = False
+# Set to True to rank the stored recipes by your ingredients first, and only search the API when fewer than
+# RECIPES_PER_SEARCH stored recipes use any of them
+LOCAL_INGREDIENT_SEARCH = False
+
 # ===== Logging Configuration ==========
 
 # Toggle logging behavior for the application.
@@ -0,0 +1,306 @@
+# ===== Importing Libraries ===========
+# Used to store the full recipe information as text
+import json
+# Used to read the recipe ID from endpoints such as "recipes/123/information"
+import re
+# Used to keep the corpus and its full-text index in a local file
+import sqlite3
+# Used to make the corpus safe to share between threads
+import threading
+# Used to record when a recipe was last stored
+import time
+
+# ===== Importing data from files ===========
+from .title_index import TitleIndex
+from .pantry import PantryMatcher
+from .numeric_index import NumericIndex
+
+
+# ===== Recipe Corpus ===========
+
+# RecipeCorpus keeps every recipe seen by the app in a local database, so searches can be answered offline
+class RecipeCorpus:
+    """
+    Local collection of every full recipe returned by the API, with an SQLite FTS5 index over the
+    recipe titles, ingredient names and instruction text.
+
+    The corpus can answer the requests the app makes (ingredient, category and title searches,
+    random recipes and recipe details) in the same format as the API, from the recipes it holds.
+    This is used when the API cannot be reached, and in offline mode.
+    """
+    def __init__(self, path=":memory:", clock=time.time):
+        """
+        Args:
+            path (str, optional): Path of the SQLite file. By default the corpus is kept in memory only.
+            clock (function, optional): Function returning the current wall-clock time in seconds.
+        """
+        self.path = path
+        self.clock = clock
+        self.connection = None
+        self.lock = threading.Lock()
+        # Increased whenever recipes are added or changed, so the pantry matcher and numeric index know to update
+        self.version = 0
+        self.pantry = PantryMatcher(self)
+        self.numbers = NumericIndex(self)
+
+    def _connect(self):
+        # Open the SQLite file and create the tables on first use (caller holds the lock)
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # Dish types and diets are stored as "|snack|appetizer|", so one of them can be matched with LIKE
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS recipes ("
+                "id INTEGER PRIMARY KEY, title TEXT NOT NULL, ready_in_minutes INTEGER, dish_types TEXT NOT NULL, "
+                "diets TEXT NOT NULL, data TEXT NOT NULL, updated_at REAL NOT NULL)")
+            # The rowid of each row in the full-text index is the recipe ID
+            self.connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_text USING fts5("
+                "title, ingredients, instructions, tokenize='unicode61 remove_diacritics 2')")
+            # The ingredient names of each recipe, one row per ingredient, read by the pantry matcher
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS recipe_ingredients (recipe_id INTEGER NOT NULL, name TEXT NOT NULL)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS recipe_ingredients_recipe ON recipe_ingredients (recipe_id)")
+            # The numeric fields of each recipe, read by the numeric index
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS recipe_numbers (recipe_id INTEGER PRIMARY KEY, ready_in_minutes REAL, "
+                "servings REAL, health_score REAL, price_per_serving REAL, aggregate_likes REAL)")
+            self.connection.commit()
+        return self.connection
+
+    def add_recipes(self, recipes):
+        """
+        Stores recipes that carry their full information (ingredients and instructions).
+        Other recipes, such as plain search results, are skipped.
+
+        Args:
+            recipes (list): Recipe dictionaries from any API response.
+        """
+        rows = []
+        for recipe in recipes or []:
+            if isinstance(recipe, dict) and recipe.get("id") and recipe.get("title") and "extendedIngredients" in recipe:
+                rows.append(recipe)
+        if not rows:
+            return
+        ingredients = []
+        numbers = []
+        with self.lock:
+            connection = self._connect()
+            now = self.clock()
+            for recipe in rows:
+                data = json.dumps(recipe)
+                stored = connection.execute("SELECT data FROM recipes WHERE id = ?", (recipe["id"],)).fetchone()
+                if stored is not None and stored[0] == data:
+                    # Nothing the indexes hold has changed, so only mark the recipe as recently seen
+                    connection.execute("UPDATE recipes SET updated_at = ? WHERE id = ?", (now, recipe["id"]))
+                    continue
+                connection.execute(
+                    "INSERT OR REPLACE INTO recipes (id, title, ready_in_minutes, dish_types, diets, data, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (recipe["id"], recipe["title"], recipe.get("readyInMinutes"),
+                     self._join(recipe.get("dishTypes")), self._join(recipe.get("diets")), data, now))
+                connection.execute("DELETE FROM recipe_text WHERE rowid = ?", (recipe["id"],))
+                connection.execute(
+                    "INSERT INTO recipe_text (rowid, title, ingredients, instructions) VALUES (?, ?, ?, ?)",
+                    (recipe["id"], recipe["title"], " ".join(self._ingredient_names(recipe)),
+                     " ".join(step.get("step", "") for instructions in recipe.get("analyzedInstructions") or []
+                              for step in instructions.get("steps", []))))
+                connection.execute("DELETE FROM recipe_ingredients WHERE recipe_id = ?", (recipe["id"],))
+                names = dict.fromkeys(TitleIndex.normalize(name) for name in self._ingredient_names(recipe))
+                names = [name for name in names if name]
+                connection.executemany("INSERT INTO recipe_ingredients (recipe_id, name) VALUES (?, ?)",
+                                       [(recipe["id"], name) for name in names])
+                numbers.append(NumericIndex.row_for(recipe))
+                connection.execute("INSERT OR REPLACE INTO recipe_numbers VALUES (?, ?, ?, ?, ?, ?)", numbers[-1])
+                ingredients.append((recipe["id"], names))
+            connection.commit()
+            if not ingredients:
+                return
+            self.version += 1
+            version = self.version
+        # Add the new rows to the matcher and index in place, outside the corpus lock as refresh() takes it
+        self.pantry.add(ingredients, version)
+        self.numbers.add(numbers, version)
+
+    def add_response(self, endpoint, data):
+        """
+        Stores the full recipes contained in an API response, whatever the endpoint.
+        """
+        if isinstance(data, dict):
+            recipes = data.get("results") or data.get("recipes") or [data]
+        else:
+            recipes = data
+        self.add_recipes(recipes if isinstance(recipes, list) else [])
+
+    @staticmethod
+    def _join(values):
+        # Store a list of names so each one can be matched with LIKE '%|name|%'
+        return "|" + "|".join(str(value).lower() for value in values or []) + "|"
+
+    @staticmethod
+    def _ingredient_names(recipe):
+        # Return the name of every ingredient of a recipe
+        return [ingredient.get("name") or "" for ingredient in recipe.get("extendedIngredients") or []]
+
+    @staticmethod
+    def _match_terms(column, text, separator=","):
+        # Build an FTS5 query that matches every term (or phrase) of the text in one column
+        terms = [TitleIndex.normalize(term) for term in str(text).split(separator)]
+        phrases = ['"' + term.replace('"', '""') + '"' for term in terms if term]
+        return f"{column} : ({' AND '.join(phrases)})" if phrases else None
+
+    # SQL for each order of the results: by relevance to the full-text match, at random, or newest first
+    ORDERS = {"rank": "recipe_text.rank", "random": "random()", "recent": "recipes.updated_at DESC"}
+
+    def _search(self, conditions, values, match=None, order="recent", number=10):
+        # Return the data of the recipes that match the conditions (caller holds the lock)
+        sql = "SELECT recipes.data FROM recipes"
+        if match is not None:
+            sql += " JOIN recipe_text ON recipe_text.rowid = recipes.id"
+            conditions = ["recipe_text MATCH ?"] + conditions
+            values = [match] + values
+        elif order == "rank":
+            order = "recent"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {self.ORDERS[order]} LIMIT ?"
+        return [json.loads(row[0]) for row in self._connect().execute(sql, values + [number])]
+
+    def iter_ingredients(self):
+        """
+        Returns the (recipe ID, ingredient name) pairs of every stored recipe, grouped by recipe.
+        """
+        with self.lock:
+            return self._connect().execute(
+                "SELECT recipe_id, name FROM recipe_ingredients ORDER BY recipe_id").fetchall()
+
+    def iter_numbers(self):
+        """
+        Returns one row of numeric fields per stored recipe, in the order of NumericIndex.FIELDS.
+        """
+        with self.lock:
+            return self._connect().execute(
+                "SELECT recipe_id, ready_in_minutes, servings, health_score, price_per_serving, aggregate_likes "
+                "FROM recipe_numbers").fetchall()
+
+    def filter_recipes(self, ranges=None, sort=(), number=None, recipe_ids=None):
+        """
+        Filters and sorts the stored recipes by their numeric fields, such as "ready in 20 minutes or
+        less, cheapest first". See NumericIndex.query for the arguments.
+
+        Returns:
+            list: The full information of the matching recipes, in order.
+        """
+        recipes = (self.get(match["id"]) for match in self.numbers.query(ranges, sort, number, recipe_ids))
+        return [recipe for recipe in recipes if recipe is not None]
+
+    def get(self, recipe_id):
+        """
+        Returns the full information of a recipe, or None if it is not in the corpus.
+        """
+        with self.lock:
+            row = self._connect().execute("SELECT data FROM recipes WHERE id = ?", (recipe_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def search_by_ingredients(self, ingredients, number=10):
+        """
+        Finds recipes that use any of the ingredients, with the fewest missing ingredients first,
+        in the format of the recipes/findByIngredients endpoint (plus the full recipe information).
+        The recipes are ranked by a PantryMatcher, which scores every stored recipe at once.
+
+        Args:
+            ingredients (str): Comma-separated list of ingredients.
+            number (int, optional): Maximum number of recipes to return.
+
+        Returns:
+            list: Matching recipes with usedIngredients and missedIngredients.
+        """
+        results = []
+        for match in self.pantry.match(ingredients, number):
+            recipe = self.get(match["id"])
+            if recipe is not None:
+                results.append(dict(recipe, **match))
+        return results
+
+    def search(self, params):
+        """
+        Finds recipes for the parameters of a recipes/complexSearch request: a title query, the
+        includeIngredients, type, diet and maxReadyTime filters, and the number of results.
+
+        Returns:
+            dict: The matching recipes in "results", as returned by the API.
+        """
+        params = params or {}
+        conditions, values = [], []
+        match = None
+        if params.get("query"):
+            match = self._match_terms("title", params["query"], separator=" ")
+        if params.get("includeIngredients"):
+            include = self._match_terms("ingredients", params["includeIngredients"])
+            match = include if match is None else f"{match} AND {include}"
+        if params.get("type"):
+            conditions.append("recipes.dish_types LIKE ?")
+            values.append(f"%|{str(params['type']).lower()}|%")
+        if params.get("diet"):
+            # "vegan|vegetarian" matches a recipe with either diet, also "lacto ovo vegetarian"
+            diets = [diet.strip().lower() for diet in str(params["diet"]).split("|") if diet.strip()]
+            conditions.append("(" + " OR ".join("recipes.diets LIKE ?" for _ in diets) + ")")
+            values.extend(f"%{diet}%" for diet in diets)
+        if params.get("maxReadyTime"):
+            conditions.append("recipes.ready_in_minutes <= ?")
+            values.append(int(params["maxReadyTime"]))
+        # Title searches are ordered by relevance, other searches by the sort option of the request
+        order = "rank" if params.get("query") else "random" if params.get("sort") == "random" else "recent"
+        with self.lock:
+            results = self._search(conditions, values, match=match, order=order,
+                                   number=int(params.get("number", 10)))
+        return {"results": results, "offset": 0, "number": len(results), "totalResults": len(results)}
+
+    def random(self, number=10):
+        """
+        Returns random recipes, in the format of the recipes/random endpoint.
+        """
+        with self.lock:
+            return {"recipes": self._search([], [], order="random", number=number)}
+
+    def answer(self, endpoint, params=None):
+        """
+        Answers an API request from the corpus.
+
+        Args:
+            endpoint (str): API endpoint of the request.
+            params (dict, optional): Query parameters of the request.
+
+        Returns:
+            dict or list: The answer in the format of the API, or None if the corpus cannot answer
+                the request (unknown endpoint or recipe).
+        """
+        params = params or {}
+        number = int(params.get("number", 10))
+        if endpoint == "recipes/findByIngredients":
+            return self.search_by_ingredients(params.get("ingredients", ""), number)
+        if endpoint == "recipes/complexSearch":
+            return self.search(params)
+        if endpoint == "recipes/random":
+            return self.random(number)
+        if endpoint == "recipes/informationBulk":
+            recipes = [self.get(recipe_id) for recipe_id in str(params.get("ids", "")).split(",") if recipe_id]
+            return [recipe for recipe in recipes if recipe is not None]
+        found = re.fullmatch(r"recipes/(\d+)/information", endpoint)
+        if found:
+            return self.get(int(found.group(1)))
+        return None
+
+    def __len__(self):
+        with self.lock:
+            return self._connect().execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def close(self):
+        """
+        Closes the SQLite file. It is reopened automatically on the next use.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,90 @@
+# ===== Importing Libraries ===========
+# Used to make the current deadline available to every call made for one user action
+import contextvars
+# Used to measure how much of the time budget is left
+import time
+
+
+# Raised instead of sending a request when the deadline of the user action has passed
+class DeadlineExceededError(TimeoutError):
+    pass
+
+
+# Deadline of the user action that is running in the current thread or task
+_current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+
+def current_deadline():
+    """
+    Returns the deadline of the user action that is running, or None if there is none.
+    """
+    return _current_deadline.get()
+
+
+# ===== Deadline Budget ===========
+
+# Deadline is a time budget for one user action, shared by every request made for it
+class Deadline:
+    """
+    Time budget for one user action, such as "show 5 recipes within 3 seconds".
+
+    Use it as a context manager. Every request sent inside the `with` block (also from threads
+    started with contextvars.copy_context) gets a timeout no longer than the time that is left,
+    and requests are not sent at all once the deadline has passed. The same deadline can be
+    entered more than once to share its budget between several steps. Inside another deadline,
+    the earlier of the two applies.
+    """
+    def __init__(self, seconds, clock=time.monotonic):
+        """
+        Args:
+            seconds (float): Time budget in seconds, starting now.
+            clock (function, optional): Function returning the current time in seconds.
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+        self.tokens = []
+
+    def remaining(self):
+        """
+        Returns the number of seconds left, or 0 once the deadline has passed.
+        """
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self):
+        """
+        Returns True once the deadline has passed.
+        """
+        return self.remaining() <= 0
+
+    def check(self):
+        """
+        Raises DeadlineExceededError if the deadline has passed.
+        """
+        if self.expired():
+            raise DeadlineExceededError(f"Out of time: the {self.seconds:g} second time limit was reached.")
+
+    def limit(self, timeout):
+        """
+        Shortens a requests timeout so it does not run past the deadline.
+
+        Args:
+            timeout (float or tuple): Timeout in seconds, or a (connect, read) tuple.
+
+        Returns:
+            float or tuple: The timeout, with every value at most the time that is left.
+        """
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def __enter__(self):
+        outer = _current_deadline.get()
+        # Keep the earlier deadline if this one is entered inside another
+        active = outer if outer is not None and outer.expires_at <= self.expires_at else self
+        self.tokens.append(_current_deadline.set(active))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_deadline.reset(self.tokens.pop())
@@ -1,5 +1,6 @@
 # ===== Importing Libraries ===========
 import requests
+import asyncio  # `asyncio` is used to recognise cancelled tasks in the async decorators
 from functools import wraps  # `wraps` is used to preserve the original function's metadata when decorating it
 from .config import LOGGING_ENABLED  # Import a configuration setting to enable or disable logging
 
@@ -44,7 +45,8 @@ def handle_errors(func):
 
     - If a `ValueError` is raised, and it's related to empty input, the decorator will prompt the user
       to re-enter the input by continuing the loop.
-    - For `HTTPError` related to missing or invalid API keys, a specific error message will be shown.
+    - For `HTTPError` related to missing or invalid API keys (401), a used up daily quota (402) or too many
+      requests (429), a specific error message will be shown.
     - For any other exceptions, the error is printed, and the function returns `None` to signal failure.
 
     Args:
@@ -70,6 +72,10 @@ def handle_errors(func):
                 # Handle HTTP errors, especially for missing or invalid API keys
                 if e.response is not None and e.response.status_code == 401:
                     print("\nError!: No API key found or invalid API key. Check if API key is entered correctly")
+                elif e.response is not None and e.response.status_code == 402:
+                    print("\nError!: The daily API quota is used up. Try again tomorrow")
+                elif e.response is not None and e.response.status_code == 429:
+                    print("\nError!: Too many requests to the API. Wait a moment and try again")
                 else:
                     print(f"HTTP Error: {e}")
                 return None
@@ -79,3 +85,72 @@ def handle_errors(func):
                 return None
 
     return wrapper
+
+
+# Decorator for logging calls of coroutine functions
+def async_log_function_call(func):
+    """
+    The async counterpart of `log_function_call`, for methods defined with `async def`.
+
+    The message before the call is printed when the coroutine starts, and the return value is printed
+    once it has been awaited. Logging is toggled with the same `LOGGING_ENABLED` setting.
+
+    Args:
+        func (coroutine function): The coroutine function to be decorated.
+
+    Returns:
+        coroutine function: The wrapped coroutine function with logging functionality.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if LOGGING_ENABLED:
+            print(f"Calling function: {func.__name__}")
+        result = await func(*args, **kwargs)
+        if LOGGING_ENABLED:
+            print(f"Function {func.__name__} returned: {result}")
+        return result
+
+    return wrapper
+
+
+def async_handle_errors(func):
+    """
+    The async counterpart of `handle_errors`, for methods defined with `async def`.
+
+    Errors are reported in the same way and the coroutine returns `None` to signal failure.
+    HTTP errors from the async client carry the status code in `status`, so a 401 response
+    shows the same API key message. Cancellation is never swallowed, so tasks can still be cancelled.
+
+    Args:
+        func (coroutine function): The coroutine function to be decorated.
+
+    Returns:
+        coroutine function: The wrapped coroutine function with error handling functionality.
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            raise
+        except ValueError as e:
+            print(f"Error!: {e}")
+            return None
+        except Exception as e:
+            # Handle HTTP errors, especially for missing or invalid API keys
+            status = getattr(e, "status", None)
+            if status == 401:
+                print("\nError!: No API key found or invalid API key. Check if API key is entered correctly")
+            elif status == 402:
+                print("\nError!: The daily API quota is used up. Try again tomorrow")
+            elif status == 429:
+                print("\nError!: Too many requests to the API. Wait a moment and try again")
+            elif status is not None:
+                print(f"HTTP Error: {e}")
+            else:
+                # Catch any other unexpected exceptions and print an error message
+                print(f"Error!: {e}")
+            return None
+
+    return wrapper
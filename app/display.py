@@ -1,5 +1,13 @@
+# ===== Importing Libraries ===========
+# Used to fetch recipe details in parallel
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+# Used to pass the deadline of the user action on to the worker threads
+import contextvars
+
 # ===== Importing methods from files ===========
 from .decorators import log_function_call, handle_errors
+from .config import DETAIL_FETCH_MODE, DETAIL_FETCH_WORKERS
+from .deadline import current_deadline
 
 
 # ===== Menu Display Handling ===========
@@ -69,9 +77,64 @@ class MenuDisplay:
 # Recipe class handles getting the list of ingredients and displaying it
 # Interacts with the RecipeFinder to get the recipes from the API
 class RecipeDisplay:
-    def __init__(self, get_recipe):
+    def __init__(self, get_recipe, fetch_mode=DETAIL_FETCH_MODE, max_workers=DETAIL_FETCH_WORKERS, planner=None):
         # Creates an instance of the recipe_finder class
         self.get_recipe = get_recipe
+        # Optional RequestPlanner that picks the cheapest requests for the details in bulk mode
+        self.planner = planner
+        # How recipe details are fetched: "bulk" (one request for all recipes) or "concurrent" (parallel requests)
+        self.fetch_mode = fetch_mode
+        # Maximum number of detail requests running at the same time in concurrent mode
+        self.max_workers = max_workers
+        # Details of the recipes expanded in lazy mode, remembered for the rest of the session
+        self.expanded_details = {}
+
+    # Generator that yields the details of each recipe, in the same order as the recipes
+    def iter_recipe_details(self, recipes):
+        # Recipes that already carry their full information (random recipes, inline searches) need no request
+        if all('extendedIngredients' in recipe for recipe in recipes):
+            yield from recipes
+            return
+
+        recipe_ids = [recipe['id'] for recipe in recipes]
+
+        if self.fetch_mode == "concurrent":
+            deadline = current_deadline()
+            skipped = False
+            # Start every detail request at once, with at most max_workers running at the same time
+            executor = ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(recipe_ids))))
+            try:
+                # Each request runs in a copy of the current context, so it keeps the deadline of the user action.
+                # The workers raise their errors instead of printing them, so only this loop reports them, and
+                # requests left running after the deadline do not print over the next screen
+                futures = [executor.submit(contextvars.copy_context().run, self.get_recipe.fetch_recipe_details,
+                                           recipe_id) for recipe_id in recipe_ids]
+                # Wait for the requests in order, so each recipe is yielded as soon as it and all before it are ready
+                for future in futures:
+                    try:
+                        # Stop waiting when the deadline passes, so the recipes are shown without their details
+                        yield future.result(timeout=deadline.remaining() if deadline is not None else None) or {}
+                    except FutureTimeoutError:
+                        future.cancel()
+                        if not skipped:
+                            skipped = True
+                            print("\nSome recipe details could not be loaded within the time limit.")
+                        yield {}
+                    except Exception as e:
+                        # A failed request only affects its own recipe
+                        print(f"Error!: {e}")
+                        yield {}
+            finally:
+                # Do not wait for requests still running past the deadline; they finish in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            # Get the details of every recipe with one bulk lookup instead of one request per recipe
+            if self.planner is not None:
+                recipe_details = self.planner.fetch_details(recipe_ids)
+            else:
+                recipe_details = self.get_recipe.find_recipe_details_bulk(recipe_ids) or {}
+            for recipe_id in recipe_ids:
+                yield recipe_details.get(recipe_id, {})
 
     # Method to display the list of recipes with ingredients and instructions
     # decorated with logging and error handling
@@ -84,58 +147,101 @@ class RecipeDisplay:
             print("No recipes found.")
             return
 
-        # Loop through each recipe in the list, printing their index before the name
+        # Loop through each recipe in the list with its details, printing their index before the name
         # Using index in displaying the recipes makes the option to save recipes by index user-friendly
-        for index, recipe in enumerate(recipes, start=1):
-            # Print the recipe title with styling for emphasis
-            print(f"\n\33[33m\33[40m\33[1mRECIPE {index}: {recipe['title']} \33[0m\n")  # Black background, yellow font.
+        for index, (recipe, recipe_info) in enumerate(zip(recipes, self.iter_recipe_details(recipes)), start=1):
+            self.print_recipe(index, recipe, recipe_info, by_ingredients)
 
-            if by_ingredients:
-                # Extract and print used ingredients
-                used_ingredients = [ingredient['name'] for ingredient in recipe.get('usedIngredients', [])]
-                # Extract and print missing ingredients
-                missed_ingredients = [ingredient['name'] for ingredient in recipe.get('missedIngredients', [])]
-
-                print(f"\33[1mUsed ingredients:\33[0m")
-                for ingredient in used_ingredients:
-                    # Prints each used ingredient with an inline point
-                    print(f" - {ingredient}")
-
-                print(f"\n\33[1mMissing ingredients:\33[0m")
-                for ingredient in missed_ingredients:
-                    # Prints each missing ingredient with an inline point
-                    print(f" - {ingredient}")
-
-            # Extract and display recipe instructions and ingredients
-            recipe_info = self.get_recipe.find_recipe_details(recipe['id'])
-            extended_ingredients = recipe_info.get('extendedIngredients', [])
-
-            if extended_ingredients:
-                # Print the list of all ingredients needed for the recipe
-                print(f"\n\33[1mIngredients:\33[0m")
-
-                for ingredient in extended_ingredients:
-                    # Display ingredients in their original form
-                    print(f" - {ingredient['original']}")
-            else:
-                # If no ingredients found, prints message
-                print("No ingredients available.")
+    # Method that prints one recipe with its ingredients and instructions
+    def print_recipe(self, index, recipe, recipe_info, by_ingredients=True):
+        # Print the recipe title with styling for emphasis
+        print(f"\n\33[33m\33[40m\33[1mRECIPE {index}: {recipe['title']} \33[0m\n")  # Black background, yellow font.
+
+        if by_ingredients:
+            # Extract and print used ingredients
+            used_ingredients = [ingredient['name'] for ingredient in recipe.get('usedIngredients', [])]
+            # Extract and print missing ingredients
+            missed_ingredients = [ingredient['name'] for ingredient in recipe.get('missedIngredients', [])]
+
+            print(f"\33[1mUsed ingredients:\33[0m")
+            for ingredient in used_ingredients:
+                # Prints each used ingredient with an inline point
+                print(f" - {ingredient}")
+
+            print(f"\n\33[1mMissing ingredients:\33[0m")
+            for ingredient in missed_ingredients:
+                # Prints each missing ingredient with an inline point
+                print(f" - {ingredient}")
+
+        # Extract and display recipe instructions and ingredients
+        extended_ingredients = recipe_info.get('extendedIngredients', [])
+
+        if extended_ingredients:
+            # Print the list of all ingredients needed for the recipe
+            print(f"\n\33[1mIngredients:\33[0m")
+
+            for ingredient in extended_ingredients:
+                # Display ingredients in their original form
+                print(f" - {ingredient['original']}")
+        else:
+            # If no ingredients found, prints message
+            print("No ingredients available.")
+
+        # Extract and display step-by-step cooking instructions
+        instructions = recipe_info.get('analyzedInstructions', [])
 
-            # Extract and display step-by-step cooking instructions
-            instructions = recipe_info.get('analyzedInstructions', [])
+        if instructions:
+            print("\n\33[4m\33[1mInstructions:\33[0m")
 
-            if instructions:
-                print("\n\33[4m\33[1mInstructions:\33[0m")
+            for step in instructions[0]['steps']:
+                # Print each step with its number
+                print(f"Step {step['number']}: {step['step']}")
+        else:
+            # If no instructions found, prints message
+            print("No instructions available.")
 
-                for step in instructions[0]['steps']:
-                    # Print each step with its number
-                    print(f"Step {step['number']}: {step['step']}")
+            # Print a separator line for readability
+            print('-' * 100)
+
+    # Method to display only the numbered list of recipe titles, using data already in the search response
+    # Details are fetched later, when the user expands a recipe, decorated with logging and error handling
+    @log_function_call
+    @handle_errors
+    def display_recipe_titles(self, recipes, by_ingredients=True):
+
+        # Checks if the recipes list is empty and prints a message if no recipes are found
+        if not recipes:
+            print("No recipes found.")
+            return
+
+        print("\n\33[33m\33[40m\33[1mRecipes found:\33[0m")
+        for index, recipe in enumerate(recipes, start=1):
+            if by_ingredients:
+                # Show how many of the user's ingredients are used and how many are missing
+                used = len(recipe.get('usedIngredients', []))
+                missed = len(recipe.get('missedIngredients', []))
+                print(f" [{index}] {recipe['title']} ({used} used, {missed} missing)")
             else:
-                # If no instructions found, prints message
-                print("No instructions available.")
+                print(f" [{index}] {recipe['title']}")
 
-                # Print a separator line for readability
-                print('-' * 100)
+    # Method that prints the full details of one recipe from the list, chosen by its index
+    # decorated with logging and error handling
+    @log_function_call
+    @handle_errors
+    def expand_recipe(self, recipes, index, by_ingredients=True):
+        recipe = recipes[index - 1]
+        # Fetch the details only the first time the recipe is expanded during this session
+        if recipe['id'] not in self.expanded_details:
+            if 'extendedIngredients' in recipe:
+                recipe_info = recipe
+            else:
+                recipe_info = self.get_recipe.find_recipe_details(recipe['id'])
+            # Do not remember failed lookups, so the user can try again
+            if not recipe_info:
+                print("Could not get the details for this recipe. Please try again.")
+                return
+            self.expanded_details[recipe['id']] = recipe_info
+        self.print_recipe(index, recipe, self.expanded_details[recipe['id']], by_ingredients)
 
     # Method that handles displaying the saved recipes, decorated with logging and error handling
     @log_function_call
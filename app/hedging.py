@@ -0,0 +1,115 @@
+# ===== Importing Libraries ===========
+# Used to keep a window of recent latencies per endpoint
+from collections import defaultdict, deque
+# Used to match endpoints such as "recipes/123/information" against the hedged patterns
+from fnmatch import fnmatchcase
+# Used to make the latency window and the counters safe to share between threads
+import threading
+
+# ===== Importing data from files ===========
+from .config import HEDGE_ENDPOINTS, HEDGE_PERCENTILE, HEDGE_DEFAULT_DELAY, HEDGE_MIN_DELAY, HEDGE_MAX_RATE
+
+
+# ===== Hedge Policy ===========
+
+# HedgePolicy decides when a slow request is sent a second time
+class HedgePolicy:
+    """
+    Policy for hedged requests: if an idempotent request has not finished after a delay, an
+    identical second request is sent and the first response to arrive is used.
+
+    The delay adapts to the endpoint: it is the observed latency percentile (the 95th by default)
+    over a window of recent requests, so only the slowest requests are hedged. Until enough
+    latencies have been observed a fixed default delay is used. The share of requests that may
+    be hedged is capped, so hedging never costs more than that share of extra quota.
+    """
+    def __init__(self, endpoints=HEDGE_ENDPOINTS, percentile=HEDGE_PERCENTILE, default_delay=HEDGE_DEFAULT_DELAY,
+                 min_delay=HEDGE_MIN_DELAY, max_rate=HEDGE_MAX_RATE, window=200, min_samples=20):
+        """
+        Args:
+            endpoints (iterable, optional): Endpoint patterns that may be hedged ('*' matches a recipe ID).
+            percentile (float, optional): Latency percentile used as the hedge delay.
+            default_delay (float, optional): Hedge delay in seconds until min_samples latencies are known.
+            min_delay (float, optional): Shortest hedge delay in seconds.
+            max_rate (float, optional): Largest share of requests (0 to 1) that may be hedged.
+            window (int, optional): Number of recent latencies kept per endpoint pattern.
+            min_samples (int, optional): Number of latencies needed before the delay adapts.
+        """
+        self.endpoints = tuple(endpoints)
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.lock = threading.Lock()
+        # Counters to monitor how often hedging was used and whether it helped
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def pattern_for(self, endpoint):
+        """
+        Returns the hedged pattern that matches the endpoint, or None if the endpoint is never hedged.
+        """
+        for pattern in self.endpoints:
+            if fnmatchcase(endpoint, pattern):
+                return pattern
+        return None
+
+    def delay_for(self, endpoint):
+        """
+        Returns how long to wait for a request before hedging it, and counts the request.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        pattern = self.pattern_for(endpoint)
+        with self.lock:
+            self.requests += 1
+            samples = self.latencies[pattern]
+            if len(samples) < self.min_samples:
+                return self.default_delay
+            ordered = sorted(samples)
+            index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+            return max(self.min_delay, ordered[index])
+
+    def allow_hedge(self):
+        """
+        Returns True, and counts the hedge, if one more hedge stays within the maximum hedge rate.
+        """
+        with self.lock:
+            if self.hedges + 1 > self.max_rate * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def record(self, endpoint, seconds):
+        """
+        Records the latency of a finished request.
+        """
+        pattern = self.pattern_for(endpoint)
+        with self.lock:
+            self.latencies[pattern].append(seconds)
+
+    def record_win(self):
+        """
+        Counts a hedge that answered before the first request.
+        """
+        with self.lock:
+            self.hedge_wins += 1
+
+    def stats(self):
+        """
+        Returns the counters.
+
+        Returns:
+            dict: Requests that could be hedged, hedges sent, hedges that won, and the hedge rate.
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            }
@@ -0,0 +1,194 @@
+# ===== Importing Libraries ===========
+# Used to work out when the daily quota resets (midnight UTC)
+from datetime import datetime, timedelta, timezone
+# Used to make the key pool safe to share between threads
+import threading
+# Used to record the wall-clock time of key state changes
+import time
+
+# ===== Importing data from files ===========
+from .config import API_KEY_STRATEGY
+
+
+# Raised when every key in the pool is disabled
+class NoApiKeyAvailableError(RuntimeError):
+    pass
+
+
+# Returns the time (in seconds since the epoch) of the next daily quota reset after `now`, at midnight UTC
+def next_quota_reset(now):
+    today = datetime.fromtimestamp(now, tz=timezone.utc).date()
+    return datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc).timestamp()
+
+
+# ApiKeyState holds the quota accounting of one API key
+class ApiKeyState:
+    def __init__(self, key):
+        self.key = key
+        # Points used today, from the X-API-Quota-Used header (or counted locally before the first response)
+        self.used = 0.0
+        self.left = None
+        self.requests = 0
+        self.disabled_until = None
+        self.disabled_reason = None
+
+
+# ===== API Key Pool ===========
+
+# ApiKeyPool spreads requests over several Spoonacular API keys
+class ApiKeyPool:
+    """
+    Pool of Spoonacular API keys, so the daily quota of every key can be used.
+
+    Each request is sent with a key chosen from the pool, either the key that has used the fewest
+    points today ("least_used") or the next key in turn ("round_robin"). The quota headers of each
+    response are recorded for the key that was used. A key that is rejected (401 invalid key or
+    402 quota used up) is left out until the daily quota resets at midnight UTC.
+    """
+    def __init__(self, keys, strategy=API_KEY_STRATEGY, clock=time.time):
+        """
+        Args:
+            keys (list): API keys in the pool.
+            strategy (str, optional): "least_used" or "round_robin".
+            clock (function, optional): Function returning the current wall-clock time in seconds.
+
+        Raises:
+            ValueError: If no keys are given or the strategy is unknown.
+        """
+        if not keys:
+            raise ValueError("The API key pool needs at least one key.")
+        if strategy not in ("least_used", "round_robin"):
+            raise ValueError(f"Unknown API key strategy: {strategy}")
+        # Keep each key once, in the order given
+        self.states = [ApiKeyState(key) for key in dict.fromkeys(keys)]
+        self.strategy = strategy
+        self.clock = clock
+        self.next_index = 0
+        self.lock = threading.Lock()
+
+    def next_reset(self):
+        """
+        Returns the time (in seconds since the epoch) of the next daily quota reset, at midnight UTC.
+        """
+        return next_quota_reset(self.clock())
+
+    def _enable_reset_keys(self, now):
+        # Put keys back in the pool once their quota has reset (caller holds the lock)
+        for state in self.states:
+            if state.disabled_until is not None and state.disabled_until <= now:
+                state.disabled_until = None
+                state.disabled_reason = None
+                state.used = 0.0
+                state.left = None
+
+    def select(self):
+        """
+        Chooses the key for the next request.
+
+        Returns:
+            str: An API key.
+
+        Raises:
+            NoApiKeyAvailableError: If every key is disabled.
+        """
+        with self.lock:
+            self._enable_reset_keys(self.clock())
+            available = [state for state in self.states if state.disabled_until is None]
+            if not available:
+                raise NoApiKeyAvailableError(
+                    "Every API key has been rejected or has used up its daily quota. Try again after midnight UTC.")
+            if self.strategy == "round_robin":
+                # Take the next enabled key after the one used last
+                for offset in range(len(self.states)):
+                    state = self.states[(self.next_index + offset) % len(self.states)]
+                    if state.disabled_until is None:
+                        self.next_index = (self.states.index(state) + 1) % len(self.states)
+                        break
+            else:
+                state = min(available, key=lambda candidate: (candidate.used, candidate.requests))
+            state.requests += 1
+            return state.key
+
+    def available(self):
+        """
+        Returns the number of keys that can be used right now.
+        """
+        with self.lock:
+            self._enable_reset_keys(self.clock())
+            return sum(state.disabled_until is None for state in self.states)
+
+    def update(self, key, headers):
+        """
+        Records the quota headers of a response sent with a key.
+        """
+        request_cost = self._read_header(headers, "X-API-Quota-Request")
+        used = self._read_header(headers, "X-API-Quota-Used")
+        left = self._read_header(headers, "X-API-Quota-Left")
+        with self.lock:
+            state = self._state(key)
+            if state is None:
+                return
+            if used is not None:
+                state.used = used
+            else:
+                # Count the points locally until the API reports them
+                state.used += request_cost if request_cost is not None else 1
+            if left is not None:
+                state.left = left
+                if left <= 0:
+                    self._disable(state, "quota used up")
+
+    def disable(self, key, status_code):
+        """
+        Leaves a key out of the pool until the daily quota resets, after the API rejected it.
+
+        Args:
+            key (str): The rejected key.
+            status_code (int): Status code of the response, 401 (invalid key) or 402 (quota used up).
+        """
+        with self.lock:
+            state = self._state(key)
+            if state is not None:
+                self._disable(state, "invalid key" if status_code == 401 else "quota used up")
+
+    def _disable(self, state, reason):
+        # Disable a key until the next quota reset (caller holds the lock)
+        state.disabled_until = self.next_reset()
+        state.disabled_reason = reason
+
+    def _state(self, key):
+        # Return the state of a key, or None if it is not in the pool
+        for state in self.states:
+            if state.key == key:
+                return state
+        return None
+
+    @staticmethod
+    def _read_header(headers, name):
+        # Return a numeric header value, or None if it is missing or not a number
+        try:
+            return float(headers.get(name))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def stats(self):
+        """
+        Returns the state of every key, with the keys masked so they can be shown to operators.
+
+        Returns:
+            list: One dict per key with the masked key, points used and left, requests sent, and whether
+                (and why) the key is disabled.
+        """
+        with self.lock:
+            self._enable_reset_keys(self.clock())
+            return [{
+                "key": f"...{state.key[-4:]}",
+                "used": state.used,
+                "left": state.left,
+                "requests": state.requests,
+                "enabled": state.disabled_until is None,
+                "disabled_reason": state.disabled_reason,
+            } for state in self.states]
+
+    def __len__(self):
+        return len(self.states)
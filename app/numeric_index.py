@@ -0,0 +1,171 @@
+# ===== Importing Libraries ===========
+# Used to keep each numeric field in one array, so filters and sorts run over whole columns at once
+import numpy as np
+# Used to make the index safe to share between threads
+import threading
+
+
+# ===== Numeric Index ===========
+
+# NumericIndex filters and sorts recipes by their numeric fields without contacting the API
+class NumericIndex:
+    """
+    Column store of the numeric fields of recipes (ready time, servings, health score, price per
+    serving and likes), for filtering and sorting recipes on this device.
+
+    Each field is kept in its own NumPy array, with one position per recipe and NaN where a recipe
+    has no value. A query combines range filters into one boolean mask, then sorts the remaining
+    recipes by one or more fields, selecting the best `number` recipes before sorting them.
+    """
+    # Numeric fields of the recipe information that are indexed
+    FIELDS = ("readyInMinutes", "servings", "healthScore", "pricePerServing", "aggregateLikes")
+    # Fields that are whole numbers in the API, returned as int instead of float
+    INTEGER_FIELDS = ("readyInMinutes", "servings", "aggregateLikes")
+
+    def __init__(self, corpus=None):
+        """
+        Args:
+            corpus (RecipeCorpus, optional): Corpus whose recipes are indexed. The index is updated
+                automatically when recipes have been added to it. Without a corpus, use load().
+        """
+        self.corpus = corpus
+        self.version = None
+        self.lock = threading.Lock()
+        self.load([])
+
+    def load(self, rows):
+        """
+        Builds the columns from one row per recipe.
+
+        Args:
+            rows (iterable): (recipe_id, readyInMinutes, servings, healthScore, pricePerServing, aggregateLikes)
+                tuples, with None for a missing value.
+        """
+        rows = list(rows)
+        self.recipe_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        values = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(self.FIELDS))
+        # Copy each field into its own contiguous array
+        self.columns = {field: np.ascontiguousarray(values[:, number]) for number, field in enumerate(self.FIELDS)}
+        # Position of each recipe in the columns
+        self.positions = {recipe_id: position for position, recipe_id in enumerate(self.recipe_ids.tolist())}
+
+    def add(self, rows, version=None):
+        """
+        Updates the columns in place: recipes already indexed get their new values, others are appended.
+
+        Args:
+            rows (list): Rows in the format of load(), e.g. from row_for().
+            version (int, optional): Corpus version after these recipes were added. The rows are only added
+                if the columns are up to date with the version before, otherwise the next refresh() rebuilds them.
+        """
+        with self.lock:
+            if version is not None:
+                if self.version != version - 1:
+                    return
+                self.version = version
+            new_rows = []
+            for row in rows:
+                position = self.positions.get(row[0])
+                if position is None:
+                    self.positions[row[0]] = len(self.recipe_ids) + len(new_rows)
+                    new_rows.append(row)
+                    continue
+                for field, value in zip(self.FIELDS, row[1:]):
+                    self.columns[field][position] = np.nan if value is None else value
+            if not new_rows:
+                return
+            values = np.array([row[1:] for row in new_rows], dtype=np.float64).reshape(len(new_rows), len(self.FIELDS))
+            self.recipe_ids = np.concatenate((self.recipe_ids, np.array([row[0] for row in new_rows], dtype=np.int64)))
+            self.columns = {field: np.concatenate((self.columns[field], values[:, number]))
+                            for number, field in enumerate(self.FIELDS)}
+
+    @classmethod
+    def row_for(cls, recipe):
+        """
+        Returns the index row of a recipe dictionary, with None for each field it does not have.
+        """
+        values = []
+        for field in cls.FIELDS:
+            value = recipe.get(field)
+            values.append(value if isinstance(value, (int, float)) and not isinstance(value, bool) else None)
+        return (recipe["id"], *values)
+
+    def refresh(self):
+        """
+        Rebuilds the columns from the corpus if recipes have been added since they were built
+        and could not be added to them in place.
+        """
+        if self.corpus is None:
+            return
+        with self.lock:
+            version = self.corpus.version
+            if version != self.version:
+                self.load(self.corpus.iter_numbers())
+                self.version = version
+
+    def query(self, ranges=None, sort=(), number=None, recipe_ids=None):
+        """
+        Filters and sorts the indexed recipes.
+
+        Args:
+            ranges (dict, optional): Field name to (minimum, maximum), both included. Use None for an open
+                end, e.g. {"readyInMinutes": (None, 20)}. Recipes without a value for a filtered field are left out.
+            sort (iterable, optional): (field, "asc" or "desc") pairs, the first being the main sort key.
+                Recipes without a value for a sort field come last.
+            number (int, optional): Maximum number of recipes to return. All matching recipes if None.
+            recipe_ids (iterable, optional): Only consider these recipes, e.g. the saved ones.
+
+        Returns:
+            list: One dict per recipe with its "id" and the value of every field (None if missing).
+
+        Raises:
+            ValueError: If a field or sort direction is unknown.
+        """
+        self.refresh()
+        for field in list(ranges or {}) + [field for field, _ in sort]:
+            if field not in self.columns:
+                raise ValueError(f"Unknown recipe field: {field}")
+
+        # Combine every filter into one mask; comparisons with NaN are False, so missing values are left out
+        mask = np.ones(len(self.recipe_ids), dtype=bool)
+        if recipe_ids is not None:
+            # Saved recipes whose ID is not known cannot be in the index
+            wanted = np.fromiter((recipe_id for recipe_id in recipe_ids if recipe_id is not None), dtype=np.int64)
+            mask &= np.isin(self.recipe_ids, wanted)
+        for field, (minimum, maximum) in (ranges or {}).items():
+            column = self.columns[field]
+            if minimum is not None:
+                mask &= column >= minimum
+            if maximum is not None:
+                mask &= column <= maximum
+        rows = np.flatnonzero(mask)
+
+        if sort:
+            # Sort keys in ascending order: descending fields are negated, and missing values go last
+            keys = []
+            for field, direction in sort:
+                if direction not in ("asc", "desc"):
+                    raise ValueError(f"Unknown sort direction: {direction}")
+                values = self.columns[field][rows]
+                values = -values if direction == "desc" else values
+                keys.append(np.where(np.isnan(values), np.inf, values))
+            if number is not None and len(rows) > number > 0:
+                # Keep only the recipes that can be in the top `number` by the main key (ties included)
+                threshold = np.partition(keys[0], number - 1)[number - 1]
+                keep = keys[0] <= threshold
+                rows, keys = rows[keep], [key[keep] for key in keys]
+            # lexsort takes the main key last
+            rows = rows[np.lexsort(keys[::-1])]
+        if number is not None:
+            rows = rows[:max(number, 0)]
+
+        # Build the results column by column, converting each selected column to Python values at once
+        results = [{"id": recipe_id} for recipe_id in self.recipe_ids[rows].tolist()]
+        for field in self.FIELDS:
+            convert = int if field in self.INTEGER_FIELDS else float
+            for result, value in zip(results, self.columns[field][rows].tolist()):
+                result[field] = None if value != value else convert(value)  # NaN is the only value not equal to itself
+        return results
+
+    def __len__(self):
+        return len(self.recipe_ids)
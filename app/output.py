@@ -1,41 +1,224 @@
 # ===== Importing Libraries ===========
 # Importing xlsxwriter for creating Excel files
 import xlsxwriter
+# Importing deque to keep the queue of recipes being fetched ahead of the writer
+from collections import deque
+# `islice` is used to read the saved recipes in chunks
+from itertools import islice
+# Importing ThreadPoolExecutor to fetch several recipes at the same time
+# and ProcessPoolExecutor to write export shards on several CPU cores
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+# Importing multiprocessing to start the shard workers without forking this process
+import multiprocessing
+# Importing csv and json for the CSV and JSON Lines export formats
+import csv
+import json
+# Importing hashlib to detect recipes whose content has changed since the last export
+import hashlib
+# Importing os to check whether the previous export file exists
+import os
+# Importing re to build safe shard file names from category names
+import re
+# Importing sqlite3 to store the export manifest next to the exported file
+import sqlite3
+# Importing time to record when each recipe was last downloaded
+import time
+# Importing uuid to tag the recipes written by each export
+import uuid
+# Used to create abstract base classes
+from abc import abstractmethod
 
 # ===== Importing methods from files ===========
 from .decorators import log_function_call, handle_errors
+from .app import RecipeDetails
+from .config import (EXPORT_WORKERS, EXPORT_PREFETCH, EXPORT_CONSTANT_MEMORY, EXPORT_INCREMENTAL,
+                     EXPORT_MANIFEST_MAX_AGE, EXPORT_SHARD_PROCESSES)
 
 
-class RecipeExporter:
-    def __init__(self, recipe_details, saved_recipes):
+# ExportManifest remembers what was exported last time, so the next export only downloads what is new
+class ExportManifest:
+    def __init__(self, path, max_age=EXPORT_MANIFEST_MAX_AGE, clock=time.time):
         """
-        Initialize the RecipeExporter with recipe details and saved recipes.
+        Open (or create) the manifest of an exported file.
+
+        The manifest is a small SQLite file that records, for every exported recipe, its recipe ID,
+        a hash of its content, the rows it occupies in the export and the text that was written.
+        Recipes are identified by their category and saved recipe ID, or by their title if they were
+        saved without an ID. Entries are read one at a time, so large collections do not need to fit in memory.
 
         Args:
-            recipe_details (object): An instance of a class responsible for retrieving recipe details.
-            saved_recipes (object): An instance of a class responsible for storing and retrieving saved recipes.
+            path (str): Path of the manifest file, usually the export filename plus '.manifest'.
+            max_age (int, optional): Seconds after which a recipe is downloaded again to check for changes.
+            clock (function, optional): Function returning the current time in seconds.
         """
-        self.recipe_details = recipe_details
-        self.saved_recipes = saved_recipes
+        self.path = path
+        self.max_age = max_age
+        self.clock = clock
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS recipes ("
+            "category TEXT NOT NULL, recipe_key TEXT NOT NULL, title TEXT NOT NULL, recipe_id INTEGER, "
+            "content_hash TEXT NOT NULL, position INTEGER NOT NULL, first_row INTEGER NOT NULL, "
+            "last_row INTEGER NOT NULL, ingredients TEXT, instructions TEXT, fetched_at REAL NOT NULL, "
+            "export_id TEXT, PRIMARY KEY (category, recipe_key))")
+        # Counters describing the current export
+        self.new = 0
+        self.changed = 0
+        self.unchanged = 0
+        self.reused = 0
+        # Every recipe written by this export is tagged with this ID, so removed recipes can be found afterwards
+        self.export_id = uuid.uuid4().hex
 
-    @log_function_call
-    @handle_errors
-    def export_to_excel(self, filename):
+    @staticmethod
+    def content_hash(ingredients, instructions):
         """
-        Export the saved recipes to an Excel file.
+        Return a hash of a recipe's exported content.
+        """
+        content = f"{ingredients or ''}\x00{instructions or ''}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def recipe_key(title, recipe_id=None):
+        """
+        Return the key of a saved recipe: its ID, or its title if it was saved without an ID.
+        """
+        return f"id:{recipe_id}" if recipe_id is not None else f"title:{title}"
+
+    def lookup(self, category, title, recipe_id=None):
+        """
+        Return the stored (ingredients, instructions) of a recipe if it was exported recently, otherwise None.
+        """
+        row = self.connection.execute(
+            "SELECT ingredients, instructions, fetched_at FROM recipes WHERE category = ? AND recipe_key = ?",
+            (category, self.recipe_key(title, recipe_id))).fetchone()
+        if row is None or self.clock() - row[2] > self.max_age:
+            return None
+        return row[0], row[1]
+
+    def is_up_to_date(self, saved_recipes):
+        """
+        Check whether the previous export already contains exactly these recipes, in this order.
 
         Args:
-            filename (str): The name of the file to which the recipes will be exported.
+            saved_recipes (iterable): (category, title, recipe_id) tuples in export order.
+        """
+        count = 0
+        for position, (category, title, recipe_id) in enumerate(saved_recipes):
+            row = self.connection.execute(
+                "SELECT position, fetched_at FROM recipes WHERE category = ? AND recipe_key = ?",
+                (category, self.recipe_key(title, recipe_id))).fetchone()
+            if row is None or row[0] != position or self.clock() - row[1] > self.max_age:
+                return False
+            count += 1
+        return count == self.connection.execute("SELECT COUNT(*) FROM recipes").fetchone()[0]
+
+    def record(self, position, category, title, status, ingredients, instructions, first_row, last_row,
+               recipe_id=None, found_id=None):
+        """
+        Record where a recipe was written in this export.
+
+        Args:
+            position (int): Index of the recipe in the export.
+            status (str): "fetched" if the content was just downloaded, "reused" if it came from the manifest,
+                or "failed" if it could not be retrieved (failed recipes are not recorded, so they are retried).
+            first_row (int): First row of the recipe in the export.
+            last_row (int): Last row of the recipe in the export.
+            recipe_id (int, optional): Spoonacular ID the recipe was saved with.
+            found_id (int, optional): ID found by a title search for a recipe saved without one. It is
+                recorded, but the recipe is still identified by its title.
+        """
+        key = (category, self.recipe_key(title, recipe_id))
+        if status == "failed":
+            self.connection.execute("DELETE FROM recipes WHERE category = ? AND recipe_key = ?", key)
+            return
+        if status == "reused":
+            # Only the position in the file may have changed
+            self.connection.execute(
+                "UPDATE recipes SET position = ?, first_row = ?, last_row = ?, export_id = ? "
+                "WHERE category = ? AND recipe_key = ?",
+                (position, first_row, last_row, self.export_id, *key))
+            self.reused += 1
+            return
+
+        # Compare the new content with the previous export to count new and changed recipes
+        content_hash = self.content_hash(ingredients, instructions)
+        previous = self.connection.execute(
+            "SELECT content_hash, recipe_id FROM recipes WHERE category = ? AND recipe_key = ?", key).fetchone()
+        if previous is None:
+            self.new += 1
+        elif previous[0] != content_hash:
+            self.changed += 1
+        else:
+            self.unchanged += 1
+        if recipe_id is None:
+            recipe_id = found_id if found_id is not None else previous[1] if previous is not None else None
+        self.connection.execute(
+            "INSERT OR REPLACE INTO recipes (category, recipe_key, title, recipe_id, content_hash, position, "
+            "first_row, last_row, ingredients, instructions, fetched_at, export_id) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*key, title, recipe_id, content_hash, position, first_row, last_row, ingredients, instructions,
+             self.clock(), self.export_id))
+
+    def finish(self):
+        """
+        Remove recipes that are no longer saved and save the manifest.
+        """
+        self.connection.execute("DELETE FROM recipes WHERE export_id IS NOT ?", (self.export_id,))
+        self.connection.commit()
+
+    def close(self):
+        """
+        Close the manifest file, discarding changes that were not saved with finish().
+        """
+        self.connection.close()
+
+
+# ===== Export Writers ===========
+
+# RecipeWriter is the interface shared by all export formats, making it easy to add or remove formats
+class RecipeWriter:
+    def __init__(self, filename):
+        """
+        Open the file the recipes will be written to.
 
-        This method creates an Excel workbook, writes recipe details including ingredients and instructions,
-        and saves the workbook to the specified filename.
+        Args:
+            filename (str): The name of the file to write.
+        """
+        self.filename = filename
+
+    @abstractmethod
+    # Abstract method that must be implemented by subclasses
+    def write_recipe(self, category, title, ingredients, instructions):
+        """
+        Write one recipe straight to the file.
+
+        Returns:
+            tuple: The first and last row (or line) of the file that hold the recipe.
         """
+        pass
+
+    @abstractmethod
+    # Abstract method that must be implemented by subclasses
+    def close(self):
+        pass
+
+
+# Writes recipes to a formatted Excel workbook
+class ExcelRecipeWriter(RecipeWriter):
+    def __init__(self, filename, constant_memory=EXPORT_CONSTANT_MEMORY):
+        """
+        Create an Excel workbook with a 'Recipes' worksheet.
+
+        In constant memory mode each row is flushed to disk as soon as the next row is started,
+        which works because the rows are always written in order.
+        """
+        super().__init__(filename)
         # Create a new Excel workbook and add a worksheet
-        workbook = xlsxwriter.Workbook(filename)
-        worksheet = workbook.add_worksheet('Recipes')
+        self.workbook = xlsxwriter.Workbook(filename, {'constant_memory': constant_memory})
+        self.worksheet = self.workbook.add_worksheet('Recipes')
 
         # Define cell formatting styles.
-        title_format = workbook.add_format({
+        self.title_format = self.workbook.add_format({
             'bold': True,  # Bold text
             'font_size': 18,  # Large font size for titles
             'align': 'center',  # Center alignment
@@ -44,7 +227,7 @@ class RecipeExporter:
             'font_color': '#67595e',  # Font color for the title
             'text_wrap': True})  # Wraps text in the cell if it's too long
 
-        header_format = workbook.add_format({
+        self.header_format = self.workbook.add_format({
             'bold': True,  # Bold text for headers
             'font_size': 14,  # Header font size
             'align': 'left',  # Align text to the left
@@ -52,7 +235,7 @@ class RecipeExporter:
             'bg_color': '#f6eee1',  # Header background color
             'font_color': '#67595e'})  # Header font color
 
-        text_format = workbook.add_format({
+        self.text_format = self.workbook.add_format({
             'font_size': 12,  # Regular font size for body text
             'align': 'left',  # Align text to the left
             'valign': 'vcenter',  # Vertical center alignment
@@ -60,71 +243,451 @@ class RecipeExporter:
             'font_color': '#67595e',  # Font color for body text
             'text_wrap': True})  # Wraps text in the cell if it's too long
 
-        blank_format = workbook.add_format({
+        self.blank_format = self.workbook.add_format({
             'bg_color': '#f6eee1'})  # Format for blank rows with background color
 
         # Set the width of column A to 55
-        worksheet.set_column(0, 0, 55)
-
-        # Retrieve the saved recipes from the saved_recipes object
-        saved_recipes = self.saved_recipes.get_saved_recipes()
+        self.worksheet.set_column(0, 0, 55)
 
         # Initialise row counter for Excel writing
-        row = 0
-
-        # Iterate over the saved recipes, by category name
-        for category, recipes in saved_recipes.items():
-            # Loop through each recipe in the category
-            for recipe in recipes:
-                # Get the ingredients and instructions for the current recipe
-                ingredients, instructions = self.recipe_details.find_instructions_ingredients(recipe)
-
-                # Write the recipe title in the current row with title formatting
-                worksheet.write(row, 0, recipe, title_format)
-
-                # Increment row
-                row += 1
-                # Add a blank row with formatting
-                worksheet.write(row, 0, '', blank_format)
-
-                # Move to the next row
-                row += 1
-                # Write 'Ingredients' header in the next row with header formatting
-                worksheet.write(row, 0, 'Ingredients', header_format)
-
-                # Move to the next row
-                row += 1
-                # If ingredients found, write the ingredients list in the following row with text formatting
-                if ingredients:
-                    worksheet.write(row, 0, ingredients, text_format)
-                # Placeholder if no ingredients found
+        self.row = 0
+
+    def write_recipe(self, category, title, ingredients, instructions):
+        worksheet = self.worksheet
+        # Remember the first row of this recipe
+        first_row = self.row
+
+        # Write the recipe title in the current row with title formatting
+        worksheet.write(self.row, 0, title, self.title_format)
+
+        # Increment row
+        self.row += 1
+        # Add a blank row with formatting
+        worksheet.write(self.row, 0, '', self.blank_format)
+
+        # Move to the next row
+        self.row += 1
+        # Write 'Ingredients' header in the next row with header formatting
+        worksheet.write(self.row, 0, 'Ingredients', self.header_format)
+
+        # Move to the next row
+        self.row += 1
+        # If ingredients found, write the ingredients list in the following row with text formatting
+        if ingredients:
+            worksheet.write(self.row, 0, ingredients, self.text_format)
+        # Placeholder if no ingredients found
+        else:
+            worksheet.write(self.row, 0, 'No Ingredients', self.text_format)
+
+        # Increment row
+        self.row += 1
+        # Add a blank row with formatting
+        worksheet.write(self.row, 0, '', self.blank_format)
+
+        # Move to the next row
+        self.row += 1
+        # Write 'Instructions' header in the next row with header formatting
+        worksheet.write(self.row, 0, 'Instructions', self.header_format)
+
+        # Move to the next row
+        self.row += 1
+        # If instructions found, write the instructions in the following row with text formatting
+        if instructions:
+            worksheet.write(self.row, 0, instructions, self.text_format)
+        # Placeholder if no instructions found
+        else:
+            worksheet.write(self.row, 0, 'No Instructions', self.text_format)
+
+        last_row = self.row
+        # Leave space before writing the next recipe
+        self.row += 2
+        return first_row, last_row
+
+    def close(self):
+        # Close the workbook, saving the file
+        self.workbook.close()
+
+
+# Writes one CSV row per recipe, for spreadsheets and data pipelines
+class CsvRecipeWriter(RecipeWriter):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.file = open(filename, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.file)
+        # Write the header row
+        self.writer.writerow(['category', 'title', 'ingredients', 'instructions'])
+        self.row = 1
+
+    def write_recipe(self, category, title, ingredients, instructions):
+        self.writer.writerow([category, title, ingredients or '', instructions or ''])
+        self.row += 1
+        return self.row - 1, self.row - 1
+
+    def close(self):
+        self.file.close()
+
+
+# Writes one JSON object per line, for data pipelines
+class JsonLinesRecipeWriter(RecipeWriter):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.line = 0
+
+    def write_recipe(self, category, title, ingredients, instructions):
+        record = {'category': category, 'title': title, 'ingredients': ingredients, 'instructions': instructions}
+        self.file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.line += 1
+        return self.line - 1, self.line - 1
+
+    def close(self):
+        self.file.close()
+
+
+# Writes a readable Markdown document with one section per recipe
+class MarkdownRecipeWriter(RecipeWriter):
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.file = open(filename, 'w', encoding='utf-8')
+        self.line = 0
+        self.write_lines(['# Saved Recipes', ''])
+
+    def write_lines(self, lines):
+        # Write lines of text and keep count of the line number
+        self.file.write('\n'.join(lines) + '\n')
+        self.line += len(lines)
+
+    def write_recipe(self, category, title, ingredients, instructions):
+        first_line = self.line
+        lines = [f'## {title}', '', f'*Category: {category}*', '', '### Ingredients', '']
+        lines.append(ingredients if ingredients else 'No Ingredients')
+        lines.extend(['', '### Instructions', ''])
+        # Each instruction step is on its own line, so list them as numbered steps
+        lines.extend(instructions.split('\n') if instructions else ['No Instructions'])
+        lines.append('')
+        self.write_lines(lines)
+        return first_line, self.line - 2
+
+    def close(self):
+        self.file.close()
+
+
+# WriterMapping maps file formats to the writer classes
+class WriterMapping:
+    def get_writer(file_format):
+        # Dictionary mapping file extensions to corresponding writer classes
+        writers = {
+            "xlsx": ExcelRecipeWriter,
+            "csv": CsvRecipeWriter,
+            "jsonl": JsonLinesRecipeWriter,
+            "md": MarkdownRecipeWriter,
+        }
+        # Return the corresponding writer class or None if the format is not supported
+        return writers.get(file_format.lower().lstrip('.'), None)
+
+
+# Function that writes one export shard. It runs in a separate process, so it must be defined at module level
+def write_shard(filename, file_format, recipes, constant_memory=EXPORT_CONSTANT_MEMORY):
+    """
+    Write a list of recipes to one shard file.
+
+    Args:
+        filename (str): The name of the shard file.
+        file_format (str): One of "xlsx", "csv", "jsonl" or "md".
+        recipes (list): (category, title, ingredients, instructions) tuples to write, in order.
+        constant_memory (bool, optional): Whether Excel shards are streamed to disk row by row.
+
+    Returns:
+        tuple: The file name and the number of recipes written.
+    """
+    writer_class = WriterMapping.get_writer(file_format)
+    if writer_class is ExcelRecipeWriter:
+        writer = ExcelRecipeWriter(filename, constant_memory=constant_memory)
+    else:
+        writer = writer_class(filename)
+    for category, title, ingredients, instructions in recipes:
+        writer.write_recipe(category, title, ingredients, instructions)
+    writer.close()
+    return filename, len(recipes)
+
+
+class RecipeExporter:
+    def __init__(self, recipe_details, saved_recipes, max_workers=EXPORT_WORKERS, prefetch=EXPORT_PREFETCH,
+                 constant_memory=EXPORT_CONSTANT_MEMORY, incremental=EXPORT_INCREMENTAL, planner=None):
+        """
+        Initialize the RecipeExporter with recipe details and saved recipes.
+
+        Args:
+            recipe_details (object): An instance of a class responsible for retrieving recipe details.
+            saved_recipes (object): An instance of a class responsible for storing and retrieving saved recipes.
+            max_workers (int, optional): Number of recipes fetched from the API at the same time.
+            prefetch (int, optional): Maximum number of recipes fetched ahead of the one being written.
+            constant_memory (bool, optional): If True, the workbook is streamed to disk row by row,
+                so memory use does not grow with the number of exported recipes.
+            incremental (bool, optional): If True, a manifest next to the exported file remembers what was
+                exported, and the next export only downloads recipes that are new or due for a refresh.
+            planner (RequestPlanner, optional): If given, the details of each chunk of saved recipes are
+                fetched with the cheapest plan (e.g. one informationBulk request) before they are exported,
+                instead of with one request per recipe.
+        """
+        self.recipe_details = recipe_details
+        self.saved_recipes = saved_recipes
+        self.max_workers = max_workers
+        self.prefetch = max(prefetch, max_workers)
+        self.constant_memory = constant_memory
+        self.incremental = incremental
+        self.planner = planner
+
+    def iter_recipe_contents(self, manifest=None):
+        """
+        Fetch the ingredients and instructions of every saved recipe, in saved order.
+
+        A bounded pool of workers fetches recipes ahead of time, while the caller (the single writer)
+        receives them in the original category and recipe order. A recipe that cannot be fetched is
+        yielded with None for its ingredients and instructions, so it becomes a placeholder row.
+        If a manifest is given, recipes exported recently are taken from it instead of the API, and
+        recipes saved with their full information are formatted from that snapshot without a request.
+
+        Args:
+            manifest (ExportManifest, optional): Manifest of the previous export.
+
+        Yields:
+            tuple: (category, title, recipe_id, ingredients, instructions, status) for each saved recipe,
+                where status is "fetched", "reused", "snapshot" or "failed".
+        """
+        # Read the saved recipes through a generator, so only the recipes being fetched are held in memory
+        total = self.saved_recipes.count_saved_recipes()
+        upcoming = self.iter_saved_recipes(manifest)
+        pending = deque()
+        done = 0
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Starts fetching the next saved recipe, if there is one left
+            def fetch_next():
+                next_item = next(upcoming, None)
+                if next_item is not None:
+                    category, recipe, recipe_id, stored, source = next_item
+                    # Reuse the content of the previous export or of the saved snapshot
+                    if stored is not None:
+                        pending.append((category, recipe, recipe_id, stored, source))
+                    else:
+                        # Saved recipe IDs are used directly, so no title search is needed
+                        pending.append((category, recipe, recipe_id, executor.submit(
+                            self.recipe_details.find_instructions_ingredients, recipe, recipe_id), "fetched"))
+
+            # Start fetching the first recipes, up to the prefetch limit
+            for _ in range(self.prefetch):
+                fetch_next()
+
+            while pending:
+                category, recipe, recipe_id, future, status = pending.popleft()
+                # Keep the queue full by starting the next recipe before waiting for this one
+                fetch_next()
+
+                if isinstance(future, tuple):
+                    # Content reused from the manifest or the snapshot
+                    result = future
                 else:
-                    worksheet.write(row, 0, 'No Ingredients', text_format)
-
-                # Increment row
-                row += 1
-                # Add a blank row with formatting
-                worksheet.write(row, 0, '', blank_format)
-
-                # Move to the next row
-                row += 1
-                # Write 'Instructions' header in the next row with header formatting
-                worksheet.write(row, 0, 'Instructions', header_format)
-
-                # Move to the next row
-                row += 1
-                # If instructions found, write the instructions in the following row with text formatting
-                if instructions:
-                    worksheet.write(row, 0, instructions, text_format)
-                # Placeholder if no instructions found
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error!: {e}")
+                        result = None
+
+                # A failed recipe becomes a placeholder instead of stopping the export
+                if result:
+                    ingredients, instructions = result
                 else:
-                    worksheet.write(row, 0, 'No Instructions', text_format)
+                    ingredients, instructions = None, None
+                    status = "failed"
+                    failed += 1
 
-                # Leave space before writing the next recipe
-                row += 2
+                done += 1
+                # Report progress on a single line
+                print(f"\rExporting recipes: {done}/{total}", end="" if done < total else "\n", flush=True)
+                yield category, recipe, recipe_id, ingredients, instructions, status
 
-        # Close the workbook, saving the file
-        workbook.close()
+        # Tell the user about recipes that could not be retrieved
+        if failed:
+            print(f"{failed} recipe(s) could not be retrieved and were exported without details.")
+
+    def iter_saved_recipes(self, manifest=None):
+        """
+        Read the saved recipes in chunks, with the content of the previous export, or of the snapshot
+        stored when the recipe was saved, where it can be reused.
+
+        With a planner, the details of the recipes in each chunk that cannot be reused are fetched
+        before the chunk is yielded, so the workers find them in the cache.
+
+        Yields:
+            tuple: (category, title, recipe_id, stored, source) for each saved recipe, where stored is the
+                (ingredients, instructions) to reuse or None, and source is "reused" (previous export),
+                "snapshot" or None.
+        """
+        saved = iter(self.saved_recipes.iter_saved_recipes())
+        chunk_size = self.planner.chunk_size if self.planner is not None else 1
+        while True:
+            chunk = [self._reusable_content(manifest, category, recipe, recipe_id)
+                     for category, recipe, recipe_id in islice(saved, chunk_size)]
+            if not chunk:
+                return
+            if self.planner is not None:
+                recipe_ids = [recipe_id for _, _, recipe_id, stored, _ in chunk if recipe_id and stored is None]
+                if recipe_ids:
+                    self.planner.fetch_details(recipe_ids)
+            yield from chunk
+
+    def _reusable_content(self, manifest, category, recipe, recipe_id):
+        # Return the saved recipe with the content that can be written without a request, if any
+        stored = manifest.lookup(category, recipe, recipe_id) if manifest is not None else None
+        if stored is not None:
+            return category, recipe, recipe_id, stored, "reused"
+        snapshot = self.saved_recipes.get_snapshot(recipe_id) if recipe_id is not None else None
+        if snapshot is not None:
+            return category, recipe, recipe_id, RecipeDetails.format_recipe(snapshot), "snapshot"
+        return category, recipe, recipe_id, None, None
+
+    @log_function_call
+    @handle_errors
+    def export(self, filename, file_format=None):
+        """
+        Export the saved recipes to a file.
+
+        Args:
+            filename (str): The name of the file to which the recipes will be exported.
+            file_format (str, optional): One of "xlsx", "csv", "jsonl" or "md". If not given,
+                the format is taken from the file extension.
+
+        The recipes are written one at a time as they are fetched, so every format uses bounded memory.
+
+        In incremental mode a manifest ('<filename>.manifest') records the recipe IDs, content hashes and
+        row ranges of the export. The next export downloads only new recipes (and recipes older than
+        EXPORT_MANIFEST_MAX_AGE), reuses the rest, and is skipped entirely if nothing has changed.
+        """
+        # Choose the writer from the format flag or the file extension
+        file_format = file_format or os.path.splitext(filename)[1]
+        writer_class = WriterMapping.get_writer(file_format)
+        if writer_class is None:
+            raise ValueError(f"Unsupported export format: '{file_format}'. Use xlsx, csv, jsonl or md.")
+
+        manifest = ExportManifest(f"{filename}.manifest") if self.incremental else None
+
+        # Nothing to do if the previous export already holds exactly the saved recipes
+        if manifest is not None and os.path.exists(filename) \
+                and manifest.is_up_to_date(self.saved_recipes.iter_saved_recipes()):
+            manifest.close()
+            print(f"\n{filename} is already up to date.")
+            return
+
+        if writer_class is ExcelRecipeWriter:
+            writer = ExcelRecipeWriter(filename, constant_memory=self.constant_memory)
+        else:
+            writer = writer_class(filename)
+
+        # Write each recipe as soon as it and all recipes before it have been fetched
+        for position, (category, recipe, recipe_id, ingredients, instructions, status) in \
+                enumerate(self.iter_recipe_contents(manifest)):
+            first_row, last_row = writer.write_recipe(category, recipe, ingredients, instructions)
+
+            # Record the recipe and its rows in the manifest
+            if manifest is not None:
+                # Look up the ID of recipes saved without one (the title search was just cached)
+                found_id = None
+                if recipe_id is None and status == "fetched":
+                    found_id = self.recipe_details.find_recipe_id(recipe)
+                manifest.record(position, category, recipe, status, ingredients, instructions, first_row, last_row,
+                                recipe_id, found_id)
+
+        # Close the writer, saving the file
+        writer.close()
+
+        # Save the manifest only after the file was written successfully
+        if manifest is not None:
+            manifest.finish()
+            manifest.close()
+            print(f"\nDownloaded {manifest.new} new and {manifest.changed + manifest.unchanged} refreshed recipe(s), "
+                  f"reused {manifest.reused} from the previous export ({manifest.changed} changed).")
+
+        # Print a confirmation message to the user
+        print(f"\nYour recipes have been exported to {filename}")
+
+    def export_to_excel(self, filename):
+        """
+        Export the saved recipes to an Excel file.
+
+        Args:
+            filename (str): The name of the file to which the recipes will be exported.
+        """
+        return self.export(filename, file_format="xlsx")
+
+    @log_function_call
+    @handle_errors
+    def export_sharded(self, filename, shard_by="category", file_format=None, max_processes=EXPORT_SHARD_PROCESSES):
+        """
+        Export the saved recipes to several files (shards) that are written in parallel processes.
+
+        Recipes are fetched in this process with the usual ordered pipeline and grouped into shards,
+        either one per category or of a fixed number of recipes. Each finished shard is written by a
+        worker of a ProcessPoolExecutor (started with "spawn", so the workers do not inherit the state
+        of the fetch threads), so cell formatting runs on several CPU cores. An index file
+        '<name>.index.json' lists the shards in order. The incremental manifest is not used here.
+
+        Args:
+            filename (str): Base name of the export, e.g. 'saved_recipes.xlsx' gives 'saved_recipes_001_dessert.xlsx'.
+            shard_by (str or int, optional): "category" for one shard per category, or the number of recipes per shard.
+            file_format (str, optional): One of "xlsx", "csv", "jsonl" or "md". Taken from the extension if not given.
+            max_processes (int, optional): Maximum number of worker processes (defaults to the number of CPU cores).
+        """
+        stem, extension = os.path.splitext(filename)
+        file_format = (file_format or extension).lower().lstrip('.')
+        if WriterMapping.get_writer(file_format) is None:
+            raise ValueError(f"Unsupported export format: '{file_format}'. Use xlsx, csv, jsonl or md.")
+        if shard_by != "category" and (not isinstance(shard_by, int) or shard_by < 1):
+            raise ValueError("shard_by must be 'category' or a positive number of recipes.")
+
+        shards = []
+        pending = deque()
+        max_processes = max_processes or os.cpu_count() or 1
+
+        # Workers are spawned rather than forked: the fetch threads may hold locks (HTTP connection pool,
+        # SQLite) while a worker starts, and a forked child would inherit them locked
+        with ProcessPoolExecutor(max_workers=max_processes,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            # Sends a finished shard to a worker process and records it for the index
+            def submit_shard(category, recipes):
+                number = len(shards) + 1
+                suffix = ""
+                if shard_by == "category":
+                    # Use the category in the file name, keeping only letters and numbers
+                    suffix = "_" + re.sub(r'[^A-Za-z0-9]+', '_', category).strip('_').lower()
+                shard_name = f"{stem}_{number:03d}{suffix}.{file_format}"
+                shards.append({"file": os.path.basename(shard_name), "recipes": len(recipes),
+                               "category": category if shard_by == "category" else None})
+                pending.append(executor.submit(write_shard, shard_name, file_format, recipes, self.constant_memory))
+                # Limit the number of shards held in memory while they wait for a worker
+                while len(pending) > max_processes * 2:
+                    pending.popleft().result()
+
+            current_category, current = None, []
+            for category, recipe, _, ingredients, instructions, _ in self.iter_recipe_contents():
+                # Start a new shard when the category changes or the shard is full
+                if current and (category != current_category if shard_by == "category" else len(current) >= shard_by):
+                    submit_shard(current_category, current)
+                    current = []
+                current_category = category
+                current.append((category, recipe, ingredients, instructions))
+            if current:
+                submit_shard(current_category, current)
+
+            # Wait for the remaining shards, so errors in a worker are reported
+            while pending:
+                pending.popleft().result()
+
+        # Write the index file listing every shard in order
+        index_name = f"{stem}.index.json"
+        with open(index_name, 'w', encoding='utf-8') as index_file:
+            json.dump({"format": file_format, "shard_by": shard_by, "shards": shards}, index_file, indent=2)
 
         # Print a confirmation message to the user
-        print(f"\nYour recipes have been exported to {filename}")
\ No newline at end of file
+        print(f"\nYour recipes have been exported to {len(shards)} file(s), listed in {index_name}")
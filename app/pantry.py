@@ -0,0 +1,187 @@
+# ===== Importing Libraries ===========
+# Used to score every recipe against the user's ingredients at once
+import numpy as np
+# Used to match an ingredient with its plural and with longer names ("tomato" in "cherry tomatoes")
+import re
+# Used to make the matcher safe to share between threads
+import threading
+
+# ===== Importing data from files ===========
+from .title_index import TitleIndex
+
+
+# ===== Pantry Matcher ===========
+
+# PantryMatcher ranks stored recipes by how many of the user's ingredients they use, without contacting the API
+class PantryMatcher:
+    """
+    Ranks recipes by the ingredients the user has, like the findByIngredients endpoint with
+    ranking=2 (fewest missing ingredients first), without an API request.
+
+    The ingredient lists of all recipes are kept as a sparse matrix in CSR form: `indices` holds
+    the ingredient number of every (recipe, ingredient) pair, row by row, and `indptr` marks where
+    the row of each recipe starts. A query marks the user's ingredients in a boolean vector, so the
+    used and missing counts of every recipe are computed at once with NumPy.
+    """
+    def __init__(self, corpus=None):
+        """
+        Args:
+            corpus (RecipeCorpus, optional): Corpus whose recipes are ranked. The matcher is updated
+                automatically when recipes have been added to it. Without a corpus, use load().
+        """
+        self.corpus = corpus
+        self.version = None
+        self.lock = threading.Lock()
+        self.load([])
+
+    def load(self, rows):
+        """
+        Builds the matrix from (recipe ID, ingredient name) rows, grouped by recipe.
+
+        Args:
+            rows (iterable): (recipe_id, name) pairs. All ingredients of a recipe must follow each other.
+        """
+        recipe_ids = []
+        indptr = [0]
+        indices = []
+        vocabulary = {}
+        # Number of each name as given, so each distinct name is only normalised once
+        numbers = {}
+        current = None
+        for recipe_id, name in rows:
+            if recipe_id != current:
+                if current is not None:
+                    indptr.append(len(indices))
+                recipe_ids.append(recipe_id)
+                current = recipe_id
+            number = numbers.get(name)
+            if number is None:
+                number = numbers[name] = vocabulary.setdefault(TitleIndex.normalize(name), len(vocabulary))
+            indices.append(number)
+        if current is not None:
+            indptr.append(len(indices))
+
+        self.recipe_ids = np.array(recipe_ids, dtype=np.int64)
+        self.indptr = np.array(indptr, dtype=np.int64)
+        self.indices = np.array(indices, dtype=np.int64)
+        self.vocabulary = vocabulary
+        self.names = list(vocabulary)
+        # Number of ingredients of each recipe
+        self.counts = np.diff(self.indptr)
+
+    def add(self, recipes, version=None):
+        """
+        Adds recipes to the matrix, replacing the rows of recipes it already holds, without rebuilding it.
+
+        Args:
+            recipes (list): (recipe_id, names) pairs, names being the ingredient names of the recipe.
+            version (int, optional): Corpus version after these recipes were added. The rows are only added
+                if the matrix is up to date with the version before, otherwise the next refresh() rebuilds it.
+        """
+        with self.lock:
+            if version is not None:
+                if self.version != version - 1:
+                    return
+                self.version = version
+            if not recipes:
+                return
+            new_ids = np.array([recipe_id for recipe_id, _ in recipes], dtype=np.int64)
+            # Leave out the current rows of the recipes being replaced
+            keep = ~np.isin(self.recipe_ids, new_ids)
+            recipe_ids = self.recipe_ids[keep]
+            indices = self.indices[np.repeat(keep, self.counts)]
+            counts = self.counts[keep]
+
+            new_indices = []
+            new_counts = []
+            for _, names in recipes:
+                for name in map(TitleIndex.normalize, names):
+                    number = self.vocabulary.setdefault(name, len(self.vocabulary))
+                    if number == len(self.names):
+                        self.names.append(name)
+                    new_indices.append(number)
+                new_counts.append(len(names))
+
+            self.recipe_ids = np.concatenate((recipe_ids, new_ids))
+            self.indices = np.concatenate((indices, np.array(new_indices, dtype=np.int64)))
+            self.counts = np.concatenate((counts, np.array(new_counts, dtype=np.int64)))
+            self.indptr = np.concatenate(([0], np.cumsum(self.counts)))
+
+    def refresh(self):
+        """
+        Rebuilds the matrix from the corpus if recipes have been added since it was built
+        and could not be added to it in place.
+        """
+        if self.corpus is None:
+            return
+        with self.lock:
+            version = self.corpus.version
+            if version != self.version:
+                self.load(self.corpus.iter_ingredients())
+                self.version = version
+
+    def _query(self, ingredients):
+        # Return a boolean vector marking every known ingredient name that matches one of the user's ingredients
+        query = np.zeros(len(self.names), dtype=bool)
+        for term in (TitleIndex.normalize(term) for term in str(ingredients).split(",")):
+            if not term:
+                continue
+            # Match whole words, also in the plural: "tomato" matches "tomatoes" and "cherry tomato"
+            pattern = re.compile(rf"\b{re.escape(term)}(e?s)?\b")
+            for index, name in enumerate(self.names):
+                if pattern.search(name):
+                    query[index] = True
+        return query
+
+    def score(self, ingredients):
+        """
+        Counts the used and missing ingredients of every recipe.
+
+        Args:
+            ingredients (str): Comma-separated list of the user's ingredients.
+
+        Returns:
+            tuple: (query, used, missed), where query marks the matching ingredient names and used and
+                missed hold the number of used and missing ingredients of each recipe.
+        """
+        self.refresh()
+        query = self._query(ingredients)
+        # Running total of matched ingredients, so each recipe's count is the difference at its row bounds
+        cumulative = np.concatenate(([0], np.cumsum(query[self.indices], dtype=np.int64)))
+        used = cumulative[self.indptr[1:]] - cumulative[self.indptr[:-1]]
+        return query, used, self.counts - used
+
+    def match(self, ingredients, number=10):
+        """
+        Returns the recipes that use at least one of the ingredients, fewest missing ingredients first
+        (then most used ingredients).
+
+        Args:
+            ingredients (str): Comma-separated list of the user's ingredients.
+            number (int, optional): Maximum number of recipes to return.
+
+        Returns:
+            list: One dict per recipe with its "id", the "usedIngredients" and "missedIngredients"
+                (as {"name": ...} dicts, like the API) and their counts.
+        """
+        query, used, missed = self.score(ingredients)
+        candidates = np.flatnonzero(used > 0)
+        if not len(candidates) or number <= 0:
+            return []
+        # One sort key: fewer missing ingredients first, then more used ingredients
+        key = missed[candidates] * (int(self.counts.max()) + 1) - used[candidates]
+        if len(candidates) > number:
+            # Only the best `number` recipes need to be sorted
+            best = np.argpartition(key, number - 1)[:number]
+            candidates, key = candidates[best], key[best]
+        top = candidates[np.argsort(key, kind="stable")]
+
+        results = []
+        for row in top:
+            ingredient_numbers = self.indices[self.indptr[row]:self.indptr[row + 1]]
+            used_names = [{"name": self.names[index]} for index in ingredient_numbers if query[index]]
+            missed_names = [{"name": self.names[index]} for index in ingredient_numbers if not query[index]]
+            results.append({"id": int(self.recipe_ids[row]), "usedIngredients": used_names,
+                            "missedIngredients": missed_names, "usedIngredientCount": len(used_names),
+                            "missedIngredientCount": len(missed_names)})
+        return results
@@ -0,0 +1,246 @@
+# ===== Importing Libraries ===========
+# Used to keep the reports of the most recent plans
+from collections import deque
+# Used to match endpoints such as "recipes/123/information" against the cost table
+from fnmatch import fnmatchcase
+# Used to split the missing recipes into chunks of about the same size
+import math
+
+# ===== Importing data from files ===========
+from .config import QUOTA_COSTS, BULK_CHUNK_SIZE
+
+
+# ===== Quota Cost Model ===========
+
+# QuotaCostModel works out how many quota points a request is expected to cost
+class QuotaCostModel:
+    """
+    Expected quota cost of Spoonacular requests.
+
+    Each endpoint costs a number of points per request, plus a number of points per recipe returned,
+    plus extra points per recipe for options such as addRecipeInformation. The numbers are taken
+    from QUOTA_COSTS in the config file.
+    """
+    def __init__(self, costs=None):
+        """
+        Args:
+            costs (dict, optional): Costs per endpoint pattern ('*' matches a recipe ID). Defaults to QUOTA_COSTS.
+        """
+        self.costs = QUOTA_COSTS if costs is None else costs
+
+    def cost(self, endpoint, results=1, options=()):
+        """
+        Returns the expected cost of a request.
+
+        Args:
+            endpoint (str): API endpoint, e.g. "recipes/informationBulk".
+            results (int, optional): Number of recipes the request returns.
+            options (iterable, optional): Options switched on for the request, e.g. ("addRecipeInformation",).
+
+        Returns:
+            float: Expected cost in quota points. Unknown endpoints are taken to cost 1 point.
+        """
+        for pattern, costs in self.costs.items():
+            if fnmatchcase(endpoint, pattern):
+                per_result = costs.get("result", 0) + sum(costs.get(option, 0) for option in options)
+                return costs.get("request", 0) + per_result * results
+        return 1.0
+
+
+# ===== Request Plans ===========
+
+# PlannedRequest is one request of a plan, with the recipe IDs it covers
+class PlannedRequest:
+    def __init__(self, endpoint, recipe_ids, expected_cost):
+        self.endpoint = endpoint
+        self.recipe_ids = recipe_ids
+        self.expected_cost = expected_cost
+
+    def __repr__(self):
+        return f"PlannedRequest({self.endpoint!r}, {len(self.recipe_ids)} recipe(s), {self.expected_cost:g} points)"
+
+
+# RequestPlan is the list of requests chosen for one user action
+class RequestPlan:
+    def __init__(self, action, requests, cached=0, inline_information=False):
+        # Short description of the user action, used in the report
+        self.action = action
+        self.requests = requests
+        # Number of recipes that are already cached and need no request
+        self.cached = cached
+        # Whether a search should embed the recipe information in its results
+        self.inline_information = inline_information
+
+    @property
+    def expected_cost(self):
+        return sum(request.expected_cost for request in self.requests)
+
+
+# ===== Request Planner ===========
+
+# RequestPlanner picks the cheapest requests for a user action and reports what they cost
+class RequestPlanner:
+    """
+    Plans the requests of a user action so it spends as few quota points as possible.
+
+    Recipes that are already cached are left out. For the others the planner compares the cost of
+    one recipes/{id}/information request per recipe with recipes/informationBulk requests in
+    chunks of about the same size (at most BULK_CHUNK_SIZE IDs), and for searches it compares
+    embedding the recipe information in the results with looking it up afterwards.
+
+    When a plan is carried out, the points it was expected to cost are compared with the points the
+    API reported in the X-API-Quota-Request headers, and the result is kept in `reports`.
+    """
+    def __init__(self, finder, cost_model=None, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Args:
+            finder (RecipeFinder): Finder used to send the requests.
+            cost_model (QuotaCostModel, optional): Cost model to use. A new one is created if not given.
+            chunk_size (int, optional): Maximum number of recipe IDs in one informationBulk request.
+        """
+        self.finder = finder
+        self.cost_model = QuotaCostModel() if cost_model is None else cost_model
+        self.chunk_size = chunk_size
+        # Reports of the most recent plans, the latest last, and the totals of every plan carried out
+        self.reports = deque(maxlen=20)
+        self.plans = 0
+        self.expected_points = 0.0
+        self.actual_points = 0.0
+
+    def plan_details(self, recipe_ids):
+        """
+        Plans the cheapest requests to get the information of several recipes.
+
+        Args:
+            recipe_ids (list): IDs of the recipes.
+
+        Returns:
+            RequestPlan: Requests for the recipes that are not cached yet.
+        """
+        unique_ids = list(dict.fromkeys(recipe_ids))
+        missing = [recipe_id for recipe_id in unique_ids
+                   if self.finder.api.get_cached(f"recipes/{recipe_id}/information") is None]
+        action = f"details of {len(unique_ids)} recipe(s)"
+        return RequestPlan(action, self._detail_requests(missing), cached=len(unique_ids) - len(missing))
+
+    def _detail_requests(self, recipe_ids):
+        # Return the cheapest requests for the information of recipes that are not cached
+        if not recipe_ids:
+            return []
+        # One request per recipe
+        single = [PlannedRequest(f"recipes/{recipe_id}/information", [recipe_id],
+                                 self.cost_model.cost(f"recipes/{recipe_id}/information"))
+                  for recipe_id in recipe_ids]
+        # Bulk requests, with the IDs spread evenly over the fewest chunks
+        chunks = math.ceil(len(recipe_ids) / self.chunk_size)
+        size, extra = divmod(len(recipe_ids), chunks)
+        bulk = []
+        start = 0
+        for index in range(chunks):
+            chunk = recipe_ids[start:start + size + (index < extra)]
+            start += len(chunk)
+            bulk.append(PlannedRequest("recipes/informationBulk", chunk,
+                                       self.cost_model.cost("recipes/informationBulk", len(chunk))))
+        # Prefer single lookups on a tie, as they share the cache entries of the detail screen
+        if sum(request.expected_cost for request in bulk) < sum(request.expected_cost for request in single):
+            return bulk
+        return single
+
+    def plan_category_search(self, number):
+        """
+        Plans a category search that shows `number` recipes with their details.
+
+        Compares embedding the recipe information in the search results with a plain search followed
+        by looking up the details of the results.
+
+        Returns:
+            RequestPlan: The search request, and the detail requests if the information is not embedded.
+        """
+        action = f"category search for {number} recipe(s)"
+        options = ("addRecipeInformation", "fillIngredients")
+        inline = [PlannedRequest("recipes/complexSearch", [],
+                                 self.cost_model.cost("recipes/complexSearch", number, options))]
+        # The IDs of the results are not known before the search, so plan for positions and assume none is cached
+        separate = [PlannedRequest("recipes/complexSearch", [], self.cost_model.cost("recipes/complexSearch", number))]
+        separate += [PlannedRequest(request.endpoint, [], request.expected_cost)
+                     for request in self._detail_requests(list(range(number)))]
+
+        inline_plan = RequestPlan(action, inline, inline_information=True)
+        separate_plan = RequestPlan(action, separate)
+        return inline_plan if inline_plan.expected_cost <= separate_plan.expected_cost else separate_plan
+
+    def measure(self, plan):
+        """
+        Returns a context manager that records the points spent while the plan is carried out.
+
+        The points are counted from the X-API-Quota-Request header of every response received in the
+        meantime, so requests made by other threads at the same time are counted too.
+        """
+        return _PlanMeasurement(self, plan)
+
+    def fetch_details(self, recipe_ids):
+        """
+        Gets the information of several recipes with the cheapest plan.
+
+        Args:
+            recipe_ids (list): IDs of the recipes.
+
+        Returns:
+            dict: Mapping of recipe ID to recipe information. IDs that could not be found are left out.
+        """
+        # Take the recipes that are cached now, as the cache may drop them at any time
+        details = {}
+        for recipe_id in dict.fromkeys(recipe_ids):
+            cached = self.finder.api.get_cached(f"recipes/{recipe_id}/information")
+            if cached is not None:
+                details[recipe_id] = cached
+
+        plan = self.plan_details(recipe_ids)
+        with self.measure(plan):
+            for request in plan.requests:
+                if request.endpoint == "recipes/informationBulk":
+                    details.update(self.finder.find_recipe_details_bulk(request.recipe_ids) or {})
+                else:
+                    recipe = self.finder.find_recipe_details(request.recipe_ids[0])
+                    if recipe:
+                        details[request.recipe_ids[0]] = recipe
+        return details
+
+    def last_report(self):
+        """
+        Returns the report of the most recent plan, or None if no plan has been carried out.
+
+        Returns:
+            dict: The action, the number of requests and cached recipes, and the expected and actual points.
+        """
+        return self.reports[-1] if self.reports else None
+
+    def totals(self):
+        """
+        Returns the number of plans carried out and the points they were expected to cost and did cost.
+        """
+        return {"plans": self.plans, "expected_points": self.expected_points, "actual_points": self.actual_points}
+
+
+# _PlanMeasurement records the points spent by the client while a plan is carried out
+class _PlanMeasurement:
+    def __init__(self, planner, plan):
+        self.planner = planner
+        self.plan = plan
+
+    def __enter__(self):
+        self.started_at = self.planner.finder.api.points_spent
+        return self.plan
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        actual_points = self.planner.finder.api.points_spent - self.started_at
+        self.planner.reports.append({
+            "action": self.plan.action,
+            "requests": len(self.plan.requests),
+            "cached": self.plan.cached,
+            "expected_points": self.plan.expected_cost,
+            "actual_points": actual_points,
+        })
+        self.planner.plans += 1
+        self.planner.expected_points += self.plan.expected_cost
+        self.planner.actual_points += actual_points
@@ -0,0 +1,187 @@
+# ===== Importing Libraries ===========
+# Used to keep track of time for refilling the bucket and to wait between requests
+import time
+# Used to make the limiter safe to share between threads
+import threading
+
+# ===== Importing data from files ===========
+from .config import QUOTA_POINTS_PER_MINUTE, QUOTA_BURST
+from .key_pool import next_quota_reset
+
+
+# Raised when the API reports that the daily quota is used up, so no request is sent
+class QuotaExceededError(RuntimeError):
+    pass
+
+
+# ===== Quota Limiter ===========
+
+# QuotaLimiter spaces out API requests so they fit the Spoonacular quota
+class QuotaLimiter:
+    """
+    Client-side token bucket that spaces out requests to fit a points-per-minute budget.
+
+    The bucket holds up to `burst` points and refills at `points_per_minute / 60` points per second.
+    Each request takes its cost from the bucket before it is sent. When the bucket is empty the
+    request waits until enough points have been refilled, so a busy client sends requests at a
+    steady rate instead of a burst followed by 402/429 errors.
+
+    Spoonacular reports the cost of each request and the daily quota in the X-API-Quota-Request,
+    X-API-Quota-Used and X-API-Quota-Left headers. The limiter reads them after every response,
+    corrects the bucket when a request cost more than expected, and refuses to send requests once
+    the API reports that no quota is left, until the daily quota resets at midnight UTC.
+    """
+    def __init__(self, points_per_minute=QUOTA_POINTS_PER_MINUTE, burst=QUOTA_BURST, clock=time.monotonic,
+                 sleep=time.sleep, track_daily_quota=True, wall_clock=time.time):
+        """
+        Args:
+            points_per_minute (float, optional): Number of quota points that may be spent per minute.
+            burst (float, optional): Maximum number of points that can be spent at once after an idle period.
+            clock (function, optional): Function returning the current time in seconds.
+            sleep (function, optional): Function used to wait for the bucket to refill.
+            track_daily_quota (bool, optional): Whether to stop requests when the API reports that the daily
+                quota is used up. Turn this off when requests are spread over several keys (ApiKeyPool tracks
+                the quota of each key instead).
+            wall_clock (function, optional): Function returning the current wall-clock time in seconds,
+                used to forget the reported daily quota once it has reset.
+        """
+        self.rate = points_per_minute / 60
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.track_daily_quota = track_daily_quota
+        self.wall_clock = wall_clock
+        self.tokens = burst
+        self.updated_at = clock()
+        self.lock = threading.Lock()
+        # Daily quota as last reported by the API (None until the first response)
+        self.quota_used = None
+        self.quota_left = None
+        # Wall-clock time at which the reported daily quota resets
+        self.quota_reset_at = None
+        self.last_request_cost = None
+        # Total time spent waiting for the bucket to refill
+        self.waited = 0.0
+
+    def _refill(self, now):
+        # Add the points earned since the last update, up to the burst size (caller holds the lock)
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _expire_daily_quota(self):
+        # Forget the reported daily quota once it has reset (caller holds the lock)
+        if self.quota_reset_at is not None and self.wall_clock() >= self.quota_reset_at:
+            self.quota_used = None
+            self.quota_left = None
+            self.quota_reset_at = None
+
+    def reserve(self, cost=1):
+        """
+        Takes the cost of a request from the bucket and returns how long to wait before sending it.
+
+        The points are taken straight away, even if the bucket goes below zero, so concurrent callers
+        queue up behind each other at the refill rate.
+
+        Args:
+            cost (float, optional): Expected quota cost of the request.
+
+        Returns:
+            float: Number of seconds to wait before sending the request.
+
+        Raises:
+            QuotaExceededError: If the API reported that the daily quota is used up and it has not reset yet.
+        """
+        with self.lock:
+            self._expire_daily_quota()
+            if self.quota_left is not None and self.quota_left <= 0:
+                raise QuotaExceededError(
+                    f"Daily API quota used up ({self.quota_used:g} points used). Try again tomorrow.")
+            self._refill(self.clock())
+            self.tokens -= cost
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += delay
+            return delay
+
+    def acquire(self, cost=1, max_wait=None):
+        """
+        Waits until the bucket holds enough points for a request, then takes them.
+
+        Args:
+            cost (float, optional): Expected quota cost of the request.
+            max_wait (float, optional): Longest wait in seconds, e.g. the time left before a deadline. If the
+                request would have to wait that long, its points are given back and it does not wait at all.
+
+        Returns:
+            bool: True if the points were taken, False if the wait would have been too long.
+        """
+        delay = self.reserve(cost)
+        if max_wait is not None and delay > 0 and delay >= max_wait:
+            self.cancel(cost, delay)
+            return False
+        if delay > 0:
+            self.sleep(delay)
+        return True
+
+    def cancel(self, cost=1, delay=0.0):
+        """
+        Gives back the points of a request that was reserved but will not be sent.
+
+        Args:
+            cost (float, optional): Cost that was taken from the bucket.
+            delay (float, optional): Wait that reserve() returned for the request.
+        """
+        with self.lock:
+            self.tokens += cost
+            self.waited -= delay
+
+    def update(self, headers, expected_cost=1):
+        """
+        Reads the quota headers of a response.
+
+        Args:
+            headers (Mapping): Response headers.
+            expected_cost (float, optional): Cost that was taken from the bucket for this request.
+        """
+        request_cost = self._read_header(headers, "X-API-Quota-Request")
+        used = self._read_header(headers, "X-API-Quota-Used")
+        left = self._read_header(headers, "X-API-Quota-Left")
+        with self.lock:
+            if request_cost is not None:
+                self.last_request_cost = request_cost
+                # Take the difference if the request cost more (or less) than expected
+                self._refill(self.clock())
+                self.tokens -= request_cost - expected_cost
+            if not self.track_daily_quota:
+                return
+            if used is not None:
+                self.quota_used = used
+            if left is not None:
+                self.quota_left = left
+            if used is not None or left is not None:
+                self.quota_reset_at = next_quota_reset(self.wall_clock())
+
+    @staticmethod
+    def _read_header(headers, name):
+        # Return a numeric header value, or None if it is missing or not a number
+        try:
+            return float(headers.get(name))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def remaining(self):
+        """
+        Returns the budget that is left.
+
+        Returns:
+            dict: Points available in the bucket right now, the daily quota used and left as reported by
+                the API (None before the first response), and the cost of the last request.
+        """
+        with self.lock:
+            self._refill(self.clock())
+            self._expire_daily_quota()
+            return {
+                "available_now": max(self.tokens, 0),
+                "quota_used": self.quota_used,
+                "quota_left": self.quota_left,
+                "last_request_cost": self.last_request_cost,
+            }
@@ -1,34 +1,176 @@
 # ===== Importing Libraries ===========
 # Importing deque for queue operations and defaultdict for dictionaries with default values
 from collections import deque, defaultdict
+# Importing zip_longest to pair the saved recipe names with their IDs
+from itertools import zip_longest
+# Importing json to store a snapshot of each saved recipe
+import json
+# Importing sqlite3 to keep saved recipes between runs of the application
+import sqlite3
+# Importing threading so the store can be shared between threads
+import threading
+# Importing time to record when a recipe was saved
+import time
 
 # ===== Importing methods from files ===========
 from .decorators import log_function_call, handle_errors
 
 
+class RecipeStore:
+    def __init__(self, path):
+        """
+        Initialize a persistent store of saved recipes in a SQLite file.
+
+        The file is opened on first use. It uses write-ahead logging, so the application can read it
+        while another process writes. Each recipe is stored with its Spoonacular ID, title, category
+        and a JSON snapshot of its full information, when that was available at save time. A recipe can
+        only be saved once per category: recipes are told apart by their ID, or by their title if they
+        were saved without one.
+
+        Args:
+            path (str): Path of the SQLite file.
+        """
+        self.path = path
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        # Open the SQLite file and create the table and indexes on first use (caller holds the lock)
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS saved_recipes ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, recipe_id INTEGER, title TEXT NOT NULL, "
+                "category TEXT NOT NULL, snapshot TEXT, saved_at REAL NOT NULL)")
+            # The same recipe ID can only be saved once per category
+            self.connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS saved_recipes_category_recipe_id "
+                "ON saved_recipes (category, recipe_id) WHERE recipe_id IS NOT NULL")
+            # Recipes saved without an ID are told apart by their title
+            self.connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS saved_recipes_category_title "
+                "ON saved_recipes (category, title) WHERE recipe_id IS NULL")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS saved_recipes_recipe_id ON saved_recipes (recipe_id)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS saved_recipes_category ON saved_recipes (category, id)")
+            self.connection.commit()
+        return self.connection
+
+    def add(self, category, title, recipe_id=None, snapshot=None):
+        """
+        Save a recipe. Saving a recipe that is already in the category does nothing.
+
+        Returns:
+            bool: True if the recipe was added, False if it was already saved.
+        """
+        with self.lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO saved_recipes (recipe_id, title, category, snapshot, saved_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (recipe_id, title, category, json.dumps(snapshot) if snapshot is not None else None, time.time()))
+            connection.commit()
+            return cursor.rowcount == 1
+
+    def iter_recipes(self):
+        """
+        Iterate over the saved recipes, grouped by category in the order the categories were first used.
+
+        Yields:
+            tuple: (category, title, recipe_id) for each saved recipe.
+        """
+        with self.lock:
+            cursor = self._connect().execute(
+                "SELECT s.category, s.title, s.recipe_id FROM saved_recipes s "
+                "JOIN (SELECT category, MIN(id) AS first_id FROM saved_recipes GROUP BY category) c "
+                "ON s.category = c.category ORDER BY c.first_id, s.id")
+            rows = cursor.fetchmany(500)
+        # Read the rows in batches, so large collections are not loaded into memory at once
+        while rows:
+            yield from rows
+            with self.lock:
+                rows = cursor.fetchmany(500)
+
+    def get_snapshot(self, recipe_id):
+        """
+        Return the stored snapshot of the full information of a saved recipe, or None if there is none.
+        """
+        with self.lock:
+            row = self._connect().execute(
+                "SELECT snapshot FROM saved_recipes WHERE recipe_id = ? AND snapshot IS NOT NULL LIMIT 1",
+                (recipe_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self):
+        """
+        Return the number of saved recipes.
+        """
+        with self.lock:
+            return self._connect().execute("SELECT COUNT(*) FROM saved_recipes").fetchone()[0]
+
+    def close(self):
+        """
+        Close the SQLite file. It is reopened automatically on the next use.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
 class SaveRecipe:
-    def __init__(self):
+    def __init__(self, store=None):
         """
         Initialize the SaveRecipe instance with an empty dictionary.
         The dictionary's keys are categories, and the values are deques
         of recipe names under each category.
+
+        Args:
+            store (RecipeStore, optional): Persistent store of saved recipes. If given, recipes saved in
+                earlier runs are loaded the first time they are needed, and new recipes are written to it.
         """
         self.saved_recipes = defaultdict(deque)
+        # Spoonacular IDs of the saved recipes, in the same order as their names (None if not known)
+        self.recipe_ids = defaultdict(deque)
+        # (category, recipe ID) of every saved recipe, or (category, recipe name) if it has no ID,
+        # used to check in constant time whether a recipe is already saved
+        self.saved_keys = set()
+        # Full information of the saved recipes by recipe ID, when no persistent store is used
+        self.snapshots = {}
+        self.store = store
+        self.loaded = store is None
+
+    def _load(self):
+        # Load the recipes saved in earlier runs the first time they are needed
+        if not self.loaded:
+            self.loaded = True
+            for category, title, recipe_id in self.store.iter_recipes():
+                self.saved_recipes[category].append(title)
+                self.recipe_ids[category].append(recipe_id)
+                self.saved_keys.add((category, recipe_id if recipe_id is not None else title))
 
     @log_function_call
     @handle_errors
-    def save_recipes(self, recipe_names, category):
+    def save_recipes(self, recipes, category):
         """
         Save selected recipes to a specified category.
 
         Args:
-            recipe_names (list): A list of recipe names.
+            recipes (list): A list of recipes, either as recipe dictionaries from the API or as recipe names.
             category (str): The category under which the recipes will be saved.
 
         This method displays the list of recipes with index numbers,
         prompts the user to select recipes by entering their indices,
         and then saves the selected recipes under the specified category.
+        Recipes that are already saved in the category (the same ID, or the same name for recipes
+        without an ID) are skipped. Recipes that carry their full information keep it as a snapshot,
+        which the export uses instead of requesting the details again.
         """
+        self._load()
+        recipe_names = [recipe['title'] if isinstance(recipe, dict) else recipe for recipe in recipes]
+
         # Display recipe names with indices
         for index, title in enumerate(recipe_names, start=1):
             print(f"[{index}] {title}")
@@ -43,8 +185,28 @@ class SaveRecipe:
         # Validate and save selected recipes
         for recipe in selected_recipes:
             if 1 <= recipe <= len(recipe_names):
+                title = recipe_names[recipe - 1]
+                recipe_data = recipes[recipe - 1] if isinstance(recipes[recipe - 1], dict) else None
+                recipe_id = recipe_data.get('id') if recipe_data else None
+
+                # Skip recipes that are already saved in this category
+                key = (category, recipe_id if recipe_id is not None else title)
+                if key in self.saved_keys:
+                    print(f"'{title}' is already saved.")
+                    continue
+
+                # Only the full recipe information is worth keeping, not a plain search result
+                snapshot = recipe_data if recipe_data and 'extendedIngredients' in recipe_data else None
+
                 # Append selected recipe to the appropriate category
-                self.saved_recipes[category].append(recipe_names[recipe - 1])
+                self.saved_recipes[category].append(title)
+                self.recipe_ids[category].append(recipe_id)
+                self.saved_keys.add(key)
+                # Keep the recipe, its ID and its snapshot in the persistent store
+                if self.store is not None:
+                    self.store.add(category, title, recipe_id, snapshot)
+                elif snapshot is not None:
+                    self.snapshots[recipe_id] = snapshot
 
         print("\nRecipes saved successfully!")
 
@@ -58,4 +220,44 @@ class SaveRecipe:
             dict: A dictionary where keys are recipe categories and values
                   are lists of saved recipe names under each category.
         """
+        self._load()
         return dict(self.saved_recipes)
+
+    def iter_saved_recipes(self):
+        """
+        Iterate over the saved recipes one at a time, without copying the whole collection.
+
+        With a persistent store the recipes are read from it in batches.
+
+        Yields:
+            tuple: (category, recipe name, recipe ID) for each saved recipe, grouped by category in saved order.
+                The recipe ID is None if it is not known.
+        """
+        if self.store is not None:
+            yield from self.store.iter_recipes()
+            return
+        for category, recipe_names in self.saved_recipes.items():
+            for recipe_name, recipe_id in zip_longest(recipe_names, self.recipe_ids.get(category, ())):
+                yield category, recipe_name, recipe_id
+
+    def get_snapshot(self, recipe_id):
+        """
+        Return the full information of a saved recipe as it was when it was saved.
+
+        Returns:
+            dict: The recipe information, or None if the recipe was saved without it.
+        """
+        if self.store is not None:
+            return self.store.get_snapshot(recipe_id)
+        return self.snapshots.get(recipe_id)
+
+    def count_saved_recipes(self):
+        """
+        Count the saved recipes across all categories.
+
+        Returns:
+            int: The number of saved recipes.
+        """
+        if self.store is not None:
+            return self.store.count()
+        return sum(len(recipe_names) for recipe_names in self.saved_recipes.values())
@@ -0,0 +1,215 @@
+# ===== Importing Libraries ===========
+# Used to add random jitter to the backoff delays
+import random
+# Used to keep track of time for the circuit breaker and to wait between attempts
+import time
+# Used to make the retry counters and the circuit breaker safe to share between threads
+import threading
+# Used to read Retry-After headers that contain a date
+from email.utils import parsedate_to_datetime
+
+# ===== Importing data from files ===========
+from .config import (RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY, RETRY_STATUSES,
+                     BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+
+
+# Raised instead of sending a request while the circuit breaker is open
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+# ===== Retry Policy ===========
+
+# RetryPolicy decides whether and when a failed request is sent again
+class RetryPolicy:
+    """
+    Retries transient failures (connection errors, timeouts, 429 and 5xx responses) with
+    exponential backoff and full jitter.
+
+    The delay before attempt n + 1 is a random time between 0 and base_delay * 2 ** (n - 1),
+    capped at max_delay. If the API sends a Retry-After header, that delay is used instead, so the
+    client waits exactly as long as the API asks. If the API asks for more than max_delay, the
+    request is not retried.
+    """
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY,
+                 retry_statuses=RETRY_STATUSES, sleep=time.sleep, jitter=random.random):
+        """
+        Args:
+            max_attempts (int, optional): Maximum number of attempts per request, including the first one.
+            base_delay (float, optional): Backoff delay in seconds after the first failed attempt.
+            max_delay (float, optional): Longest delay in seconds between two attempts.
+            retry_statuses (iterable, optional): HTTP status codes that are retried.
+            sleep (function, optional): Function used to wait between attempts.
+            jitter (function, optional): Function returning a random number between 0 and 1.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.sleep = sleep
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        # Counters to monitor how often requests are retried
+        self.retries = 0
+        self.gave_up = 0
+
+    def is_retryable_status(self, status_code):
+        """
+        Returns True if a response with this status code should be retried.
+        """
+        return status_code in self.retry_statuses
+
+    def delay_for(self, attempt, retry_after=None):
+        """
+        Returns how long to wait before the next attempt, or None if no attempts are left.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, starting at 1.
+            retry_after (float, optional): Delay in seconds requested by the API.
+
+        Returns:
+            float: Seconds to wait, or None if the request should not be retried (no attempts left, or
+                the API asks to wait longer than max_delay).
+        """
+        with self.lock:
+            if attempt >= self.max_attempts or (retry_after is not None and retry_after > self.max_delay):
+                self.gave_up += 1
+                return None
+            self.retries += 1
+        if retry_after is not None:
+            return max(retry_after, 0.0)
+        return self.jitter() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+    @staticmethod
+    def parse_retry_after(headers):
+        """
+        Reads the Retry-After header, given either in seconds or as an HTTP date.
+
+        Returns:
+            float: Delay in seconds, or None if the header is missing or invalid.
+        """
+        try:
+            value = headers.get("Retry-After")
+        except AttributeError:
+            return None
+        if not isinstance(value, str):
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+    def stats(self):
+        """
+        Returns the retry counters.
+
+        Returns:
+            dict: Number of retries and of requests that failed after the last attempt.
+        """
+        with self.lock:
+            return {"retries": self.retries, "gave_up": self.gave_up}
+
+
+# ===== Circuit Breaker ===========
+
+# CircuitBreaker stops sending requests for a while after repeated failures
+class CircuitBreaker:
+    """
+    Fails fast while the API is down, instead of letting every user action wait for it.
+
+    The breaker starts closed and lets every request through. After `failure_threshold` failures
+    in a row (connection errors, timeouts or 5xx responses) it opens, and requests fail straight
+    away with CircuitOpenError. After `reset_timeout` seconds it lets one trial request through
+    (half-open): if that succeeds the breaker closes again, otherwise it opens for another period.
+    If the trial ends without reaching the API (e.g. the deadline passed first), it is released
+    and the next request becomes the trial.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        """
+        Args:
+            failure_threshold (int, optional): Number of failures in a row that opens the breaker.
+            reset_timeout (float, optional): Seconds the breaker stays open before a trial request is allowed.
+            clock (function, optional): Function returning the current time in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+        # Counters to monitor how often the breaker opened and how many requests it stopped
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_request(self):
+        """
+        Checks whether a request may be sent.
+
+        Returns:
+            bool: True if the request is the trial request of the half-open breaker. Its outcome must be
+                recorded, or the trial released with release_trial().
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or a trial request is already in progress.
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return False
+            wait = self.opened_at + self.reset_timeout - self.clock()
+            if self.state == self.OPEN and wait <= 0:
+                # Let one trial request through to see if the API is back
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+        raise CircuitOpenError(
+            f"The Spoonacular API is not responding. Try again in {max(wait, 0):.0f} seconds.")
+
+    def release_trial(self):
+        """
+        Gives up the trial request without an outcome, so the next request can be the trial.
+        """
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+
+    def record_success(self):
+        """
+        Closes the breaker after a successful request.
+        """
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """
+        Counts a failed request and opens the breaker after too many failures in a row,
+        or straight away if the trial request failed.
+        """
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def stats(self):
+        """
+        Returns the state and counters of the breaker.
+
+        Returns:
+            dict: Current state, failures in a row, times opened and requests rejected.
+        """
+        with self.lock:
+            return {"state": self.state, "failures": self.failures, "times_opened": self.times_opened,
+                    "rejected": self.rejected}
@@ -0,0 +1,125 @@
+# ===== Importing Libraries ===========
+# Used to wait for the result of a request that another task is already making
+import asyncio
+# Used to make concurrent callers wait for the same request
+import threading
+
+
+# ===== Single-flight Request Coalescing ===========
+
+# _Flight holds the result of one in-flight call for every caller waiting on it
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# SingleFlight makes concurrent identical calls share one execution
+class SingleFlight:
+    """
+    Coalesces identical calls made at the same time from several threads.
+
+    The first caller for a key (the leader) runs the call. Callers that ask for the same key
+    while it is running wait for the leader and get the same result, or the same exception.
+    Once the call has finished the key is forgotten, so later calls run again (they are normally
+    answered by the response cache by then).
+    """
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+        # Counters to monitor how many calls were saved
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) unless a call with the same key is already running, in which case
+        its result is returned instead.
+
+        Args:
+            key (str): Key of the call, such as a canonical request URL.
+            func (function): Function to run.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            Exception: The exception raised by the call, raised in every waiting caller.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                flight.result = func(*args, **kwargs)
+            except BaseException as error:
+                flight.error = error
+            finally:
+                with self.lock:
+                    del self.flights[key]
+                flight.done.set()
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def stats(self):
+        """
+        Returns the counters.
+
+        Returns:
+            dict: Calls that were run, calls that waited for another caller, and calls running now.
+        """
+        with self.lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self.flights)}
+
+
+# AsyncSingleFlight makes concurrent identical coroutine calls share one execution
+class AsyncSingleFlight:
+    """
+    Asyncio counterpart of SingleFlight: tasks that ask for the same key while a call is running
+    await that call instead of starting their own.
+    """
+    def __init__(self):
+        self.flights = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, func, *args, **kwargs):
+        """
+        Awaits func(*args, **kwargs) unless a call with the same key is already running, in which case
+        its result is returned instead.
+        """
+        flight = self.flights.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            # Shield the shared call, so cancelling one waiting task does not cancel it for the others
+            return await asyncio.shield(flight)
+
+        self.calls += 1
+        flight = self.flights[key] = asyncio.ensure_future(func(*args, **kwargs))
+        # Mark the exception as retrieved, in case every waiting task was cancelled
+        flight.add_done_callback(lambda future: future.cancelled() or future.exception())
+        try:
+            return await asyncio.shield(flight)
+        finally:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+
+    def stats(self):
+        """
+        Returns the counters.
+
+        Returns:
+            dict: Calls that were run, calls that waited for another caller, and calls running now.
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self.flights)}
@@ -0,0 +1,150 @@
+# ===== Importing Libraries ===========
+# Used to find the closest known title when there is no exact match
+import difflib
+# Used to keep the index between runs of the application
+import sqlite3
+# Used to make the index safe to share between threads
+import threading
+# Used to record when a title was last seen
+import time
+# Used to remove accents when normalising titles
+import unicodedata
+# Used to replace punctuation when normalising titles
+import re
+
+# ===== Importing data from files ===========
+from .config import TITLE_INDEX_FUZZY_CUTOFF
+
+
+# ===== Title Index ===========
+
+# TitleIndex maps recipe titles to Spoonacular recipe IDs without contacting the API
+class TitleIndex:
+    """
+    Index of recipe titles to recipe IDs, filled from the recipes returned by earlier searches.
+
+    Titles are normalised (case, accents, punctuation and spacing are ignored), so "Crème Brûlée!"
+    and "creme brulee" resolve to the same recipe. The index is kept in memory and, if a path is
+    given, in a SQLite file so it survives restarts. The file is read once, on first use.
+    """
+    def __init__(self, path=None, fuzzy_cutoff=TITLE_INDEX_FUZZY_CUTOFF, clock=time.time):
+        """
+        Args:
+            path (str, optional): Path of the SQLite file. If None, the index is kept in memory only.
+            fuzzy_cutoff (float, optional): Minimum similarity (0 to 1) for a close title to match when there
+                is no exact match. None disables fuzzy matching.
+            clock (function, optional): Function returning the current wall-clock time in seconds.
+        """
+        self.path = path
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.clock = clock
+        self.ids = {}
+        self.connection = None
+        self.loaded = path is None
+        self.lock = threading.Lock()
+        # Counters to monitor how many title searches the index saved
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(title):
+        """
+        Normalises a title for lookups: lower case, without accents, punctuation or repeated spaces.
+
+        Returns:
+            str: Normalised title, such as "creme brulee" for "Crème Brûlée!".
+        """
+        text = unicodedata.normalize("NFKD", str(title))
+        text = "".join(character for character in text if not unicodedata.combining(character))
+        return " ".join(re.sub(r"[\W_]+", " ", text.casefold()).split())
+
+    def _connect(self):
+        # Open the SQLite file, create the table and load every title into memory on first use
+        # (caller holds the lock)
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS titles ("
+                "title TEXT PRIMARY KEY, recipe_id INTEGER NOT NULL, updated_at REAL NOT NULL)")
+            self.connection.commit()
+        if not self.loaded:
+            self.loaded = True
+            for title, recipe_id in self.connection.execute("SELECT title, recipe_id FROM titles"):
+                # Titles added in this session take precedence over the stored ones
+                self.ids.setdefault(title, recipe_id)
+        return self.connection
+
+    def add_recipes(self, recipes):
+        """
+        Adds the title and ID of each recipe. A title that is already known is pointed at the newest ID.
+
+        Args:
+            recipes (list): Recipe dictionaries from any search, random or detail response.
+        """
+        entries = {}
+        for recipe in recipes or []:
+            if isinstance(recipe, dict) and recipe.get("id") and recipe.get("title"):
+                title = self.normalize(recipe["title"])
+                if title:
+                    entries[title] = recipe["id"]
+        if not entries:
+            return
+        with self.lock:
+            # Only write the titles that are new or point at another recipe
+            changed = [(title, recipe_id) for title, recipe_id in entries.items() if self.ids.get(title) != recipe_id]
+            self.ids.update(entries)
+            if self.path is not None and changed:
+                connection = self._connect()
+                now = self.clock()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO titles (title, recipe_id, updated_at) VALUES (?, ?, ?)",
+                    [(title, recipe_id, now) for title, recipe_id in changed])
+                connection.commit()
+
+    def lookup(self, title):
+        """
+        Returns the ID of a recipe title, without contacting the API.
+
+        The normalised title is looked up first. If it is not known and fuzzy matching is enabled,
+        the closest known title above the similarity cutoff is used.
+
+        Returns:
+            int: The recipe ID, or None if the title is not in the index.
+        """
+        key = self.normalize(title)
+        with self.lock:
+            if self.path is not None:
+                self._connect()
+            recipe_id = self.ids.get(key)
+            if recipe_id is None and self.fuzzy_cutoff is not None and key:
+                matches = difflib.get_close_matches(key, self.ids.keys(), n=1, cutoff=self.fuzzy_cutoff)
+                if matches:
+                    recipe_id = self.ids[matches[0]]
+            if recipe_id is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return recipe_id
+
+    def stats(self):
+        """
+        Returns the index counters.
+
+        Returns:
+            dict: Hits, misses and number of known titles.
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "titles": len(self.ids)}
+
+    def close(self):
+        """
+        Closes the SQLite file. It is reopened automatically on the next use.
+        """
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def __len__(self):
+        return len(self.ids)
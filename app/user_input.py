@@ -85,4 +85,30 @@ class UserInput:
                 print("Input cannot be empty. Please try again.")
                 continue
 
-            return choice
\ No newline at end of file
+            return choice
+
+    @log_function_call
+    @handle_errors
+    def get_recipe_to_expand(self, recipe_count):
+        """
+        Prompt the user for the number of a recipe to view in full, or nothing to continue.
+
+        Args:
+            recipe_count (int): Number of recipes in the list.
+
+        Returns:
+            int: The chosen recipe number, or None if the user pressed Enter.
+
+        Notes:
+            If the input is not a valid recipe number, the user will be prompted again.
+        """
+        while True:
+            choice = input("\nEnter a recipe number to see its details, or press Enter to continue: ").strip()
+
+            if not choice:
+                return None
+
+            if choice.isdigit() and 1 <= int(choice) <= recipe_count:
+                return int(choice)
+
+            print(f"Invalid choice. Please enter a number between 1 and {recipe_count}.")
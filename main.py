@@ -1,10 +1,26 @@
+# ===== Importing Libraries ===========
+# Used when user actions have no time limit
+from contextlib import nullcontext
+
 # ===== Importing methods and classes from files ===========
 # Import necessary classes and functions from various modules for the application
 from app.user_input import UserInput
 from app.display import MenuDisplay, RecipeDisplay
-from app.recipe_saver import SaveRecipe
+from app.recipe_saver import SaveRecipe, RecipeStore
 from app.app import RecipeFinder, SpoonacularAPI, RecipeDetails
-from app.config import api_key
+from app.cache import DiskCache
+from app.title_index import TitleIndex
+from app.corpus import RecipeCorpus
+from app.quota import QuotaLimiter
+from app.resilience import RetryPolicy, CircuitBreaker
+from app.deadline import Deadline
+from app.hedging import HedgePolicy
+from app.key_pool import ApiKeyPool
+from app.planner import RequestPlanner
+from app.config import (api_key, API_KEYS, DISK_CACHE_PATH, INLINE_RECIPE_INFORMATION, LAZY_DISPLAY, EXPORT_FILENAME,
+                        EXPORT_SHARD_BY, SAVED_RECIPES_PATH, TITLE_INDEX_PATH,
+                        QUOTA_LIMIT_ENABLED, QUOTA_POINTS_PER_MINUTE, ACTION_DEADLINE, HEDGE_ENABLED,
+                        RECIPES_PER_SEARCH, CORPUS_PATH, OFFLINE_MODE)
 from app.decorators import log_function_call, handle_errors
 from app.output import RecipeExporter
 
@@ -28,22 +44,70 @@ class App:
         self.menu = MenuDisplay()
 
         # Create an instance of SpoonacularAPI with the provided base URL and API key
-        api = SpoonacularAPI("https://api.spoonacular.com", api_key)
+        # The API object owns the pooled HTTP connections shared by RecipeFinder and RecipeDetails
+        # Responses are also cached on disk (if enabled) so restarts do not spend API quota again
+        # Requests are spaced out to fit the quota, transient failures are retried,
+        # and requests fail fast while the API is down
+        # With several API keys, requests are spread over the keys and the limiter allows the quota of all of them
+        # Every full recipe is kept in a local corpus, which answers searches while the API is unavailable
+        disk_cache = DiskCache(DISK_CACHE_PATH) if DISK_CACHE_PATH else None
+        key_pool = ApiKeyPool(API_KEYS) if len(API_KEYS) > 1 else None
+        limiter = None
+        if QUOTA_LIMIT_ENABLED:
+            limiter = QuotaLimiter(QUOTA_POINTS_PER_MINUTE * len(key_pool), track_daily_quota=False) \
+                if key_pool is not None else QuotaLimiter()
+        self.api = SpoonacularAPI("https://api.spoonacular.com", api_key, disk_cache=disk_cache,
+                                  title_index=TitleIndex(TITLE_INDEX_PATH), limiter=limiter,
+                                  retry_policy=RetryPolicy(), breaker=CircuitBreaker(),
+                                  hedge_policy=HedgePolicy() if HEDGE_ENABLED else None, key_pool=key_pool,
+                                  corpus=RecipeCorpus(CORPUS_PATH) if CORPUS_PATH else None, offline=OFFLINE_MODE)
 
         # Instantiate RecipeFinder to handle recipe search functionality
-        self.get_recipe = RecipeFinder(api)
+        self.get_recipe = RecipeFinder(self.api, inline_information=INLINE_RECIPE_INFORMATION)
+
+        # Instantiate RequestPlanner to pick the cheapest requests (in quota points) for each user action
+        self.planner = RequestPlanner(self.get_recipe)
 
         # Instantiate RecipeDisplay to manage the display of found recipes
-        self.show_recipe = RecipeDisplay(self.get_recipe)
+        self.show_recipe = RecipeDisplay(self.get_recipe, planner=self.planner)
 
         # Instantiate SaveRecipe to manage the saving of selected recipes
-        self.saved_recipes = SaveRecipe()
+        # Saved recipes are kept in a SQLite file (if enabled), which is only read when first needed
+        self.saved_recipes = SaveRecipe(RecipeStore(SAVED_RECIPES_PATH) if SAVED_RECIPES_PATH else None)
 
         # Instantiate RecipeDetails to manage detailed recipe information retrieval
-        self.recipe_details = RecipeDetails(api, self.get_recipe)
+        self.recipe_details = RecipeDetails(self.api, self.get_recipe, inline_information=INLINE_RECIPE_INFORMATION)
 
         # Instantiate RecipeExporter to handle exporting of saved recipes to an Excel file
-        self.recipe_exporter = RecipeExporter(self.recipe_details, self.saved_recipes)
+        self.recipe_exporter = RecipeExporter(self.recipe_details, self.saved_recipes, planner=self.planner)
+
+    # Starts the time budget of a user action, so a slow API cannot keep the user waiting
+    def start_deadline(self):
+        """Returns a new deadline for one user action, or a context that does nothing if there is no limit."""
+        return Deadline(ACTION_DEADLINE) if ACTION_DEADLINE else nullcontext()
+
+    # Shows a list of recipes, either in full or (in lazy mode) as titles that the user can expand one by one
+    @log_function_call
+    @handle_errors
+    def show_recipes(self, recipes, by_ingredients, deadline=None):
+        """Displays found recipes using the display mode set in the config file."""
+        if not LAZY_DISPLAY:
+            # Load the details within what is left of the search's time budget
+            with deadline or self.start_deadline():
+                self.show_recipe.display_recipes(recipes, by_ingredients=by_ingredients)
+            return
+
+        # Print the titles straight away, without any extra request
+        self.show_recipe.display_recipe_titles(recipes, by_ingredients=by_ingredients)
+
+        # Let the user expand recipes until they press Enter
+        while recipes:
+            index = self.user.get_recipe_to_expand(len(recipes))
+            if index is None:
+                break
+            # Each expanded recipe gets its own time budget, as the user may have waited before choosing it
+            with self.start_deadline():
+                self.show_recipe.expand_recipe(recipes, index, by_ingredients=by_ingredients)
 
     # The run method is the core loop of the application.
     # It presents the user with options, processes their choices, and interacts with the various components of the app.
@@ -63,7 +127,10 @@ class App:
             if choice == '1':
                 # Get a list of ingredients from the user and find matching recipes
                 ingredients = self.user.get_user_ingredients()
-                recipes = self.get_recipe.find_recipes_by_ingredients(ingredients)
+                # The search and the display of its results share one time budget
+                deadline = self.start_deadline()
+                with deadline:
+                    recipes = self.get_recipe.find_recipes_by_ingredients(ingredients)
 
                 # If no recipes are found, return to the main menu
                 if recipes is None:
@@ -71,17 +138,18 @@ class App:
                     continue
 
                 # Display found recipes and ask if the user wants to save them
-                self.show_recipe.display_recipes(recipes, by_ingredients=True)
-                ingredients_titles = [recipe['title'] for recipe in recipes]
+                self.show_recipes(recipes, by_ingredients=True, deadline=deadline)
 
                 if self.user.get_save_recipe_choice():
-                    # Save the selected recipes under the 'Ingredients' category
-                    self.saved_recipes.save_recipes(ingredients_titles, 'Ingredients')
+                    # Save the selected recipes (with their IDs) under the 'Ingredients' category
+                    self.saved_recipes.save_recipes(recipes, 'Ingredients')
 
             # Option 2: Find random recipes
             elif choice == '2':
                 # Finds random recipes using the API
-                recipes = self.get_recipe.find_random_recipes()
+                deadline = self.start_deadline()
+                with deadline:
+                    recipes = self.get_recipe.find_random_recipes()
 
                 # If no recipes are found, return to the main menu
                 if recipes is None:
@@ -89,12 +157,11 @@ class App:
                     continue
 
                 # Display the random recipes and ask if the user wants to save them
-                self.show_recipe.display_recipes(recipes, by_ingredients=False)
-                random_titles = [recipe['title'] for recipe in recipes]
+                self.show_recipes(recipes, by_ingredients=False, deadline=deadline)
 
                 if self.user.get_save_recipe_choice():
                     # Save the random recipes under the 'Random' category
-                    self.saved_recipes.save_recipes(random_titles, 'Random')
+                    self.saved_recipes.save_recipes(recipes, 'Random')
 
             # Option 3: Find recipes by category
             elif choice == '3':
@@ -106,7 +173,12 @@ class App:
                     # If a valid category is selected, fetch recipes from that category
                     if category_choice in self.menu.category_mapping:
                         category = self.menu.category_mapping[category_choice]
-                        recipes = self.get_recipe.find_recipes_by_category(category)
+                        # Let the planner decide whether the results should embed the recipe information
+                        plan = self.planner.plan_category_search(RECIPES_PER_SEARCH)
+                        deadline = self.start_deadline()
+                        with deadline, self.planner.measure(plan):
+                            recipes = self.get_recipe.find_recipes_by_category(
+                                category, inline_information=plan.inline_information)
 
                         # If no recipes are found, return to the main menu
                         if recipes is None:
@@ -114,14 +186,12 @@ class App:
                             break
 
                         # Display the recipes found for the selected category and ask if the user wants to save them
-                        self.show_recipe.display_recipes(recipes, by_ingredients=False)
-                        # Gets the recipe name from the list of category recipes
-                        category_titles = [recipe['title'] for recipe in recipes]
+                        self.show_recipes(recipes, by_ingredients=False, deadline=deadline)
 
                         # Asks the user if they want to save the recipes
                         if self.user.get_save_recipe_choice():
-                            # Save the category recipe name under the category name
-                            self.saved_recipes.save_recipes(category_titles, category)
+                            # Save the category recipes under the category name
+                            self.saved_recipes.save_recipes(recipes, category)
 
                     # Option to go back to the main menu
                     elif category_choice == '9':
@@ -136,15 +206,27 @@ class App:
                 # Display recipes that the user has previously saved
                 self.show_recipe.display_saved_recipes(self.saved_recipes.get_saved_recipes())
 
-            # Option 5: Exports saved recipes to an Excel file
+            # Option 5: Exports saved recipes to a file
             elif choice == '5':
-                # Export the saved recipes to 'saved_recipes.xlsx'
-                self.recipe_exporter.export_to_excel('saved_recipes.xlsx')
+                # Export the saved recipes to the file set in the config ('saved_recipes.xlsx' by default)
+                if EXPORT_SHARD_BY:
+                    # Very large collections can be split into several files written in parallel
+                    self.recipe_exporter.export_sharded(EXPORT_FILENAME, shard_by=EXPORT_SHARD_BY)
+                else:
+                    self.recipe_exporter.export(EXPORT_FILENAME)
 
             # Option 6: Exit the program
             elif choice == '6':
-                # Thanks the user and exit the program
+                # Thanks the user, closes the pooled API connections and exits the program
                 print("Thank you for using our recipe app, goodbye!")
+                # Report how the planned requests compared with their expected cost
+                totals = self.planner.totals()
+                if totals["plans"]:
+                    print(f"Quota points: {totals['expected_points']:g} expected, "
+                          f"{totals['actual_points']:g} spent ({self.api.points_spent:g} in total this session)")
+                self.api.close()
+                if self.saved_recipes.store is not None:
+                    self.saved_recipes.store.close()
                 exit()
 
             # Handles invalid menu choices
@@ -1,8 +1,15 @@
 # ===== Importing necessary modules and classes ===========
 import unittest
 from unittest.mock import patch, Mock
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
 import requests
 from app import SpoonacularAPI, RecipeFinder
+from app.app import RecipeDetails
+from app.quota import QuotaLimiter
+from app.deadline import Deadline
 
 
 # Test class for the SpoonacularAPI class
@@ -17,7 +24,7 @@ class TestSpoonacularAPI(unittest.TestCase):
         """
         self.api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key")
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_make_request_success(self, mock_get):
         """
         Test the make_request method for a successful API request.
@@ -38,7 +45,7 @@ class TestSpoonacularAPI(unittest.TestCase):
             params={"param1": "value1"}
         )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_make_request_http_error(self, mock_get):
         """
         Test the make_request method for handling HTTP errors.
@@ -55,7 +62,7 @@ class TestSpoonacularAPI(unittest.TestCase):
         mock_get.assert_called_once_with("https://api.spoonacular.com/test_endpoint", params=None)
         self.assertIsNone(result)  # Verify that None is returned on HTTP error
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_make_request_request_exception(self, mock_get):
         """
         Test the make_request method for handling general request exceptions.
@@ -69,6 +76,145 @@ class TestSpoonacularAPI(unittest.TestCase):
         mock_get.assert_called_once_with("https://api.spoonacular.com/test_endpoint", params=None)
         self.assertIsNone(result)   # Verify that None is returned on request exception
 
+    def test_session_connection_pool(self):
+        """
+        Test that the API client mounts a pooled adapter with the configured limits and keep-alive header.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                             pool_connections=2, pool_maxsize=7, pool_block=True)
+        adapter = api.session.get_adapter("https://api.spoonacular.com")
+
+        # Ensure the pool limits were passed to the adapter
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertTrue(adapter._pool_block)
+        self.assertEqual(api.session.headers["Connection"], "keep-alive")
+        api.close()
+
+    @patch('requests.Session.get')
+    def test_close_and_reopen_session(self, mock_get):
+        """
+        Test that close() releases the session and a later request opens a new one.
+        """
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"key": "value"}
+        mock_get.return_value = mock_response
+
+        # Closing twice should not raise an error
+        self.api.close()
+        self.api.close()
+        self.assertIsNone(self.api.session)
+
+        # A request after close re-creates the session
+        self.assertEqual(self.api.make_request("test_endpoint"), {"key": "value"})
+        self.assertIsNotNone(self.api.session)
+
+    @patch('requests.Session.get')
+    def test_make_request_uses_cache(self, mock_get):
+        """
+        Test that an identical request is answered from the response cache instead of the API.
+        """
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"id": 1}
+        mock_get.return_value = mock_response
+
+        # Make the same request twice
+        first = self.api.make_request("recipes/1/information", params={"apiKey": "test_api_key"})
+        second = self.api.make_request("recipes/1/information", params={"apiKey": "test_api_key"})
+
+        self.assertEqual(first, second)
+        mock_get.assert_called_once()  # Only the first request reaches the API
+        self.assertEqual(self.api.cache.stats()["hits"], 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.Session.get')
+    def test_make_request_tracks_quota_headers(self, mock_get, mock_stdout):
+        """
+        Test that the quota headers of each response are tracked and that a used up quota stops further requests.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                             limiter=QuotaLimiter(points_per_minute=600, burst=10, sleep=lambda seconds: None))
+        mock_response = Mock()
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"results": [{"id": 1}]}
+        mock_response.headers = {"X-API-Quota-Request": "1.5", "X-API-Quota-Used": "149", "X-API-Quota-Left": "0"}
+        mock_get.return_value = mock_response
+
+        api.make_request("recipes/complexSearch", params={"query": "soup"})
+        quota = api.remaining_quota()
+        self.assertEqual((quota["quota_used"], quota["quota_left"], quota["last_request_cost"]), (149, 0, 1.5))
+
+        # The API reported that no quota is left, so the next request is not sent
+        self.assertIsNone(api.make_request("recipes/complexSearch", params={"query": "pie"}))
+        mock_get.assert_called_once()
+        self.assertIn("Daily API quota used up", mock_stdout.getvalue())
+
+    @patch('requests.adapters.HTTPAdapter.send')
+    def test_requests_get_timeouts_capped_by_deadline(self, mock_send):
+        """
+        Test that every request gets the connect and read timeouts, shortened to fit the deadline of the user action.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                             connect_timeout=3, read_timeout=10)
+        adapter = api.session.get_adapter("https://api.spoonacular.com")
+        request = requests.Request("GET", "https://api.spoonacular.com/recipes/random").prepare()
+
+        adapter.send(request)
+        self.assertEqual(mock_send.call_args.kwargs["timeout"], (3, 10))
+
+        with Deadline(2):
+            adapter.send(request)
+        connect_timeout, read_timeout = mock_send.call_args.kwargs["timeout"]
+        self.assertLessEqual(connect_timeout, 2)
+        self.assertLessEqual(read_timeout, 2)
+        api.close()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.Session.get')
+    def test_make_request_after_deadline_is_not_sent(self, mock_get, mock_stdout):
+        """
+        Test that no request is sent once the deadline of the user action has passed.
+        """
+        with Deadline(0):
+            self.assertIsNone(self.api.make_request("recipes/1/information"))
+
+        mock_get.assert_not_called()
+        self.assertIn("Out of time", mock_stdout.getvalue())
+
+    @patch('requests.Session.get')
+    def test_make_request_coalesces_identical_requests(self, mock_get):
+        """
+        Test that identical requests made at the same time from several threads share one HTTP request.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_get(url, params=None):
+            # Hold the first request open until every thread has asked for it
+            started.set()
+            release.wait(5)
+            response = Mock()
+            response.raise_for_status.return_value = None
+            response.json.return_value = {"id": 1}
+            return response
+
+        mock_get.side_effect = slow_get
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(self.api.make_request, "recipes/1/information", {"apiKey": "test_api_key"})
+                       for _ in range(5)]
+            started.wait(5)
+            # Wait until the other four threads are waiting for the request in flight
+            while self.api.single_flight.stats()["coalesced"] < 4:
+                time.sleep(0.01)
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(results, [{"id": 1}] * 5)
+        mock_get.assert_called_once()
+
+
 
 # Test class for the RecipeFinder class
 class TestRecipeFinder(unittest.TestCase):
@@ -152,6 +298,34 @@ class TestRecipeFinder(unittest.TestCase):
         # Confirm that the correct recipe was returned
         self.assertEqual(result, [{"id": 1, "title": "Test Recipe"}])
 
+    @patch('app.SpoonacularAPI.make_request')
+    def test_find_recipes_by_category_inline_information(self, mock_make_request):
+        """
+        Test that inline mode asks complexSearch for the full recipe information and caches it.
+        """
+        recipe = {"id": 1, "title": "Test Recipe", "extendedIngredients": [{"original": "1 chicken"}]}
+        mock_make_request.return_value = {"results": [recipe]}
+        recipe_finder = RecipeFinder(self.api, inline_information=True)
+
+        result = recipe_finder.find_recipes_by_category("chicken")
+
+        # Ensure the embedded information was requested
+        mock_make_request.assert_called_once_with(
+            "recipes/complexSearch",
+            params={
+                "number": 5,
+                "apiKey": "test_api_key",
+                "sort": "random",
+                "ignorePantry": "true",
+                "addRecipeInformation": "true",
+                "fillIngredients": "true",
+                "includeIngredients": "chicken"
+            }
+        )
+        self.assertEqual(result, [recipe])
+        # The recipe details are now cached, so no detail request is needed
+        self.assertEqual(self.api.get_cached("recipes/1/information"), recipe)
+
     @patch('app.SpoonacularAPI.make_request')
     def test_find_recipes_by_category_empty_response(self, mock_make_request):
         """
@@ -215,6 +389,39 @@ class TestRecipeFinder(unittest.TestCase):
         )
         self.assertIsNone(result)  # Confirm that None was returned due to the empty response
 
+    @patch('app.app.BULK_CHUNK_SIZE', 2)
+    @patch('app.SpoonacularAPI.make_request')
+    def test_find_recipe_details_bulk(self, mock_make_request):
+        """
+        Test that find_recipe_details_bulk skips cached recipes and requests the rest in chunks.
+        """
+        # Recipe 1 is already cached, so only recipes 2, 3 and 4 are requested
+        self.api.store("recipes/1/information", None, {"id": 1})
+        mock_make_request.side_effect = [[{"id": 2}, {"id": 3}], [{"id": 4}]]
+
+        result = self.recipe_finder.find_recipe_details_bulk([1, 2, 3, 4])
+
+        # Ensure the missing recipes were requested in two chunks of at most two IDs
+        mock_make_request.assert_any_call("recipes/informationBulk", params={"ids": "2,3", "apiKey": "test_api_key"})
+        mock_make_request.assert_any_call("recipes/informationBulk", params={"ids": "4", "apiKey": "test_api_key"})
+        self.assertEqual(mock_make_request.call_count, 2)
+        self.assertEqual(result, {1: {"id": 1}, 2: {"id": 2}, 3: {"id": 3}, 4: {"id": 4}})
+        # The bulk results are cached under each recipe's own information endpoint
+        self.assertEqual(self.api.get_cached("recipes/3/information"), {"id": 3})
+
+    @patch('app.SpoonacularAPI.make_request')
+    def test_detail_responses_fill_title_index(self, mock_make_request):
+        """
+        Test that the titles of single and bulk detail responses are added to the title index.
+        """
+        mock_make_request.side_effect = [{"id": 5, "title": "Lamb Stew"}, [{"id": 6, "title": "Fish Tacos"}]]
+
+        self.recipe_finder.find_recipe_details(5)
+        self.recipe_finder.find_recipe_details_bulk([6])
+
+        self.assertEqual(self.api.title_index.lookup("lamb stew"), 5)
+        self.assertEqual(self.api.title_index.lookup("Fish Tacos"), 6)
+
     @patch('app.SpoonacularAPI.make_request')
     def test_find_random_recipes_success(self, mock_make_request):
         """
@@ -262,6 +469,21 @@ class TestRecipeFinder(unittest.TestCase):
         # check the response
         self.assertEqual(result, [{"id": 1, "title": "Test Recipe"}])
 
+    @patch('app.SpoonacularAPI.make_request')
+    def test_find_recipe_id_uses_title_index(self, mock_make_request):
+        """
+        Test that a title returned by an earlier search is resolved to its ID without another request.
+        """
+        mock_make_request.return_value = [{"id": 7, "title": "Crème Brûlée"}]
+        self.recipe_finder.find_recipes_by_ingredients("cream, sugar")
+        mock_make_request.reset_mock()
+
+        recipe_details = RecipeDetails(self.api, self.recipe_finder)
+
+        # Case, accents and spacing do not matter
+        self.assertEqual(recipe_details.find_recipe_id("creme  brulee"), 7)
+        mock_make_request.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,167 @@
+# ===== Importing necessary modules and classes ===========
+import asyncio
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from io import StringIO
+from urllib.parse import urlparse, parse_qs
+from app.async_app import AsyncSpoonacularAPI, AsyncRecipeFinder
+from app.hedging import HedgePolicy
+
+
+# Stub of the Spoonacular API that records the requests and how many were handled at the same time
+class StubSpoonacularHandler(BaseHTTPRequestHandler):
+    requests = []
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        with self.lock:
+            StubSpoonacularHandler.requests.append(url.path)
+            StubSpoonacularHandler.active += 1
+            StubSpoonacularHandler.max_active = max(StubSpoonacularHandler.max_active,
+                                                    StubSpoonacularHandler.active)
+            first_request = StubSpoonacularHandler.requests.count(url.path) == 1
+        try:
+            # Take a little time, so concurrent requests overlap. The first lookup of recipe 99 stalls
+            time.sleep(1.0 if url.path == "/recipes/99/information" and first_request else 0.02)
+            if params.get("apiKey") != ["test_api_key"]:
+                self.send_json(401, {"message": "Invalid API key"})
+            elif url.path == "/recipes/findByIngredients":
+                self.send_json(200, [{"id": 1, "title": "Tomato Soup"}])
+            elif url.path.endswith("/information"):
+                recipe_id = int(url.path.split("/")[2])
+                self.send_json(200, {"id": recipe_id, "title": f"Recipe {recipe_id}"})
+            else:
+                self.send_json(404, {"message": "Not found"})
+        finally:
+            with self.lock:
+                StubSpoonacularHandler.active -= 1
+
+    def send_json(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep the test output clean
+        pass
+
+
+# Test class for the AsyncSpoonacularAPI and AsyncRecipeFinder classes
+class TestAsyncRecipeFinder(unittest.TestCase):
+    """
+    Unit tests for the asyncio client, run against a stub HTTP server on localhost.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Start the stub server in a background thread.
+        """
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubSpoonacularHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Stop the stub server.
+        """
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """
+        Reset the recorded requests.
+        """
+        StubSpoonacularHandler.requests = []
+        StubSpoonacularHandler.max_active = 0
+
+    def run_with_finder(self, coroutine_function, api_key="test_api_key", max_concurrency=10, hedge_policy=None):
+        # Run a coroutine with a new client and close the client afterwards
+        async def main():
+            async with AsyncSpoonacularAPI(self.base_url, api_key, max_concurrency=max_concurrency,
+                                           hedge_policy=hedge_policy) as api:
+                return await coroutine_function(AsyncRecipeFinder(api))
+        return asyncio.run(main())
+
+    def test_find_recipes_by_ingredients(self):
+        """
+        Test that a search is sent to the stub server and that a repeated search is served from the cache.
+        """
+        async def search_twice(finder):
+            first = await finder.find_recipes_by_ingredients("tomato")
+            second = await finder.find_recipes_by_ingredients("tomato")
+            return first, second, finder.api.title_index.lookup("tomato soup")
+
+        first, second, recipe_id = self.run_with_finder(search_twice)
+
+        self.assertEqual(first, [{"id": 1, "title": "Tomato Soup"}])
+        self.assertEqual(second, first)
+        self.assertEqual(StubSpoonacularHandler.requests, ["/recipes/findByIngredients"])
+        self.assertEqual(recipe_id, 1)
+
+    def test_fan_out_respects_concurrency_limit(self):
+        """
+        Test that many lookups run at the same time, but never more than the semaphore allows.
+        """
+        recipe_ids = list(range(1, 41))
+
+        results = self.run_with_finder(lambda finder: finder.find_many_recipe_details(recipe_ids),
+                                       max_concurrency=5)
+
+        self.assertEqual([result["id"] for result in results], recipe_ids)
+        self.assertEqual(len(StubSpoonacularHandler.requests), 40)
+        self.assertGreater(StubSpoonacularHandler.max_active, 1)
+        self.assertLessEqual(StubSpoonacularHandler.max_active, 5)
+
+    def test_identical_lookups_share_one_request(self):
+        """
+        Test that identical lookups started at the same time are answered by one request to the server.
+        """
+        async def look_up_ten_times(finder):
+            return await asyncio.gather(*(finder.find_recipe_details(7) for _ in range(10)))
+
+        results = self.run_with_finder(look_up_ten_times)
+
+        self.assertEqual(results, [{"id": 7, "title": "Recipe 7"}] * 10)
+        self.assertEqual(StubSpoonacularHandler.requests, ["/recipes/7/information"])
+
+    def test_slow_lookup_is_hedged(self):
+        """
+        Test that a stalled lookup is sent again after the hedge delay and that the faster response is used.
+        """
+        policy = HedgePolicy(default_delay=0.05, max_rate=1.0)
+        started = time.monotonic()
+
+        result = self.run_with_finder(lambda finder: finder.find_recipe_details(99), hedge_policy=policy)
+
+        self.assertEqual(result, {"id": 99, "title": "Recipe 99"})
+        self.assertLess(time.monotonic() - started, 0.8)
+        self.assertEqual(StubSpoonacularHandler.requests, ["/recipes/99/information"] * 2)
+        self.assertEqual(policy.stats()["hedge_wins"], 1)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_invalid_api_key(self, mock_stdout):
+        """
+        Test that a 401 response is reported like the synchronous client does and returns None.
+        """
+        result = self.run_with_finder(lambda finder: finder.find_recipe_details(1), api_key="wrong")
+
+        self.assertIsNone(result)
+        self.assertIn("No API key found or invalid API key", mock_stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
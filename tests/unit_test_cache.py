@@ -0,0 +1,157 @@
+# ===== Importing necessary modules and classes ===========
+import os
+import tempfile
+import unittest
+from app.cache import ResponseCache, DiskCache
+
+
+# Test class for the ResponseCache class
+class TestResponseCache(unittest.TestCase):
+    """
+    Unit tests for the ResponseCache class, which caches decoded API responses in memory.
+    """
+
+    def setUp(self):
+        """
+        Initialize a ResponseCache with a fake clock so expiry can be tested without waiting.
+        """
+        self.now = 0
+        self.cache = ResponseCache(max_bytes=1000, ttls={"recipes/*/information": 100, "recipes/random": 0},
+                                   default_ttl=10, clock=lambda: self.now)
+
+    def test_key_ignores_api_key_and_param_order(self):
+        """
+        Test that the cache key does not depend on the API key or the order of the parameters.
+        """
+        key_one = ResponseCache.make_key("recipes/complexSearch", {"query": "soup", "number": 5, "apiKey": "a"})
+        key_two = ResponseCache.make_key("recipes/complexSearch", {"apiKey": "b", "number": 5, "query": "soup"})
+        self.assertEqual(key_one, key_two)
+        self.assertNotIn("apiKey", key_one)
+
+    def test_hit_miss_and_expiry(self):
+        """
+        Test that a stored response is returned until its endpoint TTL runs out.
+        """
+        self.assertIsNone(self.cache.get("recipes/1/information", {"apiKey": "a"}))
+        self.cache.set("recipes/1/information", {"apiKey": "a"}, {"id": 1})
+
+        # A request with another API key is served from the cache
+        self.assertEqual(self.cache.get("recipes/1/information", {"apiKey": "b"}), {"id": 1})
+
+        # Move the clock past the TTL so the entry expires
+        self.now = 101
+        self.assertIsNone(self.cache.get("recipes/1/information", {"apiKey": "a"}))
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 2)
+
+    def test_random_requests_are_not_cached(self):
+        """
+        Test that random recipes and randomly sorted searches are never cached.
+        """
+        self.cache.set("recipes/random", {"number": 5}, {"recipes": []})
+        self.cache.set("recipes/complexSearch", {"sort": "random"}, {"results": []})
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction_under_byte_budget(self):
+        """
+        Test that the least recently used entry is evicted when the byte budget is exceeded.
+        """
+        payload = {"text": "x" * 400}
+        self.cache.set("recipes/1/information", None, payload)
+        self.cache.set("recipes/2/information", None, payload)
+        # Use recipe 1 so recipe 2 becomes the least recently used entry
+        self.cache.get("recipes/1/information")
+        self.cache.set("recipes/3/information", None, payload)
+
+        self.assertIsNotNone(self.cache.get("recipes/1/information"))
+        self.assertIsNone(self.cache.get("recipes/2/information"))
+        self.assertIsNotNone(self.cache.get("recipes/3/information"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+        self.assertLessEqual(self.cache.stats()["bytes"], 1000)
+
+
+# Test class for the DiskCache class
+class TestDiskCache(unittest.TestCase):
+    """
+    Unit tests for the DiskCache class, which keeps API responses in a SQLite file between runs.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary directory for the cache file and a fake clock.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite3")
+        self.now = 1000
+        self.ttls = {"recipes/*/information": 100, "recipes/complexSearch": 100}
+
+    def tearDown(self):
+        """
+        Remove the temporary cache file.
+        """
+        self.directory.cleanup()
+
+    def make_cache(self, max_bytes=10000):
+        # Create a cache on the shared file, like a new run of the application would
+        return DiskCache(self.path, max_bytes=max_bytes, ttls=self.ttls, default_ttl=0, negative_ttl=10,
+                         clock=lambda: self.now)
+
+    def test_response_survives_restart(self):
+        """
+        Test that a response stored by one cache instance is read by a new instance on the same file.
+        """
+        first_run = self.make_cache()
+        first_run.set("recipes/1/information", {"apiKey": "a"}, {"id": 1, "title": "Soup"})
+        first_run.close()
+
+        second_run = self.make_cache()
+        self.assertEqual(second_run.get("recipes/1/information", {"apiKey": "b"}), {"id": 1, "title": "Soup"})
+
+        # The response expires after its TTL
+        self.now += 101
+        self.assertIsNone(second_run.get("recipes/1/information"))
+        second_run.close()
+
+    def test_negative_caching_uses_short_ttl(self):
+        """
+        Test that an empty search result is cached, but only for the negative TTL.
+        """
+        cache = self.make_cache()
+        cache.set("recipes/complexSearch", {"query": "nothing"}, {"results": []})
+        self.assertEqual(cache.get("recipes/complexSearch", {"query": "nothing"}), {"results": []})
+
+        self.now += 11
+        self.assertIsNone(cache.get("recipes/complexSearch", {"query": "nothing"}))
+        cache.close()
+
+    def test_eviction_keeps_file_under_budget(self):
+        """
+        Test that the least recently used responses are deleted when the cache is over its byte budget.
+        """
+        cache = self.make_cache(max_bytes=300)
+        # Random text does not compress well, so each response takes most of the budget
+        payload = {"text": os.urandom(200).hex()}
+        cache.set("recipes/1/information", None, payload)
+        self.now += 1
+        cache.set("recipes/2/information", None, payload)
+
+        self.assertIsNone(cache.get("recipes/1/information"))
+        self.assertEqual(cache.get("recipes/2/information"), payload)
+        self.assertLessEqual(cache.stats()["bytes"], 300)
+        cache.close()
+
+    def test_two_connections_share_the_file(self):
+        """
+        Test that two cache instances open at the same time see each other's writes.
+        """
+        writer = self.make_cache()
+        reader = self.make_cache()
+        self.assertIsNone(reader.get("recipes/1/information"))
+        writer.set("recipes/1/information", None, {"id": 1})
+        self.assertEqual(reader.get("recipes/1/information"), {"id": 1})
+        writer.close()
+        reader.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from unittest.mock import patch, Mock
+from io import StringIO
+import requests
+from app import SpoonacularAPI, RecipeFinder
+from app.app import RecipeDetails
+from app.corpus import RecipeCorpus
+
+
+# Builds the full information of a recipe, as returned by recipes/{id}/information
+def make_recipe(recipe_id, title, ingredients, dish_types=(), diets=(), ready_in_minutes=30):
+    return {
+        "id": recipe_id,
+        "title": title,
+        "readyInMinutes": ready_in_minutes,
+        "dishTypes": list(dish_types),
+        "diets": list(diets),
+        "extendedIngredients": [{"name": name, "original": f"1 cup {name}"} for name in ingredients],
+        "analyzedInstructions": [{"steps": [{"number": 1, "step": f"Cook the {ingredients[0]}."}]}],
+    }
+
+
+# Test class for the RecipeCorpus class
+class TestRecipeCorpus(unittest.TestCase):
+    """
+    Unit tests for the RecipeCorpus class, which answers searches from the recipes stored on this device.
+    """
+
+    def setUp(self):
+        """
+        Initialize an in-memory corpus with a few recipes.
+        """
+        self.corpus = RecipeCorpus()
+        self.corpus.add_recipes([
+            make_recipe(1, "Tomato Soup", ["tomato", "onion", "cream"], dish_types=["soup"],
+                        diets=["lacto ovo vegetarian"]),
+            make_recipe(2, "Tomato Basil Pasta", ["tomato", "basil"], dish_types=["main course"],
+                        diets=["vegan"], ready_in_minutes=15),
+            make_recipe(3, "Fish Tacos", ["fish", "tortilla", "lime"], dish_types=["main course"]),
+            make_recipe(4, "Crème Brûlée", ["cream", "sugar", "egg"], dish_types=["dessert"]),
+            # Plain search results without ingredients are not stored
+            {"id": 5, "title": "Unknown Recipe"},
+        ])
+
+    def tearDown(self):
+        """
+        Close the corpus.
+        """
+        self.corpus.close()
+
+    def test_search_by_ingredients_ranks_fewest_missing_first(self):
+        """
+        Test that an ingredient search returns the recipes that use the ingredients, fewest missing ingredients first.
+        """
+        results = self.corpus.answer("recipes/findByIngredients", {"ingredients": "Tomato, basil", "number": 5})
+
+        self.assertEqual([recipe["id"] for recipe in results], [2, 1])
+        self.assertEqual([ingredient["name"] for ingredient in results[1]["usedIngredients"]], ["tomato"])
+        self.assertEqual(results[1]["missedIngredientCount"], 2)
+        self.assertEqual(len(self.corpus), 4)
+
+    def test_category_search_applies_filters(self):
+        """
+        Test that the complexSearch filters used by the categories are applied to the stored recipes.
+        """
+        def search(**params):
+            return sorted(recipe["id"] for recipe in self.corpus.answer("recipes/complexSearch", params)["results"])
+
+        self.assertEqual(search(includeIngredients="fish"), [3])
+        self.assertEqual(search(type="dessert"), [4])
+        self.assertEqual(search(diet="vegan|vegetarian"), [1, 2])
+        self.assertEqual(search(maxReadyTime=15), [2])
+        self.assertEqual(len(search(number=2, sort="random")), 2)
+
+    def test_added_recipes_update_the_pantry_matcher_in_place(self):
+        """
+        Test that recipes added after the first search are matched without reloading every recipe, and that
+        storing a recipe again unchanged leaves the corpus version as it is.
+        """
+        self.corpus.search_by_ingredients("tomato")
+        version = self.corpus.version
+
+        with patch.object(self.corpus, "iter_ingredients") as mock_iter:
+            self.corpus.add_recipes([make_recipe(6, "Caprese", ["tomato", "mozzarella", "basil"])])
+            results = self.corpus.search_by_ingredients("mozzarella")
+            self.corpus.add_recipes([make_recipe(6, "Caprese", ["tomato", "mozzarella", "basil"])])
+
+        mock_iter.assert_not_called()
+        self.assertEqual([recipe["id"] for recipe in results], [6])
+        self.assertEqual(self.corpus.version, version + 1)
+
+    def test_title_and_detail_lookups(self):
+        """
+        Test that a title search ignores case and accents and that details are returned by ID.
+        """
+        results = self.corpus.answer("recipes/complexSearch", {"query": "creme brulee"})["results"]
+        self.assertEqual([recipe["id"] for recipe in results], [4])
+        self.assertEqual(self.corpus.answer("recipes/3/information")["title"], "Fish Tacos")
+        self.assertEqual([recipe["id"] for recipe in self.corpus.answer("recipes/informationBulk", {"ids": "1,9,2"})],
+                         [1, 2])
+        self.assertIsNone(self.corpus.answer("recipes/9/information"))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.Session.get')
+    def test_api_falls_back_to_corpus(self, mock_get, mock_stdout):
+        """
+        Test that recipes received from the API are stored and answer searches once the API cannot be reached.
+        """
+        corpus = RecipeCorpus()
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key", corpus=corpus)
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = {"recipes": [make_recipe(7, "Lamb Stew", ["lamb", "carrot"])]}
+        mock_get.return_value = mock_response
+
+        finder = RecipeFinder(api)
+        finder.find_random_recipes()
+        self.assertEqual(corpus.get(7)["title"], "Lamb Stew")
+
+        # The connection is lost: searches and title lookups are answered from the corpus
+        mock_get.side_effect = requests.exceptions.ConnectionError("No route to host")
+        recipes = finder.find_recipes_by_ingredients("carrot")
+        self.assertEqual([recipe["title"] for recipe in recipes], ["Lamb Stew"])
+        self.assertEqual([recipe["id"] for recipe in finder.find_recipes_by_category("lamb")], [7])
+        api.title_index = Mock(lookup=Mock(return_value=None))
+        self.assertEqual(RecipeDetails(api, finder).find_recipe_id("lamb stew"), 7)
+        self.assertIn("showing recipes stored on this device", mock_stdout.getvalue())
+        api.close()
+
+    @patch('requests.Session.get')
+    def test_offline_mode_does_not_contact_api(self, mock_get):
+        """
+        Test that in offline mode every request is answered from the corpus.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key", corpus=self.corpus,
+                             offline=True)
+
+        self.assertEqual(api.make_request("recipes/2/information")["title"], "Tomato Basil Pasta")
+        mock_get.assert_not_called()
+
+
+    @patch('requests.Session.get')
+    def test_local_ingredient_search(self, mock_get):
+        """
+        Test that ingredient searches are answered from the corpus when it holds enough matching recipes.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key", corpus=self.corpus)
+        finder = RecipeFinder(api, local_ingredient_search=True)
+
+        recipes = finder.find_recipes_by_ingredients("cream", number=2)
+
+        self.assertEqual(sorted(recipe["id"] for recipe in recipes), [1, 4])
+        self.assertIn("extendedIngredients", recipes[0])
+        mock_get.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from app.deadline import Deadline, DeadlineExceededError, current_deadline
+
+
+# Test class for the Deadline class
+class TestDeadline(unittest.TestCase):
+    """
+    Unit tests for the Deadline class, which is the time budget of one user action.
+    """
+
+    def setUp(self):
+        """
+        Use a fake clock so the tests do not have to wait.
+        """
+        self.now = 100.0
+
+    def make_deadline(self, seconds):
+        # Create a deadline on the fake clock
+        return Deadline(seconds, clock=lambda: self.now)
+
+    def test_limit_and_expiry(self):
+        """
+        Test that timeouts are shortened to the time left and that check() fails once the deadline has passed.
+        """
+        deadline = self.make_deadline(3)
+        self.assertEqual(deadline.limit((5, 2)), (3, 2))
+        self.assertEqual(deadline.limit(None), 3)
+
+        self.now += 3
+        self.assertTrue(deadline.expired())
+        with self.assertRaises(DeadlineExceededError):
+            deadline.check()
+
+    def test_nested_deadline_keeps_the_earlier_one(self):
+        """
+        Test that a deadline entered inside another one cannot extend it, and that the outer one is restored.
+        """
+        outer = self.make_deadline(2)
+        self.assertIsNone(current_deadline())
+        with outer:
+            with self.make_deadline(10):
+                self.assertIs(current_deadline(), outer)
+            shorter = self.make_deadline(1)
+            with shorter:
+                self.assertIs(current_deadline(), shorter)
+            self.assertIs(current_deadline(), outer)
+        self.assertIsNone(current_deadline())
+
+
+if __name__ == "__main__":
+    unittest.main()
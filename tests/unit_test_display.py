@@ -1,8 +1,11 @@
 # ===== Importing necessary modules and classes ===========
+import time
 import unittest
 from unittest.mock import patch, Mock
 from io import StringIO
 from app.display import RecipeDisplay, MenuDisplay
+from app.deadline import Deadline
+from app import RecipeFinder
 
 
 # Test display.py file
@@ -25,12 +28,12 @@ class TestRecipeDisplay(unittest.TestCase):
         """
         Test display_recipes method when recipe details include ingredients and instructions.
         """
-        # Mocking the response of find_recipe_instructions method
-        self.get_mock.find_recipe_details.return_value = {
+        # Mocking the response of find_recipe_details_bulk method
+        self.get_mock.find_recipe_details_bulk.return_value = {1: {
             'extendedIngredients': [{'original': '1 Tomato'}, {'original': '2 Basil leaves'}],
             'analyzedInstructions': [
                 {'steps': [{'number': 1, 'step': 'Chop tomatoes.'}, {'number': 2, 'step': 'Mix with basil.'}]}]
-        }
+        }}
 
         recipes = [
             {'id': 1, 'title': 'Tomato Basil Pasta', 'usedIngredients': [{'name': 'Tomato'}],
@@ -60,11 +63,11 @@ class TestRecipeDisplay(unittest.TestCase):
         """
         Test display_recipes method when recipe details are empty.
         """
-        # Mocking the response of find_recipe_instructions method
-        self.get_mock.find_recipe_details.return_value = {
+        # Mocking the response of find_recipe_details_bulk method
+        self.get_mock.find_recipe_details_bulk.return_value = {1: {
             'extendedIngredients': [],
             'analyzedInstructions': []
-        }
+        }}
 
         recipes = [
             {'id': 1, 'title': 'Mysterious Dish', 'usedIngredients': [], 'missedIngredients': []}
@@ -81,6 +84,162 @@ class TestRecipeDisplay(unittest.TestCase):
         self.assertIn("No ingredients available.", output)
         self.assertIn("No instructions available.", output)
 
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_display_recipes_uses_one_bulk_lookup(self, mock_stdout):
+        """
+        Test that display_recipes gets the details of all recipes with a single bulk lookup.
+        """
+        # Only the second recipe has details, the first one was not found
+        self.get_mock.find_recipe_details_bulk.return_value = {
+            2: {'extendedIngredients': [{'original': '1 Egg'}], 'analyzedInstructions': []}
+        }
+        recipes = [{'id': 1, 'title': 'Lost Recipe'}, {'id': 2, 'title': 'Boiled Egg'}]
+
+        self.recipe_display.display_recipes(recipes, by_ingredients=False)
+        output = mock_stdout.getvalue()
+
+        # Ensure one bulk call was made for both recipes and no single lookups
+        self.get_mock.find_recipe_details_bulk.assert_called_once_with([1, 2])
+        self.get_mock.find_recipe_details.assert_not_called()
+        self.assertIn("RECIPE 1: Lost Recipe", output)
+        self.assertIn("No ingredients available.", output)
+        self.assertIn(" - 1 Egg", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_display_recipes_with_inline_information(self, mock_stdout):
+        """
+        Test that recipes which already include their full information are displayed without any detail lookup.
+        """
+        recipes = [{'id': 1, 'title': 'Random Salad', 'extendedIngredients': [{'original': '1 Lettuce'}],
+                    'analyzedInstructions': [{'steps': [{'number': 1, 'step': 'Wash the lettuce.'}]}]}]
+
+        self.recipe_display.display_recipes(recipes, by_ingredients=False)
+        output = mock_stdout.getvalue()
+
+        # Ensure no lookups were made and the embedded information was printed
+        self.get_mock.find_recipe_details_bulk.assert_not_called()
+        self.get_mock.find_recipe_details.assert_not_called()
+        self.assertIn(" - 1 Lettuce", output)
+        self.assertIn("Step 1: Wash the lettuce.", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_display_recipes_concurrent_keeps_order(self, mock_stdout):
+        """
+        Test that concurrent mode prints recipes in their original order and that one failed fetch
+        only affects its own recipe.
+        """
+        def fake_details(recipe_id):
+            # The first recipe is the slowest and the second one fails
+            if recipe_id == 1:
+                time.sleep(0.05)
+                return {'extendedIngredients': [{'original': '1 Slow Onion'}], 'analyzedInstructions': []}
+            if recipe_id == 2:
+                raise ValueError("Connection reset")
+            return {'extendedIngredients': [{'original': '1 Fast Carrot'}], 'analyzedInstructions': []}
+
+        self.get_mock.fetch_recipe_details.side_effect = fake_details
+        recipe_display = RecipeDisplay(get_recipe=self.get_mock, fetch_mode="concurrent", max_workers=3)
+        recipes = [{'id': 1, 'title': 'Onion Soup'}, {'id': 2, 'title': 'Broken Dish'}, {'id': 3, 'title': 'Carrots'}]
+
+        recipe_display.display_recipes(recipes, by_ingredients=False)
+        output = mock_stdout.getvalue()
+
+        # Ensure the recipes are printed in order even though the first one finished last
+        self.assertLess(output.index("RECIPE 1: Onion Soup"), output.index("RECIPE 2: Broken Dish"))
+        self.assertLess(output.index("RECIPE 2: Broken Dish"), output.index("RECIPE 3: Carrots"))
+        self.assertLess(output.index("1 Slow Onion"), output.index("RECIPE 2: Broken Dish"))
+        # Only the failed recipe shows the missing ingredients message
+        self.assertEqual(output.count("No ingredients available."), 1)
+        self.assertIn(" - 1 Fast Carrot", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_display_recipes_concurrent_shows_partial_results_at_deadline(self, mock_stdout):
+        """
+        Test that concurrent mode stops waiting at the deadline and shows the recipes it could not load without details,
+        without waiting for the requests that are still running.
+        """
+        def fake_details(recipe_id):
+            # The second recipe takes longer than the time budget
+            if recipe_id == 2:
+                time.sleep(1)
+            return {'extendedIngredients': [{'original': f'{recipe_id} Carrot'}], 'analyzedInstructions': []}
+
+        self.get_mock.fetch_recipe_details.side_effect = fake_details
+        recipe_display = RecipeDisplay(get_recipe=self.get_mock, fetch_mode="concurrent", max_workers=3)
+        recipes = [{'id': 1, 'title': 'Quick Dish'}, {'id': 2, 'title': 'Slow Dish'}, {'id': 3, 'title': 'Carrots'}]
+
+        started = time.perf_counter()
+        with Deadline(0.1):
+            recipe_display.display_recipes(recipes, by_ingredients=False)
+        output = mock_stdout.getvalue()
+
+        self.assertLess(time.perf_counter() - started, 0.5)
+
+        # Every recipe is shown, but only the slow one is missing its details
+        self.assertIn(" - 1 Carrot", output)
+        self.assertIn("RECIPE 2: Slow Dish", output)
+        self.assertNotIn(" - 2 Carrot", output)
+        self.assertIn("Some recipe details could not be loaded within the time limit.", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_requests_left_running_after_deadline_stay_quiet(self, mock_stdout):
+        """
+        Test that a detail request that fails after the deadline does not print its error over the next screen.
+        """
+        def fake_request(endpoint, params=None):
+            # The second recipe times out after the time budget
+            if endpoint == "recipes/2/information":
+                time.sleep(0.3)
+                raise TimeoutError("read timed out")
+            return {'id': 1, 'title': 'Quick Dish', 'extendedIngredients': [{'original': '1 Carrot'}]}
+
+        api = Mock(api_key="test_api_key")
+        api.request.side_effect = fake_request
+        recipe_display = RecipeDisplay(get_recipe=RecipeFinder(api), fetch_mode="concurrent", max_workers=2)
+
+        with Deadline(0.1):
+            recipe_display.display_recipes([{'id': 1, 'title': 'Quick Dish'}, {'id': 2, 'title': 'Slow Dish'}],
+                                           by_ingredients=False)
+        # Let the request that was left running fail
+        time.sleep(0.4)
+
+        self.assertIn(" - 1 Carrot", mock_stdout.getvalue())
+        self.assertNotIn("read timed out", mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_display_recipe_titles_makes_no_lookup(self, mock_stdout):
+        """
+        Test that lazy mode prints the numbered titles without fetching any recipe details.
+        """
+        recipes = [{'id': 1, 'title': 'Tomato Basil Pasta', 'usedIngredients': [{'name': 'Tomato'}],
+                    'missedIngredients': [{'name': 'Basil'}, {'name': 'Pasta'}]}]
+
+        self.recipe_display.display_recipe_titles(recipes)
+        output = mock_stdout.getvalue()
+
+        self.assertIn("[1] Tomato Basil Pasta (1 used, 2 missing)", output)
+        self.get_mock.find_recipe_details.assert_not_called()
+        self.get_mock.find_recipe_details_bulk.assert_not_called()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_expand_recipe_is_memoised(self, mock_stdout):
+        """
+        Test that expanding a recipe fetches its details once and reuses them when expanded again.
+        """
+        self.get_mock.find_recipe_details.return_value = {
+            'extendedIngredients': [{'original': '1 Tomato'}], 'analyzedInstructions': []
+        }
+        recipes = [{'id': 7, 'title': 'Tomato Salad'}]
+
+        # Expand the same recipe twice
+        self.recipe_display.expand_recipe(recipes, 1, by_ingredients=False)
+        self.recipe_display.expand_recipe(recipes, 1, by_ingredients=False)
+        output = mock_stdout.getvalue()
+
+        self.get_mock.find_recipe_details.assert_called_once_with(7)
+        self.assertEqual(output.count("RECIPE 1: Tomato Salad"), 2)
+        self.assertIn(" - 1 Tomato", output)
+
     @patch('sys.stdout', new_callable=StringIO)
     def test_display_saved_recipes(self, mock_stdout):
         """
@@ -0,0 +1,107 @@
+# ===== Importing necessary modules and classes ===========
+import threading
+import time
+import unittest
+from unittest.mock import patch, Mock
+from app import SpoonacularAPI
+from app.hedging import HedgePolicy
+
+
+# Test class for the HedgePolicy class
+class TestHedgePolicy(unittest.TestCase):
+    """
+    Unit tests for the HedgePolicy class, which decides when a slow request is sent a second time.
+    """
+
+    def test_delay_adapts_to_observed_latency(self):
+        """
+        Test that the default delay is used until enough latencies are known, then the 95th percentile.
+        """
+        policy = HedgePolicy(default_delay=1.0, min_delay=0.01, min_samples=20)
+        self.assertEqual(policy.delay_for("recipes/1/information"), 1.0)
+
+        # 95 fast lookups and 5 slow ones
+        for latency in [0.1] * 95 + [2.0] * 5:
+            policy.record("recipes/1/information", latency)
+        self.assertEqual(policy.delay_for("recipes/2/information"), 2.0)
+        self.assertIsNone(policy.pattern_for("recipes/complexSearch"))
+
+    def test_hedge_rate_is_capped(self):
+        """
+        Test that no more than the maximum share of requests is hedged.
+        """
+        policy = HedgePolicy(max_rate=0.1)
+        allowed = 0
+        for _ in range(50):
+            policy.delay_for("recipes/1/information")
+            allowed += policy.allow_hedge()
+
+        self.assertEqual(allowed, 5)
+        self.assertEqual(policy.stats()["hedge_rate"], 0.1)
+
+
+# Test class for hedged requests in SpoonacularAPI
+class TestSpoonacularAPIHedging(unittest.TestCase):
+    """
+    Unit tests for hedged detail lookups in SpoonacularAPI.
+    """
+
+    def setUp(self):
+        """
+        Initialize SpoonacularAPI with a hedge policy that hedges after 50 ms.
+        """
+        self.policy = HedgePolicy(default_delay=0.05, max_rate=1.0)
+        self.api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                                  hedge_policy=self.policy)
+
+    def tearDown(self):
+        """
+        Close the API client and its hedge threads.
+        """
+        self.api.close()
+
+    @patch('requests.Session.get')
+    def test_slow_lookup_is_hedged_and_first_response_wins(self, mock_get):
+        """
+        Test that a slow lookup is sent a second time and that the faster response is used.
+        """
+        calls = []
+        lock = threading.Lock()
+
+        def get(url, params=None):
+            # The first request stalls, the hedged one answers straight away
+            with lock:
+                calls.append(url)
+                first = len(calls) == 1
+            if first:
+                time.sleep(0.5)
+            response = Mock(status_code=200)
+            response.json.return_value = {"id": 1, "slow": first}
+            return response
+
+        mock_get.side_effect = get
+        started = time.monotonic()
+        result = self.api.make_request("recipes/1/information")
+
+        self.assertEqual(result, {"id": 1, "slow": False})
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self.policy.stats()["hedge_wins"], 1)
+
+    @patch('requests.Session.get')
+    def test_other_endpoints_are_not_hedged(self, mock_get):
+        """
+        Test that searches are never hedged.
+        """
+        response = Mock(status_code=200)
+        response.json.return_value = {"results": []}
+        mock_get.return_value = response
+
+        self.api.make_request("recipes/complexSearch", params={"query": "soup"})
+
+        mock_get.assert_called_once()
+        self.assertEqual(self.policy.stats()["requests"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from unittest.mock import patch, Mock
+from app import SpoonacularAPI
+from app.key_pool import ApiKeyPool, NoApiKeyAvailableError
+
+
+# Test class for the ApiKeyPool class
+class TestApiKeyPool(unittest.TestCase):
+    """
+    Unit tests for the ApiKeyPool class, which spreads requests over several API keys.
+    """
+
+    def setUp(self):
+        """
+        Initialize a pool of three keys with a fake clock set to noon UTC on 1 January 2025.
+        """
+        self.now = 1735732800.0
+        self.pool = ApiKeyPool(["key-a", "key-b", "key-c"], clock=lambda: self.now)
+
+    def test_least_used_key_is_selected(self):
+        """
+        Test that each request goes to the key that has used the fewest points today.
+        """
+        self.pool.update("key-a", {"X-API-Quota-Used": "40"})
+        self.pool.update("key-b", {"X-API-Quota-Used": "10"})
+        self.pool.update("key-c", {"X-API-Quota-Used": "25"})
+
+        self.assertEqual(self.pool.select(), "key-b")
+        self.pool.update("key-b", {"X-API-Quota-Used": "30"})
+        self.assertEqual(self.pool.select(), "key-c")
+
+    def test_round_robin(self):
+        """
+        Test that the round robin strategy takes the keys in turn and skips disabled keys.
+        """
+        pool = ApiKeyPool(["key-a", "key-b", "key-c"], strategy="round_robin", clock=lambda: self.now)
+        pool.disable("key-b", 401)
+
+        self.assertEqual([pool.select() for _ in range(4)], ["key-a", "key-c", "key-a", "key-c"])
+
+    def test_disabled_keys_come_back_after_reset(self):
+        """
+        Test that rejected keys are left out until midnight UTC, and that an empty pool raises an error.
+        """
+        self.pool.disable("key-a", 402)
+        self.pool.disable("key-b", 401)
+        self.pool.update("key-c", {"X-API-Quota-Used": "150", "X-API-Quota-Left": "0"})
+
+        self.assertEqual(self.pool.available(), 0)
+        with self.assertRaises(NoApiKeyAvailableError):
+            self.pool.select()
+        self.assertEqual([key["disabled_reason"] for key in self.pool.stats()],
+                         ["quota used up", "invalid key", "quota used up"])
+
+        # Twelve hours later the daily quota has reset
+        self.now += 12 * 60 * 60
+        self.assertEqual(self.pool.available(), 3)
+        self.assertEqual(self.pool.stats()[2]["used"], 0)
+
+    def test_stats_mask_keys(self):
+        """
+        Test that the stats never show a full API key.
+        """
+        self.assertEqual([key["key"] for key in self.pool.stats()], ["...ey-a", "...ey-b", "...ey-c"])
+
+    @patch('requests.Session.get')
+    def test_rejected_key_is_replaced(self, mock_get):
+        """
+        Test that the client sends each request with a key from the pool and resends a 402 response with another key.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="key-a", key_pool=self.pool)
+        used_up = Mock(status_code=402, headers={})
+        success = Mock(status_code=200, headers={"X-API-Quota-Used": "5"})
+        success.raise_for_status.return_value = None
+        success.json.return_value = {"id": 1}
+        mock_get.side_effect = [used_up, success]
+
+        result = api.make_request("recipes/1/information", params={"apiKey": "key-a"})
+
+        self.assertEqual(result, {"id": 1})
+        sent_keys = [call.kwargs["params"]["apiKey"] for call in mock_get.call_args_list]
+        self.assertEqual(sent_keys, ["key-a", "key-b"])
+        self.assertEqual(self.pool.available(), 2)
+        api.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
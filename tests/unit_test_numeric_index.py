@@ -0,0 +1,130 @@
+# ===== Importing necessary modules and classes ===========
+import random
+import time
+import unittest
+from unittest.mock import patch
+from app.numeric_index import NumericIndex
+from app.corpus import RecipeCorpus
+from app.recipe_saver import SaveRecipe
+
+
+# Test class for the NumericIndex class
+class TestNumericIndex(unittest.TestCase):
+    """
+    Unit tests for the NumericIndex class, which filters and sorts recipes by their numeric fields with NumPy.
+    """
+
+    def setUp(self):
+        """
+        Initialize an index with four recipes, one of them without a price.
+        """
+        self.index = NumericIndex()
+        self.index.load([
+            # (id, readyInMinutes, servings, healthScore, pricePerServing, aggregateLikes)
+            (1, 45, 4, 20.0, 150.5, 10),
+            (2, 15, 2, 60.0, 90.0, 300),
+            (3, 20, 4, 35.0, None, 300),
+            (4, 10, 1, 80.0, 60.25, 5),
+        ])
+
+    def test_range_filter_and_sort(self):
+        """
+        Test that range filters keep the recipes within the bounds and the results follow the sort order.
+        """
+        results = self.index.query({"readyInMinutes": (None, 20)}, sort=[("pricePerServing", "asc")])
+
+        self.assertEqual([result["id"] for result in results], [4, 2, 3])
+        self.assertEqual(results[0], {"id": 4, "readyInMinutes": 10, "servings": 1, "healthScore": 80.0,
+                                      "pricePerServing": 60.25, "aggregateLikes": 5})
+        # Recipes without a value for a filtered field are left out
+        self.assertEqual([result["id"] for result in self.index.query({"pricePerServing": (80, 200)})], [1, 2])
+
+    def test_multi_key_sort_and_top_k(self):
+        """
+        Test that ties on the main sort key are broken by the next key and only `number` recipes are returned.
+        """
+        sort = [("aggregateLikes", "desc"), ("readyInMinutes", "asc")]
+
+        self.assertEqual([result["id"] for result in self.index.query(sort=sort, number=3)], [2, 3, 1])
+        self.assertEqual([result["id"] for result in self.index.query(sort=sort, number=1)], [2])
+        self.assertEqual([result["id"] for result in self.index.query(sort=sort, recipe_ids=[1, 3, None])], [3, 1])
+
+    def test_unknown_field(self):
+        """
+        Test that an unknown field or sort direction raises a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.index.query({"calories": (0, 500)})
+        with self.assertRaises(ValueError):
+            self.index.query(sort=[("servings", "up")])
+
+    def test_add_updates_columns_in_place(self):
+        """
+        Test that added recipes replace the values of indexed recipes and new recipes are appended.
+        """
+        self.index.add([(3, 20, 4, 35.0, 40.0, 300), (5, 25, 2, None, 70.0, 0)])
+
+        results = self.index.query({"readyInMinutes": (None, 30)}, sort=[("pricePerServing", "asc")])
+        self.assertEqual([result["id"] for result in results], [3, 4, 5, 2])
+        self.assertIsNone(results[2]["healthScore"])
+        self.assertEqual(len(self.index), 5)
+
+    def test_corpus_updates_the_index_in_place(self):
+        """
+        Test that recipes added to a corpus after the first query are found without reloading every recipe.
+        """
+        corpus = RecipeCorpus()
+        corpus.add_recipes([{"id": 1, "title": "Stew", "readyInMinutes": 90, "extendedIngredients": []}])
+        corpus.filter_recipes()
+
+        with patch.object(corpus, "iter_numbers") as mock_iter:
+            corpus.add_recipes([{"id": 2, "title": "Toast", "readyInMinutes": 5, "extendedIngredients": []}])
+            results = corpus.filter_recipes({"readyInMinutes": (None, 30)})
+
+        mock_iter.assert_not_called()
+        self.assertEqual([recipe["title"] for recipe in results], ["Toast"])
+        corpus.close()
+
+    @patch('builtins.print')
+    @patch('builtins.input', return_value='1, 2')
+    def test_corpus_filter_recipes(self, mock_input, mock_print):
+        """
+        Test that the corpus filters its stored recipes, also restricted to the saved ones.
+        """
+        corpus = RecipeCorpus()
+        corpus.add_recipes([
+            {"id": 1, "title": "Stew", "readyInMinutes": 90, "pricePerServing": 250.0, "extendedIngredients": []},
+            {"id": 2, "title": "Salad", "readyInMinutes": 10, "pricePerServing": 120.0, "extendedIngredients": []},
+            {"id": 3, "title": "Toast", "readyInMinutes": 5, "pricePerServing": 40.0, "extendedIngredients": []},
+        ])
+        saver = SaveRecipe()
+        saver.save_recipes([{"id": 2, "title": "Salad"}, {"id": 1, "title": "Stew"}], "Favourites")
+
+        quick = corpus.filter_recipes({"readyInMinutes": (None, 30)}, sort=[("pricePerServing", "desc")])
+        self.assertEqual([recipe["title"] for recipe in quick], ["Salad", "Toast"])
+        saved_ids = [recipe_id for _, _, recipe_id in saver.iter_saved_recipes()]
+        saved = corpus.filter_recipes(sort=[("pricePerServing", "asc")], recipe_ids=saved_ids)
+        self.assertEqual([recipe["title"] for recipe in saved], ["Salad", "Stew"])
+        corpus.close()
+
+    def test_queries_100k_recipes_quickly(self):
+        """
+        Test that a filtered and sorted top 10 of 100,000 recipes takes well under a second.
+        """
+        generator = random.Random(7)
+        self.index.load((recipe_id, generator.randint(5, 180), generator.randint(1, 8), generator.uniform(0, 100),
+                         generator.uniform(20, 800), generator.randint(0, 5000)) for recipe_id in range(100000))
+
+        started = time.perf_counter()
+        results = self.index.query({"readyInMinutes": (None, 30), "healthScore": (50, None)},
+                                   sort=[("pricePerServing", "asc"), ("aggregateLikes", "desc")], number=10)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 10)
+        prices = [result["pricePerServing"] for result in results]
+        self.assertEqual(prices, sorted(prices))
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
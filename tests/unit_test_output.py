@@ -0,0 +1,281 @@
+# ===== Importing necessary modules and classes ===========
+import csv
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+from unittest.mock import patch, Mock
+from io import StringIO
+from app.output import RecipeExporter
+from app.recipe_saver import SaveRecipe
+
+
+# Stub recipe details that return the same text for every recipe without recording the calls
+class StubRecipeDetails:
+    def find_instructions_ingredients(self, recipe_title, recipe_id=None):
+        return f"1 cup flour, 2 eggs for {recipe_title}", f"Step 1: Bake {recipe_title} for 20 minutes."
+
+    def find_recipe_id(self, recipe_title):
+        return len(recipe_title)
+
+
+# Test class for the RecipeExporter class
+class TestRecipeExporter(unittest.TestCase):
+    """
+    Unit tests for the RecipeExporter class, which exports saved recipes to a file.
+    """
+
+    def setUp(self):
+        """
+        Initialize RecipeExporter with mocked recipe details and saved recipes.
+        """
+        self.details_mock = Mock()
+        self.saved_recipes = SaveRecipe()
+        self.saved_recipes.saved_recipes['dessert'].extend(['Chocolate Cake', 'Broken Pie'])
+        self.saved_recipes.saved_recipes['snacks'].append('Nachos')
+
+        def fake_details(title, recipe_id=None):
+            # The first recipe is the slowest and 'Broken Pie' cannot be found
+            if title == 'Chocolate Cake':
+                time.sleep(0.05)
+            if title == 'Broken Pie':
+                return None
+            return f"1 {title} ingredient", f"Step 1: Make {title}"
+
+        self.details_mock.find_instructions_ingredients.side_effect = fake_details
+        self.details_mock.find_recipe_id.return_value = 42
+        self.exporter = RecipeExporter(self.details_mock, self.saved_recipes, max_workers=3, prefetch=3)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Remove the temporary export files.
+        """
+        self.directory.cleanup()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_iter_recipe_contents_keeps_order_and_placeholders(self, mock_stdout):
+        """
+        Test that recipes fetched in parallel come back in saved order and that a failed recipe becomes a placeholder.
+        """
+        contents = list(self.exporter.iter_recipe_contents())
+
+        self.assertEqual(contents, [
+            ('dessert', 'Chocolate Cake', None, '1 Chocolate Cake ingredient', 'Step 1: Make Chocolate Cake',
+             'fetched'),
+            ('dessert', 'Broken Pie', None, None, None, 'failed'),
+            ('snacks', 'Nachos', None, '1 Nachos ingredient', 'Step 1: Make Nachos', 'fetched'),
+        ])
+        # Progress and the number of failed recipes are reported
+        output = mock_stdout.getvalue()
+        self.assertIn("Exporting recipes: 3/3", output)
+        self.assertIn("1 recipe(s) could not be retrieved", output)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_planner_fetches_details_per_chunk(self, mock_stdout):
+        """
+        Test that with a planner the details of each chunk of saved recipes with a known ID are fetched up front.
+        """
+        self.saved_recipes.recipe_ids['dessert'].extend([11, None])
+        self.saved_recipes.recipe_ids['snacks'].append(33)
+        planner = Mock(chunk_size=2)
+        exporter = RecipeExporter(self.details_mock, self.saved_recipes, max_workers=3, prefetch=3, planner=planner)
+
+        contents = list(exporter.iter_recipe_contents())
+
+        self.assertEqual([content[2] for content in contents], [11, None, 33])
+        self.assertEqual([call.args[0] for call in planner.fetch_details.call_args_list], [[11], [33]])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_snapshot_is_exported_without_request(self, mock_stdout):
+        """
+        Test that a recipe saved with its full information is exported from that snapshot, without fetching it.
+        """
+        self.saved_recipes.recipe_ids['snacks'].append(33)
+        self.saved_recipes.snapshots[33] = {
+            'id': 33, 'title': 'Nachos',
+            'extendedIngredients': [{'name': 'tortilla chips', 'amount': 1, 'measures': {'us': {'unitShort': 'bag'}}}],
+            'analyzedInstructions': [{'steps': [{'number': 1, 'step': 'Melt the cheese.'}]}]}
+
+        contents = list(self.exporter.iter_recipe_contents())
+
+        self.assertEqual(contents[2], ('snacks', 'Nachos', 33, '1 bag tortilla chips', 'Step 1: Melt the cheese.',
+                                       'snapshot'))
+        self.assertEqual(self.details_mock.find_instructions_ingredients.call_count, 2)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_export_to_excel_creates_file(self, mock_stdout):
+        """
+        Test that export_to_excel writes the workbook even when one recipe fails.
+        """
+        filename = os.path.join(self.directory.name, 'recipes.xlsx')
+
+        self.exporter.export_to_excel(filename)
+
+        self.assertTrue(os.path.exists(filename))
+        self.assertIn(f"Your recipes have been exported to {filename}", mock_stdout.getvalue())
+        self.assertEqual(self.details_mock.find_instructions_ingredients.call_count, 3)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_export_csv_jsonl_and_markdown(self, mock_stdout):
+        """
+        Test that the export format is chosen from the file extension and that each format holds every recipe.
+        """
+        base = os.path.join(self.directory.name, 'recipes')
+        for extension in ('csv', 'jsonl', 'md'):
+            self.exporter.export(f"{base}.{extension}")
+
+        # CSV: a header row and one row per recipe
+        with open(f"{base}.csv", newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['category', 'title', 'ingredients', 'instructions'])
+        self.assertEqual(rows[1], ['dessert', 'Chocolate Cake', '1 Chocolate Cake ingredient',
+                                   'Step 1: Make Chocolate Cake'])
+        self.assertEqual(rows[2], ['dessert', 'Broken Pie', '', ''])
+
+        # JSON Lines: one object per recipe, with null for a failed recipe
+        with open(f"{base}.jsonl", encoding='utf-8') as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([record['title'] for record in records], ['Chocolate Cake', 'Broken Pie', 'Nachos'])
+        self.assertIsNone(records[1]['ingredients'])
+
+        # Markdown: one section per recipe
+        with open(f"{base}.md", encoding='utf-8') as file:
+            markdown = file.read()
+        self.assertIn("## Nachos", markdown)
+        self.assertIn("No Instructions", markdown)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_export_unsupported_format(self, mock_stdout):
+        """
+        Test that an unsupported format prints an error instead of creating a file.
+        """
+        filename = os.path.join(self.directory.name, 'recipes.pdf')
+
+        self.exporter.export(filename)
+
+        self.assertFalse(os.path.exists(filename))
+        self.assertIn("Unsupported export format", mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_export_sharded_by_category(self, mock_stdout):
+        """
+        Test that a sharded export writes one file per category and an index listing them in order.
+        """
+        filename = os.path.join(self.directory.name, 'recipes.csv')
+
+        self.exporter.export_sharded(filename, shard_by="category", max_processes=2)
+
+        with open(os.path.join(self.directory.name, 'recipes.index.json'), encoding='utf-8') as index_file:
+            index = json.load(index_file)
+        self.assertEqual([shard['file'] for shard in index['shards']],
+                         ['recipes_001_dessert.csv', 'recipes_002_snacks.csv'])
+        self.assertEqual([shard['recipes'] for shard in index['shards']], [2, 1])
+
+        # Each shard holds the recipes of its category
+        with open(os.path.join(self.directory.name, 'recipes_002_snacks.csv'), newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual([row[1] for row in rows[1:]], ['Nachos'])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_export_sharded_by_size(self, mock_stdout):
+        """
+        Test that a sharded export can split the recipes into files of a fixed size.
+        """
+        filename = os.path.join(self.directory.name, 'recipes.xlsx')
+
+        self.exporter.export_sharded(filename, shard_by=2, max_processes=2)
+
+        with open(os.path.join(self.directory.name, 'recipes.index.json'), encoding='utf-8') as index_file:
+            index = json.load(index_file)
+        self.assertEqual([shard['recipes'] for shard in index['shards']], [2, 1])
+        for shard in index['shards']:
+            self.assertTrue(os.path.exists(os.path.join(self.directory.name, shard['file'])))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_incremental_export_only_fetches_new_recipes(self, mock_stdout):
+        """
+        Test that an incremental export reuses the manifest and only downloads recipes that were not exported before.
+        """
+        filename = os.path.join(self.directory.name, 'recipes.xlsx')
+        self.exporter.export_to_excel(filename)
+        self.assertTrue(os.path.exists(f"{filename}.manifest"))
+        self.details_mock.find_instructions_ingredients.reset_mock()
+
+        # The failed recipe is retried, but the two exported recipes are reused
+        self.exporter.export_to_excel(filename)
+        self.details_mock.find_instructions_ingredients.assert_called_once_with('Broken Pie', None)
+
+        # Save one more recipe: only that recipe is downloaded
+        self.details_mock.find_instructions_ingredients.reset_mock()
+        self.saved_recipes.saved_recipes['dessert'].remove('Broken Pie')
+        self.saved_recipes.saved_recipes['snacks'].append('Popcorn')
+        self.exporter.export_to_excel(filename)
+        self.details_mock.find_instructions_ingredients.assert_called_once_with('Popcorn', None)
+        self.assertIn("Downloaded 1 new", mock_stdout.getvalue())
+
+        # Nothing changed since the last export, so the file is not rebuilt
+        self.details_mock.find_instructions_ingredients.reset_mock()
+        self.exporter.export_to_excel(filename)
+        self.details_mock.find_instructions_ingredients.assert_not_called()
+        self.assertIn("is already up to date", mock_stdout.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_incremental_export_tells_apart_recipes_with_the_same_title(self, mock_stdout):
+        """
+        Test that the manifest identifies saved recipes by their ID, so two recipes with the same title keep their
+        own content.
+        """
+        saved_recipes = SaveRecipe()
+        saved_recipes.saved_recipes['breakfast'].extend(['Pancakes', 'Pancakes'])
+        saved_recipes.recipe_ids['breakfast'].extend([1, 2])
+        self.details_mock.find_instructions_ingredients.side_effect = \
+            lambda title, recipe_id=None: (f"{recipe_id} cup flour", f"Step 1: Make pancakes {recipe_id}")
+        exporter = RecipeExporter(self.details_mock, saved_recipes, max_workers=2, prefetch=2)
+        filename = os.path.join(self.directory.name, 'recipes.jsonl')
+
+        exporter.export(filename)
+        self.assertIn("Downloaded 2 new", mock_stdout.getvalue())
+
+        # Save one more recipe, so the file is rebuilt from the manifest
+        saved_recipes.saved_recipes['breakfast'].append('Waffles')
+        saved_recipes.recipe_ids['breakfast'].append(3)
+        exporter.export(filename)
+        self.assertIn("reused 2 from the previous export", mock_stdout.getvalue())
+
+        with open(filename, encoding='utf-8') as export_file:
+            rows = [json.loads(line) for line in export_file]
+        self.assertEqual([row['ingredients'] for row in rows], ["1 cup flour", "2 cup flour", "3 cup flour"])
+
+    def measure_export_peak(self, recipe_count):
+        # Export a generated collection of saved recipes and return the peak traced memory in bytes
+        saved_recipes = SaveRecipe()
+        # Generate the saved recipes lazily, like a store reading them from disk would
+        saved_recipes.count_saved_recipes = lambda: recipe_count
+        saved_recipes.iter_saved_recipes = lambda: (('Random', f'Recipe {number}', number) for number in range(recipe_count))
+        exporter = RecipeExporter(StubRecipeDetails(), saved_recipes, max_workers=2, prefetch=8, constant_memory=True)
+        filename = os.path.join(self.directory.name, f'large_{recipe_count}.xlsx')
+
+        # Discard the progress output, so it is not kept in memory
+        with open(os.devnull, 'w') as devnull, patch('sys.stdout', new=devnull):
+            tracemalloc.start()
+            exporter.export_to_excel(filename)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        return peak
+
+    def test_streaming_export_memory_stays_flat(self):
+        """
+        Test that the peak memory of a constant memory export does not grow with the number of recipes.
+        """
+        small_peak = self.measure_export_peak(200)
+        large_peak = self.measure_export_peak(2000)
+
+        # Ten times more recipes should need about the same memory
+        self.assertLess(large_peak, small_peak * 1.5 + 64 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
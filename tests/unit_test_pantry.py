@@ -0,0 +1,75 @@
+# ===== Importing necessary modules and classes ===========
+import random
+import time
+import unittest
+from app.pantry import PantryMatcher
+
+
+# Test class for the PantryMatcher class
+class TestPantryMatcher(unittest.TestCase):
+    """
+    Unit tests for the PantryMatcher class, which ranks recipes by the user's ingredients with NumPy.
+    """
+
+    def setUp(self):
+        """
+        Initialize a matcher with four recipes.
+        """
+        self.matcher = PantryMatcher()
+        self.matcher.load([
+            (1, "tomato"), (1, "onion"), (1, "cream"),
+            (2, "cherry tomatoes"), (2, "basil"),
+            (3, "fish"), (3, "lime"),
+            (4, "basil"), (4, "pine nuts"), (4, "olive oil"), (4, "parmesan"),
+        ])
+
+    def test_fewest_missing_ingredients_first(self):
+        """
+        Test that recipes are ranked by missing ingredients, then used ingredients, and unmatched recipes are left out.
+        """
+        results = self.matcher.match("Tomato, basil", number=10)
+
+        self.assertEqual([result["id"] for result in results], [2, 1, 4])
+        self.assertEqual(results[0]["usedIngredients"], [{"name": "cherry tomatoes"}, {"name": "basil"}])
+        self.assertEqual(results[0]["missedIngredientCount"], 0)
+        self.assertEqual([result["missedIngredientCount"] for result in results[1:]], [2, 3])
+
+    def test_top_k(self):
+        """
+        Test that only the best `number` recipes are returned.
+        """
+        self.assertEqual([result["id"] for result in self.matcher.match("basil, tomato, onion", number=2)], [2, 1])
+        self.assertEqual(self.matcher.match("chocolate"), [])
+        self.assertEqual(self.matcher.match(""), [])
+
+    def test_add_replaces_and_appends_recipes(self):
+        """
+        Test that recipes added in place rank the same as after a full rebuild.
+        """
+        self.matcher.add([(2, ["basil"]), (5, ["Tomato", "mozzarella"])])
+
+        results = self.matcher.match("tomato, basil", number=10)
+        self.assertEqual([result["id"] for result in results], [2, 5, 1, 4])
+        self.assertEqual(results[1]["missedIngredients"], [{"name": "mozzarella"}])
+        self.assertEqual(len(self.matcher.recipe_ids), 5)
+
+    def test_scores_100k_recipes_quickly(self):
+        """
+        Test that 100,000 recipes are scored in well under a second.
+        """
+        generator = random.Random(5)
+        names = [f"ingredient {index}" for index in range(2000)] + ["tomato", "basil"]
+        self.matcher.load((recipe_id, name) for recipe_id in range(100000)
+                          for name in generator.sample(names, 10))
+
+        started = time.perf_counter()
+        results = self.matcher.match("tomato, basil", number=5)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0]["usedIngredientCount"], 2)
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from unittest.mock import patch, Mock
+from app import SpoonacularAPI, RecipeFinder
+from app.planner import QuotaCostModel, RequestPlanner
+from app.cache import ResponseCache
+
+
+# Test class for the QuotaCostModel and RequestPlanner classes
+class TestRequestPlanner(unittest.TestCase):
+    """
+    Unit tests for the RequestPlanner class, which picks the cheapest requests for a user action.
+    """
+
+    def setUp(self):
+        """
+        Initialize a planner with a SpoonacularAPI client and a RecipeFinder.
+        """
+        self.api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key")
+        self.planner = RequestPlanner(RecipeFinder(self.api), chunk_size=3)
+
+    def tearDown(self):
+        """
+        Close the client.
+        """
+        self.api.close()
+
+    def test_cost_model(self):
+        """
+        Test the expected cost of the endpoints used by the app.
+        """
+        model = QuotaCostModel()
+        self.assertEqual(model.cost("recipes/123/information"), 1)
+        self.assertEqual(model.cost("recipes/informationBulk", 5), 3)
+        self.assertAlmostEqual(model.cost("recipes/complexSearch", 5, ("addRecipeInformation", "fillIngredients")),
+                               1.3)
+        self.assertEqual(model.cost("recipes/unknown"), 1)
+
+    def test_plan_details_leaves_out_cached_recipes(self):
+        """
+        Test that cached recipes need no request, one missing recipe gets a single lookup
+        and several missing recipes are split into even bulk chunks.
+        """
+        self.api.store("recipes/1/information", None, {"id": 1})
+
+        plan = self.planner.plan_details([1, 2])
+        self.assertEqual(plan.cached, 1)
+        self.assertEqual([request.endpoint for request in plan.requests], ["recipes/2/information"])
+
+        plan = self.planner.plan_details([1, 2, 3, 4, 5, 6, 7, 8])
+        self.assertEqual([request.recipe_ids for request in plan.requests], [[2, 3, 4], [5, 6], [7, 8]])
+        self.assertEqual(plan.expected_cost, 2 + 1.5 + 1.5)
+
+    def test_plan_category_search(self):
+        """
+        Test that the search embeds the recipe information when that is cheaper than looking it up afterwards.
+        """
+        self.assertTrue(self.planner.plan_category_search(5).inline_information)
+
+        # With expensive embedded information, a plain search and a bulk lookup are cheaper
+        costs = {"recipes/complexSearch": {"request": 1, "addRecipeInformation": 2},
+                 "recipes/informationBulk": {"request": 0.5, "result": 0.5}}
+        planner = RequestPlanner(self.planner.finder, cost_model=QuotaCostModel(costs))
+        plan = planner.plan_category_search(5)
+        self.assertFalse(plan.inline_information)
+        self.assertEqual(plan.expected_cost, 1 + 3)
+
+    @patch('requests.Session.get')
+    def test_fetch_details_reports_expected_and_actual_points(self, mock_get):
+        """
+        Test that the details are fetched with the planned bulk request and the reported cost is recorded.
+        """
+        mock_response = Mock(status_code=200, headers={"X-API-Quota-Request": "2.5"})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [{"id": 1}, {"id": 2}, {"id": 3}]
+        mock_get.return_value = mock_response
+
+        details = self.planner.fetch_details([1, 2, 3])
+
+        self.assertEqual(sorted(details), [1, 2, 3])
+        mock_get.assert_called_once()
+        self.assertEqual(mock_get.call_args.kwargs["params"]["ids"], "1,2,3")
+        report = self.planner.last_report()
+        self.assertEqual((report["expected_points"], report["actual_points"]), (2, 2.5))
+
+        # A second fetch is served from the cache and costs nothing
+        self.planner.fetch_details([1, 2, 3])
+        mock_get.assert_called_once()
+        self.assertEqual(self.planner.totals(), {"plans": 2, "expected_points": 2, "actual_points": 2.5})
+
+
+    @patch('requests.Session.get')
+    def test_fetch_details_does_not_depend_on_the_cache(self, mock_get):
+        """
+        Test that the fetched details are returned even when the cache does not keep them.
+        """
+        api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                             cache=ResponseCache(default_ttl=0, ttls={}))
+        planner = RequestPlanner(RecipeFinder(api), chunk_size=3)
+        mock_response = Mock(status_code=200, headers={})
+        mock_response.raise_for_status.return_value = None
+        mock_response.json.return_value = [{"id": 1}, {"id": 2}]
+        mock_get.return_value = mock_response
+
+        self.assertEqual(planner.fetch_details([1, 2]), {1: {"id": 1}, 2: {"id": 2}})
+        api.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from app.quota import QuotaLimiter, QuotaExceededError
+
+
+# Test class for the QuotaLimiter class
+class TestQuotaLimiter(unittest.TestCase):
+    """
+    Unit tests for the QuotaLimiter class, which spaces out requests to fit the API quota.
+    """
+
+    def setUp(self):
+        """
+        Initialize a QuotaLimiter of 60 points per minute with a fake clock, so waiting takes no real time.
+        """
+        self.now = 0.0
+        self.sleeps = []
+
+        def fake_sleep(seconds):
+            # Record the wait and move the fake clock forward
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        self.limiter = QuotaLimiter(points_per_minute=60, burst=3, clock=lambda: self.now, sleep=fake_sleep)
+
+    def test_burst_then_steady_rate(self):
+        """
+        Test that requests within the burst are sent at once and later requests are spaced at the refill rate.
+        """
+        for _ in range(6):
+            self.limiter.acquire()
+
+        # The first 3 requests use the burst, the next 3 wait 1 second each (60 points per minute)
+        self.assertEqual(self.sleeps, [1.0, 1.0, 1.0])
+        self.assertEqual(self.limiter.waited, 3.0)
+
+    def test_headers_correct_the_bucket(self):
+        """
+        Test that a request that cost more than expected takes the difference from the bucket.
+        """
+        self.limiter.acquire()
+        self.limiter.update({"X-API-Quota-Request": "3", "X-API-Quota-Used": "10.5", "X-API-Quota-Left": "139.5"})
+
+        remaining = self.limiter.remaining()
+        self.assertEqual(remaining["available_now"], 0)
+        self.assertEqual(remaining["quota_left"], 139.5)
+
+        # The next request waits for a point to be refilled, although the burst would otherwise allow it
+        self.limiter.acquire()
+        self.assertEqual(self.sleeps, [1.0])
+
+    def test_used_up_quota_raises_until_reset(self):
+        """
+        Test that no request is allowed once the API reports that the daily quota is used up, until midnight UTC.
+        """
+        # 2024-01-01 15:00 UTC
+        self.wall_now = 1704121200.0
+        self.limiter.wall_clock = lambda: self.wall_now
+        self.limiter.update({"X-API-Quota-Used": "150", "X-API-Quota-Left": "0"})
+        with self.assertRaises(QuotaExceededError):
+            self.limiter.acquire()
+
+        # One second before midnight the quota is still used up, at midnight it has reset
+        self.wall_now = 1704153599.0
+        with self.assertRaises(QuotaExceededError):
+            self.limiter.acquire()
+        self.wall_now = 1704153600.0
+        self.limiter.acquire()
+        self.assertIsNone(self.limiter.remaining()["quota_left"])
+
+    def test_acquire_gives_up_past_max_wait(self):
+        """
+        Test that a request that would wait longer than max_wait does not wait and gives its points back.
+        """
+        for _ in range(3):
+            self.limiter.acquire()
+        self.limiter.update({"X-API-Quota-Request": "6"}, expected_cost=1)
+
+        # The bucket is 5 points short, so the next request would wait 6 seconds
+        self.assertFalse(self.limiter.acquire(max_wait=2))
+        self.assertEqual(self.sleeps, [])
+        self.assertTrue(self.limiter.acquire(max_wait=10))
+        self.assertEqual(self.sleeps, [6.0])
+
+    def test_missing_or_invalid_headers_are_ignored(self):
+        """
+        Test that responses without quota headers leave the tracked quota unknown.
+        """
+        self.limiter.update({})
+        self.limiter.update({"X-API-Quota-Left": "not a number"})
+        self.assertIsNone(self.limiter.remaining()["quota_left"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# ===== Importing necessary modules and classes ===========
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from io import StringIO
+from app.recipe_saver import SaveRecipe, RecipeStore
+
+
+# Test class for the SaveRecipe class with a persistent RecipeStore
+class TestSaveRecipe(unittest.TestCase):
+    """
+    Unit tests for the SaveRecipe class and the RecipeStore that keeps saved recipes between runs.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary directory for the SQLite file of saved recipes.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "saved.sqlite3")
+        self.recipes = [{'id': 11, 'title': 'Tomato Soup'},
+                        {'id': 12, 'title': 'Nachos', 'extendedIngredients': [{'name': 'tortilla chips'}]}]
+
+    def tearDown(self):
+        """
+        Remove the temporary SQLite file.
+        """
+        self.directory.cleanup()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('builtins.input', return_value='1, 2')
+    def test_saved_recipes_survive_restart(self, mock_input, mock_stdout):
+        """
+        Test that recipes saved in one run are loaded, with their IDs and snapshots, by a new instance on the same file.
+        """
+        first_run = SaveRecipe(RecipeStore(self.path))
+        first_run.save_recipes(self.recipes, 'Soups')
+        first_run.store.close()
+
+        second_run = SaveRecipe(RecipeStore(self.path))
+        self.assertEqual(list(second_run.iter_saved_recipes()),
+                         [('Soups', 'Tomato Soup', 11), ('Soups', 'Nachos', 12)])
+        self.assertEqual(list(second_run.get_saved_recipes()['Soups']), ['Tomato Soup', 'Nachos'])
+        self.assertEqual(second_run.get_snapshot(12), self.recipes[1])
+        # A plain search result is not kept as a snapshot
+        self.assertIsNone(second_run.get_snapshot(11))
+        second_run.store.close()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('builtins.input', return_value='1')
+    def test_saving_twice_is_ignored(self, mock_input, mock_stdout):
+        """
+        Test that saving a recipe that is already saved in the category does not add it again.
+        """
+        saver = SaveRecipe(RecipeStore(self.path))
+        saver.save_recipes(self.recipes, 'Soups')
+        saver.save_recipes(self.recipes, 'Soups')
+
+        self.assertIn("'Tomato Soup' is already saved.", mock_stdout.getvalue())
+        self.assertEqual(saver.count_saved_recipes(), 1)
+        saver.store.close()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('builtins.input', return_value='1, 2, 3')
+    def test_recipes_with_the_same_title_are_both_saved(self, mock_input, mock_stdout):
+        """
+        Test that different recipes with the same title are both saved, and that recipes without an ID are told
+        apart by their title.
+        """
+        recipes = [{'id': 1, 'title': 'Pancakes'}, {'id': 2, 'title': 'Pancakes'}, 'Waffles']
+        for saver in (SaveRecipe(), SaveRecipe(RecipeStore(self.path))):
+            saver.save_recipes(recipes, 'Breakfast')
+            saver.save_recipes(recipes, 'Breakfast')
+
+            self.assertEqual(list(saver.iter_saved_recipes()),
+                             [('Breakfast', 'Pancakes', 1), ('Breakfast', 'Pancakes', 2), ('Breakfast', 'Waffles', None)])
+        self.assertIn("'Waffles' is already saved.", mock_stdout.getvalue())
+        saver.store.close()
+
+    def test_store_is_opened_lazily(self):
+        """
+        Test that the SQLite file is not opened until the saved recipes are needed.
+        """
+        saver = SaveRecipe(RecipeStore(self.path))
+        self.assertIsNone(saver.store.connection)
+        self.assertFalse(os.path.exists(self.path))
+
+        self.assertEqual(saver.count_saved_recipes(), 0)
+        self.assertIsNotNone(saver.store.connection)
+        saver.store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
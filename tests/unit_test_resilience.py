@@ -0,0 +1,169 @@
+# ===== Importing necessary modules and classes ===========
+import unittest
+from unittest.mock import patch, Mock
+from io import StringIO
+import requests
+from app import SpoonacularAPI
+from app.resilience import RetryPolicy, CircuitBreaker, CircuitOpenError
+from app.deadline import DeadlineExceededError
+
+
+# Test class for the RetryPolicy class
+class TestRetryPolicy(unittest.TestCase):
+    """
+    Unit tests for the RetryPolicy class, which decides when a failed request is sent again.
+    """
+
+    def test_backoff_doubles_and_is_capped(self):
+        """
+        Test that the backoff delay doubles after each attempt, stays under the cap and stops after the last attempt.
+        """
+        policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=3, jitter=lambda: 1.0)
+
+        self.assertEqual([policy.delay_for(attempt) for attempt in range(1, 6)], [1, 2, 3, 3, None])
+        self.assertEqual(policy.stats(), {"retries": 4, "gave_up": 1})
+
+    def test_retry_after_header(self):
+        """
+        Test that the Retry-After header is read in seconds and overrides the backoff delay, and that the request
+        is not retried when the API asks to wait longer than the longest delay.
+        """
+        policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=10, jitter=lambda: 0.5)
+        retry_after = RetryPolicy.parse_retry_after({"Retry-After": "4"})
+
+        self.assertEqual(policy.delay_for(1, retry_after), 4)
+        self.assertIsNone(policy.delay_for(1, 60))
+        self.assertIsNone(RetryPolicy.parse_retry_after({}))
+        self.assertIsNone(RetryPolicy.parse_retry_after({"Retry-After": "soon"}))
+
+
+# Test class for the CircuitBreaker class
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Unit tests for the CircuitBreaker class, which fails fast while the API is down.
+    """
+
+    def setUp(self):
+        """
+        Initialize a CircuitBreaker with a fake clock.
+        """
+        self.now = 0
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=lambda: self.now)
+
+    def test_opens_after_failures_and_recovers(self):
+        """
+        Test that the breaker opens after failures in a row, lets one trial request through later and then closes.
+        """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+        # After the reset timeout one trial request is allowed, and a second one is not
+        self.now = 31
+        self.breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+        self.breaker.record_success()
+        self.breaker.before_request()
+        self.assertEqual(self.breaker.stats(), {"state": "closed", "failures": 0, "times_opened": 1, "rejected": 2})
+
+    def test_failed_trial_opens_again(self):
+        """
+        Test that a failed trial request opens the breaker for another period.
+        """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now = 31
+        self.breaker.before_request()
+        self.breaker.record_failure()
+
+        self.now = 40
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_request()
+
+
+# Test class for the retries and circuit breaker in SpoonacularAPI
+class TestSpoonacularAPIResilience(unittest.TestCase):
+    """
+    Unit tests for retrying and failing fast in SpoonacularAPI.make_request.
+    """
+
+    def setUp(self):
+        """
+        Initialize SpoonacularAPI with a retry policy that does not wait and a circuit breaker.
+        """
+        self.sleeps = []
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        self.api = SpoonacularAPI(base_url="https://api.spoonacular.com", api_key="test_api_key",
+                                  retry_policy=RetryPolicy(max_attempts=3, sleep=self.sleeps.append,
+                                                           jitter=lambda: 1.0),
+                                  breaker=self.breaker)
+
+    def make_response(self, status_code, data=None, headers=None):
+        # Build a mocked response that raises HTTPError for error statuses
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = data
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+        else:
+            response.raise_for_status.return_value = None
+        return response
+
+    @patch('requests.Session.get')
+    def test_retries_transient_failures(self, mock_get):
+        """
+        Test that a connection error and a 429 response are retried until the request succeeds.
+        """
+        mock_get.side_effect = [requests.exceptions.ConnectionError("reset"),
+                                self.make_response(429, headers={"Retry-After": "2"}),
+                                self.make_response(200, {"id": 1})]
+
+        result = self.api.make_request("recipes/1/information")
+
+        self.assertEqual(result, {"id": 1})
+        self.assertEqual(mock_get.call_count, 3)
+        # Backoff after the first attempt, then the delay asked for by Retry-After
+        self.assertEqual(self.sleeps, [0.5, 2.0])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    @patch('requests.Session.get')
+    def test_breaker_fails_fast_while_api_is_down(self, mock_get, mock_stdout):
+        """
+        Test that after repeated server errors the breaker opens and no more requests are sent.
+        """
+        mock_get.return_value = self.make_response(503)
+
+        # Three attempts fail and open the breaker
+        self.assertIsNone(self.api.make_request("recipes/1/information"))
+        self.assertEqual(mock_get.call_count, 3)
+
+        # The next request fails without reaching the API
+        self.assertIsNone(self.api.make_request("recipes/2/information"))
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertIn("The Spoonacular API is not responding", mock_stdout.getvalue())
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    @patch('requests.Session.get')
+    def test_trial_without_outcome_is_released(self, mock_get):
+        """
+        Test that a trial request stopped by the deadline does not keep the breaker half-open.
+        """
+        self.breaker.clock = lambda: 100
+        self.breaker.state, self.breaker.opened_at = CircuitBreaker.OPEN, 0
+        mock_get.side_effect = [DeadlineExceededError("The request took too long."), self.make_response(200)]
+
+        with self.assertRaises(DeadlineExceededError):
+            self.api.send_request("https://api.spoonacular.com/recipes/1/information")
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+        # The next request becomes the trial, and its success closes the breaker
+        self.assertEqual(self.api.send_request("https://api.spoonacular.com/recipes/1/information").status_code, 200)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# ===== Importing necessary modules and classes ===========
+import os
+import tempfile
+import unittest
+from app.title_index import TitleIndex
+
+
+# Test class for the TitleIndex class
+class TestTitleIndex(unittest.TestCase):
+    """
+    Unit tests for the TitleIndex class, which resolves recipe titles to IDs without contacting the API.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary directory for the SQLite file of the index.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "titles.sqlite3")
+
+    def tearDown(self):
+        """
+        Remove the temporary SQLite file.
+        """
+        self.directory.cleanup()
+
+    def test_normalize_ignores_case_accents_and_punctuation(self):
+        """
+        Test that titles differing only in case, accents, punctuation or spacing are normalised the same way.
+        """
+        self.assertEqual(TitleIndex.normalize("Crème Brûlée!"), "creme brulee")
+        self.assertEqual(TitleIndex.normalize("  creme-BRULEE "), "creme brulee")
+
+    def test_index_survives_restart(self):
+        """
+        Test that titles added in one run are resolved by a new index on the same file.
+        """
+        first_run = TitleIndex(self.path)
+        first_run.add_recipes([{"id": 1, "title": "Tomato Soup"}, {"id": 2, "title": "Nachos"}, {"title": "No ID"}])
+        first_run.close()
+
+        second_run = TitleIndex(self.path)
+        self.assertEqual(second_run.lookup("tomato soup"), 1)
+        self.assertIsNone(second_run.lookup("No ID"))
+        self.assertEqual(second_run.stats(), {"hits": 1, "misses": 1, "titles": 2})
+        second_run.close()
+
+    def test_fuzzy_match_is_optional(self):
+        """
+        Test that a slightly different title only matches when fuzzy matching is enabled.
+        """
+        exact = TitleIndex()
+        fuzzy = TitleIndex(fuzzy_cutoff=0.9)
+        for index in (exact, fuzzy):
+            index.add_recipes([{"id": 3, "title": "Spaghetti Carbonara"}])
+
+        self.assertIsNone(exact.lookup("Spaghetti Carbonarra"))
+        self.assertEqual(fuzzy.lookup("Spaghetti Carbonarra"), 3)
+        self.assertIsNone(fuzzy.lookup("Chicken Curry"))
+
+
+if __name__ == "__main__":
+    unittest.main()